@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Streaming Music - تولید جریانی موسیقی فضایی
+ACTOn Game Studio
+"""
+
+import queue
+import random
+import threading
+import numpy as np
+import pygame
+import pygame.mixer as mixer
+
+
+# آکوردهای ملودی (فرکانس‌ها بر حسب هرتز) و نت بیس متناظر
+SPACE_CHORDS = [
+    ((220.00, 277.18, 329.63), 55.00),   # A
+    ((185.00, 220.00, 277.18), 46.25),   # F#m
+    ((146.83, 185.00, 220.00), 36.71),   # D
+    ((164.81, 207.65, 246.94), 41.20),   # E
+    ((196.00, 246.94, 293.66), 49.00),   # G
+]
+
+MELODY_LEVELS = (0.3, 0.2, 0.1)
+BASS_LEVEL = 0.4
+NOISE_LEVEL = 0.1
+
+
+class StreamingMusicGenerator:
+    """تولید موسیقی در قطعه‌های کوچک روی نخ پس‌زمینه و پخش از طریق صف میکسر"""
+
+    def __init__(self, sample_rate=44100, chunk_duration=0.5, bar_duration=4.0,
+                 max_queued_chunks=4, channel_id=0, seed=None):
+        self.sample_rate = sample_rate
+        self.chunk_samples = int(sample_rate * chunk_duration)
+        self.bar_samples = int(sample_rate * bar_duration)
+
+        self.chunks = queue.Queue(maxsize=max_queued_chunks)
+        self.thread = None
+        self.running = False
+        self.channel_id = channel_id
+        self.channel = None
+        self.volume = 1.0
+
+        self.rng = np.random.default_rng(seed)
+        self.random = random.Random(seed)
+
+        # وضعیت پیوسته سنتز بین قطعه‌ها
+        self.melody_phases = np.zeros(len(MELODY_LEVELS))
+        self.bass_phase = 0.0
+        self.sample_position = 0
+        self.chord_index = 0
+
+    def start(self):
+        """شروع نخ سنتز و پخش"""
+        if self.running:
+            return
+
+        # کانال موسیقی رزرو می‌شود تا Sound.play آن را برای افکت‌ها برندارد
+        if mixer.get_init():
+            mixer.set_reserved(self.channel_id + 1)
+            self.channel = mixer.Channel(self.channel_id)
+            self.channel.set_volume(self.volume)
+
+        self.running = True
+        self.thread = threading.Thread(target=self._synthesis_loop, name="music-synth", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """توقف سنتز و پخش"""
+        self.running = False
+        if self.channel is not None:
+            self.channel.stop()
+            self.channel = None
+
+        # خالی کردن صف تا نخ سنتز از put مسدود خارج شود
+        while not self.chunks.empty():
+            try:
+                self.chunks.get_nowait()
+            except queue.Empty:
+                break
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def pump(self):
+        """ارسال قطعه بعدی به میکسر؛ هر فریم از نخ اصلی فراخوانی می‌شود"""
+        if not self.running or self.channel is None:
+            return
+
+        busy = self.channel.get_busy()
+        if busy and self.channel.get_queue() is not None:
+            return
+
+        try:
+            chunk = self.chunks.get_nowait()
+        except queue.Empty:
+            return
+
+        sound = pygame.sndarray.make_sound(chunk)
+        if busy:
+            self.channel.queue(sound)
+        else:
+            self.channel.play(sound)
+
+    def set_volume(self, volume):
+        """تنظیم بلندی موسیقی"""
+        self.volume = volume
+        if self.channel is not None:
+            self.channel.set_volume(volume)
+
+    def buffered_bytes(self):
+        """حجم قطعه‌های آماده در صف"""
+        return self.chunks.qsize() * self.chunk_samples * 2 * np.dtype(np.int16).itemsize
+
+    def render(self, duration):
+        """سنتز یک‌جای موسیقی به طول مشخص (بدون نخ و میکسر)"""
+        samples = int(self.sample_rate * duration)
+        parts = []
+        while samples > 0:
+            count = min(self.chunk_samples, samples)
+            parts.append(self.synthesize_chunk(count))
+            samples -= count
+        return np.concatenate(parts) if parts else np.zeros((0, 2), dtype=np.int16)
+
+    def _synthesis_loop(self):
+        """حلقه نخ پس‌زمینه: تولید قطعه‌ها تا پر شدن صف"""
+        while self.running:
+            chunk = self.synthesize_chunk(self.chunk_samples)
+            while self.running:
+                try:
+                    self.chunks.put(chunk, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def synthesize_chunk(self, count):
+        """سنتز یک قطعه استریو int16 از لایه‌های ملودی، بیس و نویز"""
+        combined = np.zeros(count)
+        offset = 0
+        while offset < count:
+            # قطعه را در مرز میزان‌ها می‌شکنیم تا آکورد در میانه قطعه عوض شود
+            until_bar = self.bar_samples - self.sample_position % self.bar_samples
+            length = min(count - offset, until_bar)
+            combined[offset:offset + length] = self._synthesize_segment(length)
+            offset += length
+            self.sample_position += length
+            if self.sample_position % self.bar_samples == 0:
+                self._next_chord()
+
+        combined = np.clip(combined, -1, 1)
+        chunk = np.empty((count, 2), dtype=np.int16)
+        chunk[:, 0] = (combined * 32767).astype(np.int16)
+        chunk[:, 1] = chunk[:, 0]
+        return chunk
+
+    def _synthesize_segment(self, length):
+        """سنتز بخشی از قطعه با آکورد جاری و فاز پیوسته"""
+        chord, bass_freq = SPACE_CHORDS[self.chord_index]
+        steps = np.arange(length)
+
+        # ملودی
+        segment = np.zeros(length)
+        for i, (freq, level) in enumerate(zip(chord, MELODY_LEVELS)):
+            increment = 2 * np.pi * freq / self.sample_rate
+            segment += level * np.sin(self.melody_phases[i] + increment * steps)
+            self.melody_phases[i] = (self.melody_phases[i] + increment * length) % (2 * np.pi)
+
+        # بیس
+        increment = 2 * np.pi * bass_freq / self.sample_rate
+        segment += BASS_LEVEL * np.sin(self.bass_phase + increment * steps)
+        self.bass_phase = (self.bass_phase + increment * length) % (2 * np.pi)
+
+        # افکت فضایی
+        segment += NOISE_LEVEL * self.rng.standard_normal(length)
+        return segment
+
+    def _next_chord(self):
+        """انتخاب تصادفی آکورد بعدی (متفاوت با آکورد جاری)"""
+        choices = [i for i in range(len(SPACE_CHORDS)) if i != self.chord_index]
+        self.chord_index = self.random.choice(choices)
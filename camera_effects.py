@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Camera Effects - لرزش، پس‌زنی و دنبال‌کردن نرم دوربین
+ACTOn Game Studio
+
+اثرها موقعیت دوربین را تغییر نمی‌دهند؛ هر فریم یک جابه‌جایی موقت از روی ساعت شبیه‌سازی
+محاسبه و هنگام ساخت ماتریس دید به چشم و هدف دوربین اضافه می‌شود. پس با توقف بازی اثرها هم
+متوقف می‌شوند و دوربین هرگز از جای خود دور نمی‌شود.
+
+- لرزش: مدل trauma؛ دامنه با trauma² و نویز نرم (مجموع سینوس‌ها با فاز تصادفی) است.
+- پس‌زنی: ضربه‌هایی با پاسخ k·a·e^(1-k·a) که در a = 1/k به اوج می‌رسند و بعد محو می‌شوند.
+- دنبال‌کردن: هموارسازی نمایی مستقل از نرخ فریم (alpha = 1 - e^(-rate·dt)).
+
+تمام محاسبات فریم روی آرایه‌های از پیش ساخته‌شده و درجا انجام می‌شوند.
+"""
+
+import math
+import numpy as np
+
+
+class CameraEffects:
+    """جابه‌جایی موقت دوربین از لرزش، پس‌زنی و دنبال‌کردن بازیکن"""
+
+    MAX_RECOILS = 8
+    OCTAVES = np.array([1.0, 2.13, 4.37])  # ضریب فرکانس هر لایه نویز
+    OCTAVE_WEIGHTS = np.array([0.6, 0.3, 0.1])
+
+    def __init__(self, rng=None, shake_amplitude=(0.3, 0.3, 0.1), shake_frequency=14.0, trauma_decay=1.2,
+                 recoil_stiffness=16.0, follow_rate=4.0, follow_weight=(0.35, 0.25, 0.0)):
+        self.rng = rng or np.random.default_rng()
+        self.shake_amplitude = np.array(shake_amplitude, dtype=np.float64)
+        self.frequencies = self.OCTAVES * shake_frequency * 2 * math.pi
+        self.trauma_decay = trauma_decay          # trauma در ثانیه
+        self.recoil_stiffness = recoil_stiffness  # 1/k زمان اوج پس‌زنی
+        self.follow_rate = follow_rate
+        self.follow_weight = np.array(follow_weight, dtype=np.float64)
+
+        self.offset = np.zeros(3)  # خروجی: جابه‌جایی چشم و هدف دوربین
+        self.follow = np.zeros(3)
+        self.phases = np.zeros((3, len(self.OCTAVES)))
+        self.recoils = np.zeros((self.MAX_RECOILS, 3))
+        self.recoil_start = np.zeros(self.MAX_RECOILS)
+
+        # فضای کاری فریم
+        self._noise = np.zeros((3, len(self.OCTAVES)))
+        self._shake = np.zeros(3)
+        self._age = np.zeros(self.MAX_RECOILS)
+        self._weight = np.zeros(self.MAX_RECOILS)
+        self._recoil = np.zeros(3)
+        self._target = np.zeros(3)
+        self.reset()
+
+    def reset(self):
+        """حذف تمام اثرها (شروع بازی جدید)"""
+        self.trauma = 0.0
+        self.trauma_time = 0.0
+        self.recoils.fill(0.0)
+        self.recoil_start.fill(-1e9)  # پاسخ ضربه در سن بسیار زیاد صفر است
+        self.recoil_index = 0
+        self.follow.fill(0.0)
+        self.offset.fill(0.0)
+        self.last_time = None
+
+    def trauma_at(self, now):
+        """trauma باقی‌مانده در زمان now"""
+        return max(0.0, self.trauma - self.trauma_decay * (now - self.trauma_time))
+
+    def shake(self, amount, now):
+        """افزودن trauma (حداکثر 1) و فازهای نویز تازه"""
+        self.trauma = min(1.0, self.trauma_at(now) + amount)
+        self.trauma_time = now
+        self.rng.random(out=self.phases)
+        self.phases *= 2 * math.pi
+
+    def recoil(self, impulse, now):
+        """ضربه پس‌زنی با جهت و اندازه impulse (x, y, z)"""
+        self.recoils[self.recoil_index] = impulse
+        self.recoil_start[self.recoil_index] = now
+        self.recoil_index = (self.recoil_index + 1) % self.MAX_RECOILS
+
+    def evaluate(self, now, follow_target=None):
+        """جابه‌جایی دوربین در زمان now؛ همان آرایه offset را برمی‌گرداند"""
+        # اولین فریم بدون تأخیر به هدف می‌رسد
+        if self.last_time is None:
+            alpha = 1.0
+        else:
+            alpha = 1.0 - math.exp(-self.follow_rate * max(0.0, now - self.last_time))
+        self.last_time = now
+
+        # دنبال‌کردن نرم بخشی از موقعیت بازیکن
+        if follow_target is not None:
+            np.multiply(follow_target, self.follow_weight, out=self._target)
+            self._target -= self.follow
+            self._target *= alpha
+            self.follow += self._target
+        self.offset[:] = self.follow
+
+        # لرزش
+        trauma = self.trauma_at(now)
+        if trauma > 0:
+            np.multiply(self.frequencies, now, out=self._noise)
+            self._noise += self.phases
+            np.sin(self._noise, out=self._noise)
+            np.dot(self._noise, self.OCTAVE_WEIGHTS, out=self._shake)
+            self._shake *= self.shake_amplitude
+            self._shake *= trauma * trauma
+            self.offset += self._shake
+
+        # پس‌زنی
+        np.subtract(now, self.recoil_start, out=self._age)
+        np.maximum(self._age, 0.0, out=self._age)
+        self._age *= self.recoil_stiffness
+        np.subtract(1.0, self._age, out=self._weight)
+        np.exp(self._weight, out=self._weight)
+        self._weight *= self._age
+        np.dot(self._weight, self.recoils, out=self._recoil)
+        self.offset += self._recoil
+        return self.offset
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Collision - برخورد پیوسته (swept) پرتابه‌ها با اهداف کروی
+ACTOn Game Studio
+"""
+
+import numpy as np
+from spatial_index import SpatialHashGrid
+
+
+def segment_sphere_toi(starts, ends, centers, radii):
+    """زمان اولین برخورد پاره‌خط‌ها با کره‌ها در بازه [0, 1]؛ برای عدم برخورد inf
+
+    همه ورودی‌ها هم‌طول هستند: هر سطر یک جفت (پاره‌خط، کره) است.
+    """
+    direction = ends - starts
+    offset = starts - centers
+    a = np.einsum('ij,ij->i', direction, direction)
+    b = np.einsum('ij,ij->i', offset, direction)
+    c = np.einsum('ij,ij->i', offset, offset) - radii * radii
+
+    toi = np.full(len(starts), np.inf, dtype=np.float32)
+
+    # شروع درون کره
+    inside = c <= 0
+    toi[inside] = 0.0
+
+    # حل معادله درجه دوم |offset + t * direction|² = r² برای کوچک‌ترین t
+    moving = ~inside & (a > 1e-12) & (b < 0)
+    discriminant = b[moving] ** 2 - a[moving] * c[moving]
+    hit = discriminant >= 0
+    t = (-b[moving][hit] - np.sqrt(discriminant[hit])) / a[moving][hit]
+    in_range = t <= 1.0
+
+    moving_index = np.nonzero(moving)[0][hit][in_range]
+    toi[moving_index] = t[in_range]
+    return toi
+
+
+def first_hits(projectile_ids, target_ids, toi):
+    """انتخاب زودترین برخورد برای هر پرتابه"""
+    valid = np.isfinite(toi)
+    projectile_ids, target_ids, toi = projectile_ids[valid], target_ids[valid], toi[valid]
+    if len(toi) == 0:
+        return projectile_ids, target_ids, toi
+
+    order = np.lexsort((toi, projectile_ids))
+    projectile_ids, target_ids, toi = projectile_ids[order], target_ids[order], toi[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = projectile_ids[1:] != projectile_ids[:-1]
+    return projectile_ids[first], target_ids[first], toi[first]
+
+
+class SweptCollider:
+    """برخورد برداری پاره‌خط حرکت پرتابه‌ها در یک تیک با اهداف، همراه با فاز پهن مبتنی بر شبکه"""
+
+    def __init__(self, cell_size=2.0, projectile_radius=0.1):
+        self.grid = SpatialHashGrid(cell_size)
+        self.projectile_radius = projectile_radius
+        self.last_candidate_count = 0
+
+    def sweep(self, starts, ends, target_positions, target_radii):
+        """اولین هدف برخوردکرده برای هر پرتابه: (اندیس پرتابه، اندیس هدف، زمان برخورد)"""
+        starts = np.asarray(starts, dtype=np.float32).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=np.float32).reshape(-1, 3)
+        target_positions = np.asarray(target_positions, dtype=np.float32).reshape(-1, 3)
+        target_radii = np.asarray(target_radii, dtype=np.float32).reshape(-1)
+        empty = np.zeros(0, dtype=np.int64)
+        if len(starts) == 0 or len(target_positions) == 0:
+            return empty, empty, np.zeros(0, dtype=np.float32)
+
+        # فاز پهن: اهداف نزدیک به وسط پاره‌خط، با شعاعی که کل پاره‌خط و بزرگ‌ترین هدف را بپوشاند
+        self.grid.build(target_positions)
+        midpoints = (starts + ends) * 0.5
+        half_length = np.linalg.norm(ends - starts, axis=1).max() * 0.5
+        reach = half_length + target_radii.max() + self.projectile_radius
+        projectile_ids, target_ids = self.grid.candidates(midpoints, reach)
+        self.last_candidate_count = len(projectile_ids)
+
+        # فاز دقیق: برخورد پاره‌خط با کره
+        toi = segment_sphere_toi(
+            starts[projectile_ids], ends[projectile_ids],
+            target_positions[target_ids],
+            target_radii[target_ids] + self.projectile_radius
+        )
+        return first_hits(projectile_ids, target_ids, toi)
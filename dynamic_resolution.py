@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Dynamic Resolution - رندر صحنه در FBO با مقیاس متغیر و بزرگ‌نمایی آن به اندازه پنجره
+ACTOn Game Studio
+
+صحنه در گوشه‌ای از یک FBO به اندازه کامل پنجره (scale * اندازه) رسم می‌شود، پس تغییر مقیاس
+نیاز به تخصیص دوباره ندارد. سپس با glBlitFramebuffer و فیلتر خطی روی framebuffer مقصد کشیده
+می‌شود و HUD با وضوح اصلی روی آن رسم می‌شود. مقیاس از زمان GPU صحنه (GL_TIME_ELAPSED)
+یا در نبود آن از زمان کار فریم تنظیم می‌شود.
+"""
+
+import ctypes
+import math
+from collections import deque
+from OpenGL.GL import *
+
+
+class SceneFramebuffer:
+    """FBO صحنه با renderbufferهای RGBA8 و DEPTH24 به اندازه کامل پنجره"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.scaled_size = (width, height)
+        self.target = 0
+        self.active = False
+
+        self.framebuffer = int(glGenFramebuffers(1))
+        self.renderbuffers = [int(renderbuffer) for renderbuffer in glGenRenderbuffers(2)]
+        previous = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.framebuffer)
+        for renderbuffer, storage, attachment in (
+                (self.renderbuffers[0], GL_RGBA8, GL_COLOR_ATTACHMENT0),
+                (self.renderbuffers[1], GL_DEPTH_COMPONENT24, GL_DEPTH_ATTACHMENT)):
+            glBindRenderbuffer(GL_RENDERBUFFER, renderbuffer)
+            glRenderbufferStorage(GL_RENDERBUFFER, storage, width, height)
+            glFramebufferRenderbuffer(GL_FRAMEBUFFER, attachment, GL_RENDERBUFFER, renderbuffer)
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+
+        status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        glBindFramebuffer(GL_FRAMEBUFFER, previous)
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            self.shutdown()
+            raise RuntimeError(f"Framebuffer incomplete: 0x{int(status):x}")
+
+    @staticmethod
+    def supported():
+        """نیاز به FBO و glBlitFramebuffer (OpenGL 3.0)"""
+        return bool(glGenFramebuffers) and bool(glBlitFramebuffer)
+
+    def begin(self, scale):
+        """رسم صحنه در FBO با مقیاس داده‌شده؛ framebuffer فعلی مقصد بزرگ‌نمایی است"""
+        self.target = int(glGetIntegerv(GL_DRAW_FRAMEBUFFER_BINDING))
+        self.scaled_size = (max(1, round(self.width * scale)), max(1, round(self.height * scale)))
+        glBindFramebuffer(GL_FRAMEBUFFER, self.framebuffer)
+        glViewport(0, 0, *self.scaled_size)
+        self.active = True
+
+    def end(self):
+        """بزرگ‌نمایی صحنه روی مقصد و بازگرداندن viewport اصلی"""
+        if not self.active:
+            return
+        self.active = False
+        width, height = self.scaled_size
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, self.framebuffer)
+        glBindFramebuffer(GL_DRAW_FRAMEBUFFER, self.target)
+        glBlitFramebuffer(0, 0, width, height, 0, 0, self.width, self.height,
+                          GL_COLOR_BUFFER_BIT, GL_LINEAR)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.target)
+        glViewport(0, 0, self.width, self.height)
+
+    def shutdown(self):
+        if self.framebuffer is not None:
+            glDeleteFramebuffers(1, [self.framebuffer])
+            glDeleteRenderbuffers(2, self.renderbuffers)
+            self.framebuffer = None
+
+
+class GpuFrameTimer:
+    """زمان GPU هر فریم با چند query چرخشی تا خواندن نتیجه منتظر GPU نماند"""
+
+    MAX_VALID_MS = 1000.0  # برخی درایورها برای اولین query مقدار نامعتبر برمی‌گردانند
+
+    def __init__(self, depth=4):
+        try:
+            self.queries = [int(query) for query in glGenQueries(depth)]
+        except Exception:
+            self.queries = []
+        self.pending = deque()
+        self.index = 0
+        self.active = False
+
+    @property
+    def supported(self):
+        return bool(self.queries)
+
+    def begin(self):
+        if not self.queries:
+            return
+        query = self.queries[self.index]
+        if query in self.pending:
+            # همه queryها در انتظارند: قدیمی‌ترین فریم کنار گذاشته می‌شود
+            self.read(self.pending.popleft())
+        glBeginQuery(GL_TIME_ELAPSED, query)
+        self.active = True
+
+    def end(self):
+        if not self.active:
+            return
+        self.active = False
+        glEndQuery(GL_TIME_ELAPSED)
+        self.pending.append(self.queries[self.index])
+        self.index = (self.index + 1) % len(self.queries)
+
+    def read(self, query):
+        # بافر خروجی صریح: تبدیل خودکار PyOpenGL نوع 64 بیتی را نمی‌شناسد
+        elapsed = ctypes.c_uint64()
+        glGetQueryObjectui64v(query, GL_QUERY_RESULT, ctypes.byref(elapsed))
+        elapsed_ms = elapsed.value / 1e6
+        return elapsed_ms if elapsed_ms < self.MAX_VALID_MS else None
+
+    def poll(self):
+        """زمان (ms) آخرین فریم تمام‌شده روی GPU، یا None اگر نتیجه‌ای آماده نیست"""
+        latest = None
+        while self.pending:
+            available = ctypes.c_uint()
+            glGetQueryObjectuiv(self.pending[0], GL_QUERY_RESULT_AVAILABLE, ctypes.byref(available))
+            if not available.value:
+                break
+            elapsed_ms = self.read(self.pending.popleft())
+            if elapsed_ms is not None:
+                latest = elapsed_ms
+        return latest
+
+    def shutdown(self):
+        if self.queries:
+            glDeleteQueries(len(self.queries), self.queries)
+            self.queries = []
+            self.pending.clear()
+
+
+class ResolutionScaler:
+    """تنظیم مقیاس رندر صحنه برای نگه داشتن زمان GPU زیر بودجه فریم
+
+    هزینه رسم تقریباً با تعداد پیکسل (scale²) متناسب است؛ با عبور میانگین از بودجه مقیاس
+    به نسبت sqrt(بودجه / زمان) کم و با فاصله کافی از بودجه یک پله زیاد می‌شود.
+    """
+
+    def __init__(self, target_fps=60, min_scale=0.5, max_scale=1.0, step=0.05, headroom=0.85,
+                 upgrade=0.7, smoothing=0.1, interval=20):
+        self.enabled = True
+        self.scale = max_scale
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.step = step
+        self.budget_ms = 1000.0 / target_fps * headroom
+        self.upgrade = upgrade      # افزایش وقتی میانگین از این ضریب بودجه کمتر بماند
+        self.smoothing = smoothing
+        self.interval = interval    # حداقل فریم‌ها بین دو تغییر
+        self.average_ms = 0.0
+        self.last_ms = None
+        self.frames = 0
+        self.source = "gpu"
+
+    def set_scale(self, scale):
+        """تغییر مقیاس در محدوده و روی پله‌ها؛ اگر مقیاس عوض شود True برمی‌گرداند"""
+        scale = round(scale / self.step) * self.step
+        scale = max(self.min_scale, min(self.max_scale, scale))
+        if abs(scale - self.scale) < 1e-6:
+            return False
+        self.scale = scale
+        self.frames = 0
+        return True
+
+    def record(self, frame_ms, source="gpu"):
+        """ثبت زمان یک فریم؛ ممکن است مقیاس را تغییر دهد"""
+        self.source = source
+        self.last_ms = frame_ms
+        if self.frames == 0:
+            self.average_ms = frame_ms
+        else:
+            self.average_ms += (frame_ms - self.average_ms) * self.smoothing
+        self.frames += 1
+
+        if not self.enabled or self.frames < self.interval:
+            return False
+        if self.average_ms > self.budget_ms:
+            target = self.scale * math.sqrt(self.budget_ms / self.average_ms)
+            return self.set_scale(min(target, self.scale - self.step))
+        if self.average_ms < self.budget_ms * self.upgrade:
+            return self.set_scale(self.scale + self.step)
+        return False
+
+    def report_lines(self, width, height, icons=True):
+        """خطوط گزارش برای HUD (icons=False برای فونت‌های فقط ASCII)"""
+        mode = "auto" if self.enabled else "off"
+        line = (f"Resolution: {self.scale * 100:.0f}% ({round(width * self.scale)}x{round(height * self.scale)}, "
+                f"{mode}), {self.source} {self.average_ms:.2f}/{self.budget_ms:.2f} ms")
+        return [f"🖥️ {line}" if icons else line]
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Entity Store - ذخیره structure-of-arrays موجودیت‌های بازی
+ACTOn Game Studio
+"""
+
+import numpy as np
+
+# شناسه = (نسل << SLOT_BITS) | جایگاه؛ جایگاه اندیس نقشه rows است و نسل شناسه‌های کهنه را رد می‌کند
+SLOT_BITS = 32
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+
+class ComponentPool:
+    """آرایه‌های هم‌طول مؤلفه‌ها برای یک نوع موجودیت
+
+    ردیف‌های زنده همیشه فشرده در [0, count) قرار دارند؛ حذف با فشرده‌سازی برداری انجام می‌شود
+    و شناسه هر موجودیت (ids) با جابه‌جایی ردیف‌ها ثابت می‌ماند.
+
+    جایگاه شناسه موجودیت‌های حذف‌شده در free-list برمی‌گردد و با نسل بعدی دوباره صادر می‌شود، پس
+    نقشه rows به اندازه بیشترین تعداد موجودیت زنده می‌ماند نه تعداد کل موجودیت‌های ساخته‌شده.
+    """
+
+    def __init__(self, name, components, capacity=64):
+        self.name = name
+        self.components = dict(components)  # name -> (shape, dtype)
+        self.capacity = capacity
+        self.count = 0
+        self.slots = 0  # تعداد جایگاه‌های شناسه ساخته‌شده
+        self.arrays = {}
+        for component, (shape, dtype) in self.components.items():
+            self.arrays[component] = np.zeros((capacity,) + tuple(shape), dtype=dtype)
+        self.arrays['id'] = np.zeros(capacity, dtype=np.int64)
+        self.rows = np.full(capacity, -1, dtype=np.int64)  # جایگاه -> ردیف (یا -1)
+        self.generations = np.zeros(capacity, dtype=np.int64)  # نسل فعلی هر جایگاه
+        self.free = np.zeros(capacity, dtype=np.int64)  # پشته جایگاه‌های آزاد
+        self.free_count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, component):
+        """نمای زنده مؤلفه برای ردیف‌های فعال"""
+        return self.arrays[component][:self.count]
+
+    def __setitem__(self, component, values):
+        self.arrays[component][:self.count] = values
+
+    def __contains__(self, component):
+        return component in self.arrays
+
+    @property
+    def ids(self):
+        return self.arrays['id'][:self.count]
+
+    def nbytes(self):
+        """حجم کل آرایه‌های pool"""
+        slots = self.rows.nbytes + self.generations.nbytes + self.free.nbytes
+        return sum(array.nbytes for array in self.arrays.values()) + slots
+
+    def reserve(self, capacity):
+        """افزایش ظرفیت (دوبرابر شدن) برای جا دادن capacity ردیف"""
+        if capacity <= self.capacity:
+            return
+        new_capacity = max(capacity, self.capacity * 2)
+        for component, array in self.arrays.items():
+            grown = np.zeros((new_capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:self.count] = array[:self.count]
+            self.arrays[component] = grown
+        self.capacity = new_capacity
+
+    def spawn(self, count=1, **values):
+        """افزودن count موجودیت؛ مقادیر می‌توانند اسکالر یا آرایه باشند. بازه ردیف‌ها را برمی‌گرداند"""
+        if count <= 0:
+            return slice(self.count, self.count)
+
+        start = self.count
+        self.reserve(start + count)
+        end = start + count
+        for component, array in self.arrays.items():
+            if component == 'id':
+                continue
+            array[start:end] = values.get(component, 0)
+
+        self.assign_ids(np.arange(start, end))
+        self.count = end
+        return slice(start, end)
+
+    def assign_ids(self, rows):
+        """شناسه‌های تازه برای ردیف‌های داده‌شده؛ ابتدا از جایگاه‌های آزاد"""
+        count = len(rows)
+        reused = min(count, self.free_count)
+        self.free_count -= reused
+        slots = np.concatenate([
+            self.free[self.free_count:self.free_count + reused],
+            np.arange(self.slots, self.slots + count - reused, dtype=np.int64),
+        ])
+        self.slots += count - reused
+        if len(self.rows) < self.slots:
+            self.grow_slots(max(self.slots, len(self.rows) * 2))
+        self.arrays['id'][rows] = (self.generations[slots] << SLOT_BITS) | slots
+        self.rows[slots] = rows
+
+    def grow_slots(self, size):
+        """بزرگ کردن نقشه rows و آرایه‌های نسل و free-list به size جایگاه"""
+        rows = np.full(size, -1, dtype=np.int64)
+        rows[:len(self.rows)] = self.rows
+        generations = np.zeros(size, dtype=np.int64)
+        generations[:len(self.generations)] = self.generations
+        free = np.zeros(size, dtype=np.int64)
+        free[:self.free_count] = self.free[:self.free_count]
+        self.rows, self.generations, self.free = rows, generations, free
+
+    def release_ids(self, ids):
+        """آزاد کردن جایگاه شناسه‌ها؛ نسل بالا می‌رود تا شناسه‌های قدیمی دیگر پیدا نشوند"""
+        slots = ids & SLOT_MASK
+        self.rows[slots] = -1
+        self.generations[slots] += 1
+        self.free[self.free_count:self.free_count + len(slots)] = slots
+        self.free_count += len(slots)
+
+    def remove(self, mask):
+        """حذف ردیف‌هایی که mask (بولی یا اندیس) مشخص می‌کند؛ تعداد حذف‌شده را برمی‌گرداند"""
+        mask = np.asarray(mask)
+        if mask.dtype != bool:
+            indices = mask
+            mask = np.zeros(self.count, dtype=bool)
+            mask[indices] = True
+        removed = int(mask.sum())
+        if removed == 0:
+            return 0
+
+        keep = ~mask
+        self.release_ids(self.ids[mask])
+        new_count = self.count - removed
+        for array in self.arrays.values():
+            array[:new_count] = array[:self.count][keep]
+        self.count = new_count
+        self.rows[self.ids & SLOT_MASK] = np.arange(new_count)
+        return removed
+
+    def clear(self):
+        """حذف تمام موجودیت‌ها"""
+        self.release_ids(self.ids)
+        self.count = 0
+
+    def row_of(self, entity_id):
+        """ردیف فعلی یک شناسه یا -1 اگر حذف شده باشد"""
+        slot = entity_id & SLOT_MASK
+        if entity_id < 0 or slot >= self.slots or self.generations[slot] != entity_id >> SLOT_BITS:
+            return -1
+        return int(self.rows[slot])
+
+
+class EntityStore:
+    """مجموعه poolهای مؤلفه برای تمام انواع موجودیت"""
+
+    def __init__(self):
+        self.pools = {}
+
+    def create_pool(self, name, components, capacity=64):
+        """ساخت pool جدید"""
+        pool = ComponentPool(name, components, capacity)
+        self.pools[name] = pool
+        return pool
+
+    def __getitem__(self, name):
+        return self.pools[name]
+
+    def __iter__(self):
+        return iter(self.pools.values())
+
+    def clear(self):
+        """خالی کردن تمام poolها"""
+        for pool in self.pools.values():
+            pool.clear()
+
+    def nbytes(self):
+        """حجم کل ذخیره"""
+        return sum(pool.nbytes() for pool in self.pools.values())
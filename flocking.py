@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Flocking AI - رفتار گروهی و آرایش نظامی دشمنان
+ACTOn Game Studio
+"""
+
+import time
+import numpy as np
+from spatial_index import SpatialHashGrid
+from level_system import formation_offsets
+
+
+class FlockingController:
+    """محاسبه برداری نیروهای جدایی، هم‌راستایی، انسجام و آرایش برای تمام سفینه‌ها"""
+
+    def __init__(self, neighbor_radius=1.5, separation_radius=0.8,
+                 separation_weight=1.5, alignment_weight=0.4, cohesion_weight=0.3,
+                 seek_weight=1.0, max_force=0.05, formation='v', slot_spacing=1.2):
+        self.neighbor_radius = neighbor_radius
+        self.separation_radius = separation_radius
+        self.separation_weight = separation_weight
+        self.alignment_weight = alignment_weight
+        self.cohesion_weight = cohesion_weight
+        self.seek_weight = seek_weight
+        self.max_force = max_force
+        self.formation = formation
+        self.slot_spacing = slot_spacing
+
+        self.grid = SpatialHashGrid(cell_size=neighbor_radius)
+        self.last_pair_count = 0
+
+    def formation_slots(self, count, anchor):
+        """موقعیت خانه‌های آرایش برای count سفینه حول نقطه anchor"""
+        slots = formation_offsets(self.formation, count, self.slot_spacing)
+        return slots + np.asarray(anchor, dtype=np.float32)
+
+    def steer(self, positions, velocities, targets):
+        """شتاب هدایت (n, 3) برای سفینه‌ها؛ targets موقعیت هدف هر سفینه است"""
+        positions = np.asarray(positions, dtype=np.float32)
+        velocities = np.asarray(velocities, dtype=np.float32)
+        count = len(positions)
+        if count == 0:
+            return np.zeros((0, 3), dtype=np.float32)
+
+        # همسایه‌ها از شبکه مکانی، نه مقایسه همه جفت‌ها
+        self.grid.build(positions)
+        i, j, distance = self.grid.query_pairs(self.neighbor_radius)
+        self.last_pair_count = len(i)
+
+        neighbor_count = np.bincount(i, minlength=count).astype(np.float32)
+        has_neighbors = neighbor_count > 0
+        safe_count = np.maximum(neighbor_count, 1)[:, None]
+
+        # انسجام: حرکت به سمت مرکز همسایه‌ها
+        center = np.zeros_like(positions)
+        np.add.at(center, i, positions[j])
+        cohesion = np.where(has_neighbors[:, None], center / safe_count - positions, 0)
+
+        # هم‌راستایی: هم‌جهت شدن با سرعت همسایه‌ها
+        mean_velocity = np.zeros_like(velocities)
+        np.add.at(mean_velocity, i, velocities[j])
+        alignment = np.where(has_neighbors[:, None], mean_velocity / safe_count - velocities, 0)
+
+        # جدایی: دور شدن از همسایه‌های خیلی نزدیک با وزن عکس فاصله
+        close = distance < self.separation_radius
+        away = positions[i[close]] - positions[j[close]]
+        away /= np.maximum(distance[close], 1e-4)[:, None] ** 2
+        separation = np.zeros_like(positions)
+        np.add.at(separation, i[close], away)
+
+        # حرکت به سمت هدف یا خانه آرایش
+        seek = np.asarray(targets, dtype=np.float32) - positions
+        seek_length = np.linalg.norm(seek, axis=1, keepdims=True)
+        seek = seek / np.maximum(seek_length, 1.0)
+
+        force = (self.separation_weight * separation +
+                 self.alignment_weight * alignment +
+                 self.cohesion_weight * cohesion +
+                 self.seek_weight * seek)
+        return self.limit(force, self.max_force)
+
+    @staticmethod
+    def limit(vectors, max_length):
+        """محدود کردن طول بردارها"""
+        length = np.linalg.norm(vectors, axis=1, keepdims=True)
+        scale = np.minimum(1.0, max_length / np.maximum(length, 1e-9))
+        return vectors * scale
+
+
+def naive_neighbor_pairs(positions, radius):
+    """جستجوی همسایه با مقایسه همه جفت‌ها (فقط برای مقایسه در بنچمارک)"""
+    delta = positions[:, None, :] - positions[None, :, :]
+    distance = np.sqrt((delta ** 2).sum(axis=2))
+    i, j = np.nonzero((distance < radius) & ~np.eye(len(positions), dtype=bool))
+    return i, j, distance[i, j]
+
+
+def benchmark_flocking(sizes=(250, 500, 1000, 2000, 4000, 8000), steps=20, density=0.5, seed=0):
+    """بنچمارک مقیاس‌پذیری؛ تراکم ثابت نگه داشته می‌شود (حجم فضا متناسب با تعداد)"""
+    rng = np.random.default_rng(seed)
+    controller = FlockingController()
+
+    print("🧪 Flocking benchmark (constant density)")
+    print(f"  {'ships':>6} {'grid ms':>9} {'us/ship':>8} {'pairs':>8} {'naive ms':>9}")
+    results = []
+    for count in sizes:
+        extent = (count / density) ** (1 / 3) / 2
+        positions = rng.uniform(-extent, extent, (count, 3)).astype(np.float32)
+        velocities = rng.uniform(-0.05, 0.05, (count, 3)).astype(np.float32)
+        targets = controller.formation_slots(count, (0, 0, 0))
+
+        controller.steer(positions, velocities, targets)  # گرم کردن
+        start = time.perf_counter()
+        for _ in range(steps):
+            acceleration = controller.steer(positions, velocities, targets)
+            velocities += acceleration
+            positions += velocities
+        grid_ms = (time.perf_counter() - start) * 1000 / steps
+
+        # مقایسه با روش O(n²) فقط برای اندازه‌های کوچک (حافظه n² لازم دارد)
+        naive_ms = None
+        if count <= 2000:
+            start = time.perf_counter()
+            naive_neighbor_pairs(positions, controller.neighbor_radius)
+            naive_ms = (time.perf_counter() - start) * 1000
+
+        results.append((count, grid_ms, controller.last_pair_count, naive_ms))
+        naive_text = f"{naive_ms:9.2f}" if naive_ms is not None else f"{'-':>9}"
+        print(f"  {count:>6} {grid_ms:9.2f} {grid_ms * 1000 / count:8.2f} "
+              f"{controller.last_pair_count:>8} {naive_text}")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_flocking()
@@ -4,11 +4,12 @@ Galaxy Advanced 3D Game - موتور بازی سه‌بعدی پیشرفته ف
 Created by: ACTOn Game Studio
 """
 
+import time
+STARTUP_ORIGIN = time.perf_counter()
+
 import pygame
 import numpy as np
 import math
-import random
-import time
 from OpenGL.GL import *
 from OpenGL.GLUT import *
 from OpenGL.GLU import *
@@ -16,11 +17,62 @@ import pygame.mixer as mixer
 from pygame.locals import *
 import sys
 import os
+import argparse
+from memory_tracker import MemoryTracker
+from sound_manager import SoundManager
+from startup_profiler import StartupProfiler
+from resource_manager import ResourceManager
+from simulation import GalaxySimulation, OWNER_PLAYER
+from game_entities import ParticleSystem, as_array
+from render_queue import RenderQueue, PASS_BACKGROUND, PASS_OPAQUE, PASS_OVERLAY
+from shader_renderer import ShaderRenderer, ParticleRenderer, sphere_mesh
+from quality import QualityManager
+from dynamic_resolution import SceneFramebuffer, GpuFrameTimer, ResolutionScaler
+from viewports import build_layout, spheres_in_frustum, VIEW_LAYOUTS
+from camera_effects import CameraEffects
+from loot import POWERUP_TYPES
+from level_system import ENEMY_TYPES
+from stats_store import StatsStore, FrameTimeRecorder, DEFAULT_DB
+
+# سنتز موسیقی فقط در کارهای معوق پس از اولین فریم import می‌شود
+IMPORT_DURATION = time.perf_counter() - STARTUP_ORIGIN
+
+# رنگ و اندازه هر نوع رهاشده (به ترتیب POWERUP_TYPES)
+PICKUP_STYLES = {
+    'health': ((1.0, 0.2, 0.3), 1.6),
+    'fuel': ((0.2, 1.0, 0.4), 1.6),
+    'weapon': ((1.0, 0.5, 0.1), 1.6),
+    'shield': ((0.3, 0.6, 1.0), 1.6),
+    'coin': ((1.0, 0.8, 0.0), 1.0),
+}
+PICKUP_COLORS = np.float32([PICKUP_STYLES[name][0] for name in POWERUP_TYPES])
+PICKUP_SCALES = np.float32([PICKUP_STYLES[name][1] for name in POWERUP_TYPES])
+
+# رنگ و ضریب اندازه مدل هر نوع دشمن
+ENEMY_STYLES = {
+    'fighter': ((1.0, 0.2, 0.2), 1.0),
+    'bomber': ((0.7, 0.3, 1.0), 1.4),
+    'scout': ((1.0, 0.6, 0.1), 0.75),
+}
 
 class Galaxy3DEngine:
     """موتور اصلی بازی سه‌بعدی کهکشانی"""
     
-    def __init__(self, width=1200, height=800):
+    # مدل‌هایی که پیش از شروع بازی باید آماده باشند
+    # مدل‌های کل جلسه؛ مدل هر نوع دشمن فقط برای مراحلی که آن نوع را دارند بارگذاری می‌شود
+    REQUIRED_MODELS = ('player_model', 'asteroid_model')
+    
+    # کره‌ها: نام -> (شعاع، نسخه دور برای LOD)
+    SPHERES = {
+        'projectile': (0.1, False),
+        'projectile_far': (0.1, True),
+        'particle': (1.0, False),
+        'particle_far': (1.0, True),
+    }
+    
+    def __init__(self, width=1200, height=800, start_level=1, waves_file=None, renderer="auto",
+                 particle_backend="auto", quality="HIGH", headless=False, dynamic_resolution=False,
+                 views="single", stats_db=None):
         self.width = width
         self.height = height
         self.running = False
@@ -29,29 +81,75 @@ class Galaxy3DEngine:
         
         # وضعیت بازی
         self.game_state = "MAIN_MENU"  # MAIN_MENU, PLAYING, PAUSED, GAME_OVER
-        self.score = 0
-        self.level = 1
-        self.lives = 3
-        self.fuel = 100.0
-        self.max_fuel = 100.0
-        
-        # اشیاء بازی
-        self.player = None
-        self.enemies = []
-        self.asteroids = []
-        self.powerups = []
-        self.projectiles = []
-        self.particles = []
-        self.stars = []
+        
+        # تنظیمات پیشرفته: بودجه‌ها از سطح کیفیت (AUTO: تنظیم خودکار برای حفظ FPS)
+        self.quality = QualityManager(
+            "HIGH" if quality == "AUTO" else quality, auto=quality == "AUTO",
+            target_fps=self.fps, on_change=self.apply_quality
+        )
+        preset = self.quality.preset
+        self.graphics_quality = preset.name  # LOW, MEDIUM, HIGH, ULTRA
+        self.particle_count = preset.max_particles
+        self.star_count = preset.star_count
+        self.sphere_lists = {}
+        self.sphere_meshes = {}
+        self.sphere_detail = None
+        
+        # شبیه‌سازی (موجودیت‌ها، قوانین و مراحل) مستقل از OpenGL؛
+        # ستاره‌ها و ظرفیت ذرات برای بالاترین سطح ساخته می‌شوند و هر سطح بخشی از آن را استفاده می‌کند
+        largest = self.quality.max_preset
+        self.world = GalaxySimulation(
+            star_count=largest.star_count, particle_budget=self.particle_count,
+            particle_capacity=max(2 * largest.max_particles, ParticleSystem.CAPACITY)
+        )
         
         # گرافیک سه‌بعدی
         self.camera_pos = [0, 0, 5]
         self.camera_rot = [0, 0, 0]
         self.light_pos = [2, 5, 2]
+        # لرزش، پس‌زنی و دنبال‌کردن: جابه‌جایی موقت ماتریس دید (camera_pos تغییر نمی‌کند)
+        self.camera_effects = CameraEffects(rng=self.world.random.stream('camera'))
+        self.render_queue = RenderQueue()
+        # دیدها (single, split, minimap, rear)؛ view دیدی است که فرمان‌هایش در حال ثبت است
+        self.view_layout = views
+        self.views = build_layout(views)
+        self.view = self.views[0]
+        self.frame_particles = None
+        self.renderer = renderer  # auto, shader, fixed
+        self.shader_renderer = None
+        self.particle_backend = particle_backend  # auto, gpu, cpu
+        self.particle_renderer = None
+        
+        # وضوح پویا: صحنه در FBO کوچک‌تر رسم و به اندازه پنجره بزرگ می‌شود؛ HUD با وضوح اصلی
+        self.dynamic_resolution = dynamic_resolution
+        self.resolution = ResolutionScaler(target_fps=self.fps)
+        
+        # آمار جلسه‌ها و بهترین امتیازها (نوشتن روی نخ جدا؛ None: غیرفعال)
+        self.stats_store = StatsStore(stats_db) if stats_db else None
+        self.session_id = None
+        self.session_started = None
+        self.frame_times = FrameTimeRecorder()
+        self.top_scores = None
+        self.scene_target = None
+        self.gpu_timer = None
+        
+        # بدون پنجره: context فعلی (مثلاً EGL) از بیرون ساخته می‌شود و صدا و متن GLUT نداریم
+        self.headless = headless
+        self.text_enabled = False
+        
+        # منابع (به صورت ناهمگام بارگذاری می‌شوند)
+        self.resources = ResourceManager(max_workers=2, upload_budget_ms=4.0)
+        self.player_model = None
+        self.asteroid_model = None
+        self.coin_model = None
+        for enemy_type in ENEMY_TYPES:
+            setattr(self, f"enemy_{enemy_type}_model", None)
+        self.level_models = ()
         
         # صداها
         self.sounds = {}
         self.music = None
+        self.sound_manager = SoundManager(max_voices=8)
         
         # کنترل‌ها
         self.keys_pressed = set()
@@ -59,13 +157,20 @@ class Galaxy3DEngine:
         self.mouse_buttons = (0, 0, 0)
         
         # زمان‌بندی
-        self.last_spawn_time = 0
         self.game_time = 0
+        self.show_system_timings = False
+        
+        # مراحل و موج‌های دشمن
+        self.start_level = start_level
+        self.waves_file = waves_file
         
-        # تنظیمات پیشرفته
-        self.graphics_quality = "HIGH"  # LOW, MEDIUM, HIGH, ULTRA
-        self.particle_count = 500
-        self.star_count = 1000
+        # زمان‌سنجی راه‌اندازی
+        self.startup = StartupProfiler(origin=STARTUP_ORIGIN)
+        self.startup.record('imports', STARTUP_ORIGIN, IMPORT_DURATION)
+        
+        # پایش حافظه
+        self.memory_tracker = MemoryTracker(report_interval=10.0)
+        self.register_memory_tracking()
         
         self.initialize_game()
 
@@ -73,21 +178,28 @@ class Galaxy3DEngine:
         """راه‌اندازی اولیه بازی"""
         try:
             # راه‌اندازی Pygame و OpenGL
-            pygame.init()
-            pygame.display.set_mode((self.width, self.height), DOUBLEBUF | OPENGL)
-            pygame.display.set_caption("🚀 Galaxy Advanced 3D Game - ACTOn Studio")
+            with self.startup.phase('display'):
+                if not self.headless:
+                    pygame.init()
+                    pygame.display.set_mode((self.width, self.height), DOUBLEBUF | OPENGL)
+                    pygame.display.set_caption("🚀 Galaxy Advanced 3D Game - ACTOn Studio")
+                    self.text_enabled = self.setup_text()
             
             # تنظیمات OpenGL
-            self.setup_opengl()
+            with self.startup.phase('opengl'):
+                self.setup_opengl()
             
             # بارگذاری منابع
-            self.load_resources()
+            with self.startup.phase('resources'):
+                self.load_resources()
             
             # ایجاد دنیای بازی
-            self.create_game_world()
+            with self.startup.phase('world'):
+                self.create_game_world()
             
-            # شروع موسیقی
-            self.play_background_music()
+            # شروع موسیقی پس از اولین فریم
+            if not self.headless:
+                self.startup.defer('music', self.play_background_music)
             
             self.running = True
             print("✅ Galaxy 3D Engine Initialized Successfully!")
@@ -96,18 +208,44 @@ class Galaxy3DEngine:
             print(f"❌ Error initializing game: {e}")
             sys.exit(1)
 
+    def register_memory_tracking(self):
+        """ثبت مجموعه‌های بازی در پایش‌گر حافظه"""
+        for pool in self.world.store:
+            self.memory_tracker.track(pool.name, lambda pool=pool: pool, lambda pool: pool.nbytes())
+        self.memory_tracker.track('music', lambda: self.music, lambda music: music.buffered_bytes())
+        self.memory_tracker.track('sounds', lambda: self.sounds,
+                                  lambda sounds: sum(self.estimate_sound_bytes(s) for s in sounds.values()))
+
+    def estimate_sound_bytes(self, sound):
+        """تخمین حجم بافر یک صدای pygame بدون کپی کردن آن"""
+        mixer_config = mixer.get_init()
+        if not mixer_config:
+            return 0
+        frequency, size, channels = mixer_config
+        return int(sound.get_length() * frequency * channels * abs(size) // 8)
+
+    def setup_text(self):
+        """راه‌اندازی GLUT برای فونت‌های bitmap؛ freeglut بدون glutInit برنامه را می‌بندد"""
+        try:
+            glutInit(sys.argv)
+            return True
+        except Exception as e:
+            print(f"⚠️ GLUT text not available: {e}")
+            return False
+
     def setup_opengl(self):
         """تنظیمات پیشرفته OpenGL"""
         glEnable(GL_DEPTH_TEST)
         glEnable(GL_LIGHTING)
         glEnable(GL_LIGHT0)
         glEnable(GL_COLOR_MATERIAL)
+        glEnable(GL_NORMALIZE)  # مدل‌های مقیاس‌خورده (کره ذرات) نور درست بگیرند
         glEnable(GL_TEXTURE_2D)
         glEnable(GL_BLEND)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
         
         # تنظیم نور
-        glLightfv(GL_LIGHT0, GL_POSITION, [2, 5, 2, 1])
+        glLightfv(GL_LIGHT0, GL_POSITION, self.light_pos + [1])
         glLightfv(GL_LIGHT0, GL_AMBIENT, [0.2, 0.2, 0.2, 1])
         glLightfv(GL_LIGHT0, GL_DIFFUSE, [0.8, 0.8, 0.8, 1])
         glLightfv(GL_LIGHT0, GL_SPECULAR, [1, 1, 1, 1])
@@ -118,38 +256,170 @@ class Galaxy3DEngine:
         glMatrixMode(GL_PROJECTION)
         gluPerspective(45, self.width / self.height, 0.1, 100.0)
         glMatrixMode(GL_MODELVIEW)
+        
+        self.setup_render_queue()
+        if self.dynamic_resolution:
+            self.setup_dynamic_resolution()
+
+    def setup_dynamic_resolution(self):
+        """FBO صحنه و زمان‌سنج GPU؛ بزرگ‌نمایی پیش از pass رابط کاربری انجام می‌شود"""
+        try:
+            if not SceneFramebuffer.supported():
+                print("⚠️ Framebuffer objects not available, dynamic resolution disabled")
+                return
+            self.scene_target = SceneFramebuffer(self.width, self.height)
+            self.gpu_timer = GpuFrameTimer()
+            self.render_queue.register_pass_hook(PASS_OVERLAY, self.finish_scene)
+            print("✅ Dynamic resolution enabled" +
+                  ("" if self.gpu_timer.supported else " (GPU timer not available, using frame time)"))
+        except Exception as e:
+            print(f"⚠️ Could not initialize dynamic resolution: {e}")
+            self.scene_target = None
+
+    def setup_shader_renderer(self):
+        """راه‌اندازی مسیر GLSL در صورت درخواست و پشتیبانی؛ در غیر این صورت خط لوله ثابت"""
+        if self.renderer == "fixed":
+            return None
+        
+        try:
+            if ShaderRenderer.supported():
+                renderer = ShaderRenderer(self.light_pos)
+                print("✅ Shader renderer enabled (GLSL 330)")
+                return renderer
+            print("⚠️ GLSL 3.30 not available, using fixed-function renderer")
+        except Exception as e:
+            print(f"⚠️ Could not initialize shader renderer: {e}")
+        return None
+
+    def setup_particle_renderer(self):
+        """ذرات روی GPU در صورت فعال بودن مسیر شیدر؛ در غیر این صورت محاسبه روی CPU"""
+        if self.particle_backend == "cpu":
+            return None
+        if not self.shader_renderer:
+            if self.particle_backend == "gpu":
+                print("⚠️ GPU particles need the shader renderer, using CPU particles")
+            return None
+        
+        try:
+            return ParticleRenderer(self.shader_renderer, sphere_mesh(1.0, *self.quality.preset.sphere_detail))
+        except Exception as e:
+            print(f"⚠️ Could not initialize GPU particles: {e}")
+        return None
+
+    def setup_render_queue(self):
+        """ثبت حالت‌ها و مدل‌های صف رندر"""
+        queue = self.render_queue
+        self.shader_renderer = self.setup_shader_renderer()
+        shader = self.shader_renderer
+        
+        if shader:
+            queue.register_state('scene', shader.begin, shader.end)
+        else:
+            queue.register_state('scene')
+        queue.register_state('points')
+        queue.register_state('overlay', self.begin_overlay, self.end_overlay)
+        self.particle_renderer = self.setup_particle_renderer()
+        if self.particle_renderer:
+            queue.register_state('gpu_particles', self.particle_renderer.begin, self.particle_renderer.end)
+        
+        for name in ('player', 'asteroid', 'coin') + tuple(f"enemy_{enemy_type}" for enemy_type in ENEMY_TYPES):
+            attr = f"{name}_model"
+            instanced = None
+            if shader:
+                instanced = lambda *instances, attr=attr: shader.draw_instances(getattr(self, attr)['mesh'], *instances)
+            queue.register_model(name, lambda colored, attr=attr: self.draw_model(getattr(self, attr), colored),
+                                 instanced)
+        
+        # کره‌ها (نزدیک و دور برای LOD) با تفکیک سطح کیفیت ساخته و با مقیاس رسم می‌شوند
+        for name in self.SPHERES:
+            instanced = None
+            if shader:
+                instanced = lambda *instances, name=name: shader.draw_instances(self.sphere_meshes[name], *instances)
+            queue.register_model(name, lambda colored, name=name: glCallList(self.sphere_lists[name]), instanced)
+        self.build_spheres()
+
+    def build_spheres(self):
+        """ساخت (یا بازسازی) کره‌ها با تفکیک سطح کیفیت فعلی"""
+        preset = self.quality.preset
+        detail = (preset.sphere_detail, preset.far_sphere_detail)
+        if detail == self.sphere_detail:
+            return
+        self.sphere_detail = detail
+        self.delete_spheres()
+        
+        quadric = gluNewQuadric()
+        for name, (radius, far) in self.SPHERES.items():
+            slices, stacks = detail[far]
+            self.sphere_lists[name] = self.compile_list(
+                lambda: gluSphere(quadric, radius, slices, stacks))
+            if self.shader_renderer:
+                self.sphere_meshes[name] = self.shader_renderer.create_mesh(
+                    sphere_mesh(radius, slices, stacks), (1, 1, 1))
+        gluDeleteQuadric(quadric)
+        
+        if self.particle_renderer:
+            self.particle_renderer.set_mesh(sphere_mesh(1.0, *preset.sphere_detail))
+
+    def delete_spheres(self):
+        """آزادسازی display list و VAO کره‌ها"""
+        for display_list in self.sphere_lists.values():
+            glDeleteLists(display_list, 1)
+        for mesh in self.sphere_meshes.values():
+            self.shader_renderer.delete_mesh(mesh)
+        self.sphere_lists.clear()
+        self.sphere_meshes.clear()
+
+    def apply_quality(self, preset):
+        """اعمال بودجه‌های سطح کیفیت روی شبیه‌سازی و منابع رندر"""
+        self.graphics_quality = preset.name
+        self.particle_count = preset.max_particles
+        self.star_count = preset.star_count
+        particles = self.world.particle_system
+        particles.budget = min(preset.max_particles, particles.capacity)
+        if self.sphere_detail is not None:
+            self.build_spheres()
+
+    def compile_list(self, draw):
+        """کامپایل فراخوانی‌های رسم در یک display list"""
+        display_list = glGenLists(1)
+        glNewList(display_list, GL_COMPILE)
+        draw()
+        glEndList()
+        return display_list
 
     def load_resources(self):
         """بارگذاری منابع بازی"""
         try:
-            # بارگذاری صداها
-            self.load_sounds()
-            
-            # بارگذاری مدل‌های سه‌بعدی (ساده)
+            # مدل‌ها و صداها روی ThreadPool ساخته می‌شوند و منو در این مدت پاسخگو می‌ماند
             self.create_3d_models()
+            if not self.headless:
+                self.load_sounds()
             
-            print("✅ Resources loaded successfully!")
+            print("✅ Resource loading scheduled!")
             
         except Exception as e:
             print(f"⚠️ Could not load some resources: {e}")
 
     def load_sounds(self):
         """بارگذاری صداهای بازی"""
-        try:
-            # صدای موتور
-            engine_sound = mixer.Sound(self.generate_sine_wave(440, 0.1))
-            self.sounds['engine'] = engine_sound
-            
-            # صدای انفجار
-            explosion_sound = mixer.Sound(self.generate_noise(0.2))
-            self.sounds['explosion'] = explosion_sound
-            
-            # صدای سکه
-            coin_sound = mixer.Sound(self.generate_sine_wave(880, 0.05))
-            self.sounds['coin'] = coin_sound
-            
-        except Exception as e:
-            print(f"⚠️ Sound loading failed: {e}")
+        self.sound_manager.setup_channels()
+        
+        # صدای موتور
+        self.load_sound('engine', lambda: mixer.Sound(self.generate_sine_wave(440, 0.1)), 0.5)
+        
+        # صدای انفجار
+        self.load_sound('explosion', lambda: mixer.Sound(self.generate_noise(0.2)), 1.0)
+        
+        # صدای سکه
+        self.load_sound('coin', lambda: mixer.Sound(self.generate_sine_wave(880, 0.05)), 0.8)
+
+    def load_sound(self, name, loader, priority):
+        """زمان‌بندی ساخت یک صدا و ثبت آن در مدیر صدا پس از آماده شدن"""
+        def register(sound):
+            self.sounds[name] = sound
+            self.sound_manager.register(name, sound, priority=priority)
+        
+        return self.resources.load(f"sound:{name}", loader, on_ready=register)
 
     def generate_sine_wave(self, frequency, duration):
         """تولید موج سینوسی برای صدا"""
@@ -175,16 +445,62 @@ class Galaxy3DEngine:
     def create_3d_models(self):
         """ایجاد مدل‌های سه‌بعدی ساده"""
         # مدل سفینه بازیکن
-        self.player_model = self.create_spaceship_model()
-        
-        # مدل دشمن
-        self.enemy_model = self.create_enemy_model()
+        self.load_model('player_model', self.create_spaceship_model)
         
         # مدل سیارک
-        self.asteroid_model = self.create_asteroid_model()
+        self.load_model('asteroid_model', self.create_asteroid_model)
         
         # مدل سکه
-        self.coin_model = self.create_coin_model()
+        self.load_model('coin_model', self.create_coin_model)
+        
+        # مدل دشمنان مرحله شروع
+        self.enter_level_models(self.world.level_manager.enemy_types(self.start_level, self.waves_file))
+
+    def load_model(self, name, factory):
+        """زمان‌بندی ساخت مدل روی ThreadPool و ارسال آن به GPU روی نخ رندر"""
+        return self.resources.load(
+            name, factory,
+            upload=self.upload_model,
+            unload=lambda model: self.delete_model(name, model),
+            on_ready=lambda model: setattr(self, name, model)
+        )
+
+    def enter_level_models(self, enemy_types):
+        """ارجاع مدل‌های دشمن مرحله جدید و سپس آزاد کردن مدل‌های مرحله قبل
+
+        مدل مشترک دو مرحله ارجاع خود را از دست نمی‌دهد؛ مدل‌هایی که مرحله جدید لازم ندارد
+        با رسیدن ارجاع به صفر در فریم بعد از GPU آزاد می‌شوند.
+        """
+        names = {f"enemy_{enemy_type}_model": enemy_type for enemy_type in enemy_types}
+        for name, enemy_type in names.items():
+            if self.resources.acquire(name) is None:
+                self.load_model(name, lambda enemy_type=enemy_type: self.create_enemy_model(enemy_type))
+        for name in self.level_models:
+            self.resources.release(name)
+        self.level_models = tuple(names)
+
+    def upload_model(self, model):
+        """کامپایل هندسه مدل در یک display list (روی نخ رندر)؛ رنگ در draw_model تنظیم می‌شود"""
+        display_list = glGenLists(1)
+        glNewList(display_list, GL_COMPILE)
+        self.draw_model_immediate(model)
+        glEndList()
+        model['display_list'] = display_list
+        if self.shader_renderer:
+            model['mesh'] = self.shader_renderer.create_model_mesh(model)
+        return model
+
+    def delete_model(self, name, model):
+        """آزادسازی display list و VAO مدل و پاک کردن ویژگی آن در موتور"""
+        glDeleteLists(model.pop('display_list'), 1)
+        if 'mesh' in model:
+            self.shader_renderer.delete_mesh(model.pop('mesh'))
+        if getattr(self, name, None) is model:
+            setattr(self, name, None)
+
+    def resources_ready(self):
+        """آیا منابع لازم برای شروع بازی آماده‌اند؟"""
+        return self.resources.all_ready(self.REQUIRED_MODELS + self.level_models)
 
     def create_spaceship_model(self):
         """ایجاد مدل سه‌بعدی سفینه"""
@@ -205,14 +521,15 @@ class Galaxy3DEngine:
         
         return {'vertices': vertices, 'faces': faces, 'color': (0, 0.8, 1)}
 
-    def create_enemy_model(self):
-        """ایجاد مدل سه‌بعدی دشمن"""
+    def create_enemy_model(self, enemy_type="fighter"):
+        """ایجاد مدل سه‌بعدی دشمن (رنگ و اندازه بر اساس نوع)"""
+        color, size = ENEMY_STYLES[enemy_type]
         vertices = [
-            [0, 0.3, 0],     # مرکز بالا
-            [-0.4, -0.2, 0], # چپ پایین
-            [0.4, -0.2, 0],  # راست پایین
-            [0, -0.4, 0],    # پایین
-            [0, 0, 0.3],     # جلو
+            [0, 0.3 * size, 0],            # مرکز بالا
+            [-0.4 * size, -0.2 * size, 0], # چپ پایین
+            [0.4 * size, -0.2 * size, 0],  # راست پایین
+            [0, -0.4 * size, 0],           # پایین
+            [0, 0, 0.3 * size],            # جلو
         ]
         
         faces = [
@@ -224,16 +541,18 @@ class Galaxy3DEngine:
             [2, 3, 4],
         ]
         
-        return {'vertices': vertices, 'faces': faces, 'color': (1, 0.2, 0.2)}
+        return {'vertices': vertices, 'faces': faces, 'color': color}
 
     def create_asteroid_model(self):
         """ایجاد مدل سه‌بعدی سیارک"""
+        # جریان جدا: شکل سیارک با seed بازی تکرارپذیر است (این تابع در نخ بارگذاری اجرا می‌شود)
+        noise = self.world.random.stream('models').random((12, 3))
         vertices = []
         for i in range(12):
             angle = 2 * math.pi * i / 12
-            x = math.cos(angle) * (0.5 + random.random() * 0.2)
-            y = math.sin(angle) * (0.5 + random.random() * 0.2)
-            z = (random.random() - 0.5) * 0.3
+            x = math.cos(angle) * (0.5 + noise[i, 0] * 0.2)
+            y = math.sin(angle) * (0.5 + noise[i, 1] * 0.2)
+            z = (noise[i, 2] - 0.5) * 0.3
             vertices.append([x, y, z])
         
         faces = []
@@ -252,127 +571,92 @@ class Galaxy3DEngine:
             vertices.append([x, y, 0.1])
             vertices.append([x, y, -0.1])
         
+        # مرکز دو روی سکه
+        vertices.append([0, 0, 0.1])
+        vertices.append([0, 0, -0.1])
+        
         faces = []
         for i in range(16):
             faces.append([i*2, (i*2+2)%32, (i*2+3)%32])
             faces.append([i*2, (i*2+3)%32, (i*2+1)%32])
+            faces.append([32, i*2, (i*2+2)%32])
+            faces.append([33, (i*2+3)%32, i*2+1])
         
         return {'vertices': vertices, 'faces': faces, 'color': (1, 0.8, 0)}
 
     def create_game_world(self):
         """ایجاد دنیای بازی"""
-        # ایجاد بازیکن
-        self.player = PlayerShip()
-        
-        # ایجاد ستاره‌ها
-        self.create_starfield()
-        
-        # ایجاد سیارک‌های اولیه
-        for _ in range(20):
-            self.spawn_asteroid()
-        
+        # بازیکن، ستاره‌ها و سیارک‌های اولیه
+        self.world.reset()
         print("✅ Game world created successfully!")
 
-    def create_starfield(self):
-        """ایجاد زمینه ستاره‌ای"""
-        self.stars = []
-        for _ in range(self.star_count):
-            star = {
-                'pos': [
-                    random.uniform(-50, 50),
-                    random.uniform(-50, 50),
-                    random.uniform(-20, -1)
-                ],
-                'size': random.uniform(0.01, 0.1),
-                'brightness': random.uniform(0.3, 1.0)
-            }
-            self.stars.append(star)
-
-    def spawn_asteroid(self):
-        """تولید سیارک جدید"""
-        asteroid = {
-            'pos': [
-                random.uniform(-8, 8),
-                random.uniform(-6, 6),
-                random.uniform(-15, -5)
-            ],
-            'vel': [
-                random.uniform(-0.1, 0.1),
-                random.uniform(-0.1, 0.1),
-                random.uniform(0.05, 0.2)
-            ],
-            'rot': [0, 0, 0],
-            'rot_vel': [
-                random.uniform(-2, 2),
-                random.uniform(-2, 2),
-                random.uniform(-2, 2)
-            ],
-            'size': random.uniform(0.5, 2.0),
-            'health': 3
-        }
-        self.asteroids.append(asteroid)
-
-    def spawn_enemy(self):
-        """تولید دشمن جدید"""
-        enemy = {
-            'pos': [
-                random.uniform(-7, 7),
-                random.uniform(-5, 5),
-                random.uniform(-12, -8)
-            ],
-            'vel': [0, 0, 0.1],
-            'rot': [0, 0, 0],
-            'health': 2,
-            'type': random.choice(['fighter', 'bomber', 'scout']),
-            'last_shot': 0,
-            'shot_cooldown': random.uniform(1, 3)
-        }
-        self.enemies.append(enemy)
-
     def play_background_music(self):
         """پخش موسیقی پس‌زمینه"""
+        from audio_stream import StreamingMusicGenerator
+        
         try:
-            # تولید موسیقی ساده
-            music_data = self.generate_space_music(30)
-            self.music = pygame.sndarray.make_sound(music_data)
-            self.music.play(-1)  # تکرار بی‌نهایت
+            # موسیقی به صورت جریانی روی نخ پس‌زمینه تولید و در صف میکسر قرار می‌گیرد
+            self.music = StreamingMusicGenerator()
+            self.music.start()
         except Exception as e:
             print(f"⚠️ Could not play music: {e}")
 
     def generate_space_music(self, duration):
         """تولید موسیقی فضایی"""
-        sample_rate = 44100
-        samples = int(sample_rate * duration)
-        music = np.zeros((samples, 2), dtype=np.int16)
-        
-        t = np.linspace(0, duration, samples)
-        
-        # ملودی اصلی
-        melody = 0.3 * np.sin(2 * np.pi * 220 * t)
-        melody += 0.2 * np.sin(2 * np.pi * 277.18 * t)
-        melody += 0.1 * np.sin(2 * np.pi * 329.63 * t)
-        
-        # بیس
-        bass = 0.4 * np.sin(2 * np.pi * 55 * t)
+        from audio_stream import StreamingMusicGenerator
         
-        # افکت فضایی
-        space_effect = 0.1 * np.random.normal(0, 1, samples)
-        
-        combined = melody + bass + space_effect
-        combined = np.clip(combined, -1, 1)
-        
-        music[:, 0] = (combined * 32767).astype(np.int16)
-        music[:, 1] = (combined * 32767).astype(np.int16)
-        
-        return music
+        return StreamingMusicGenerator().render(duration)
 
     def run(self):
         """حلقه اصلی بازی"""
         while self.running:
+            frame_start = time.perf_counter()
             self.handle_events()
             self.update()
+            self.resources.process_uploads()
             self.render()
+            # زمان کار فریم (بدون انتظار clock.tick) برای کیفیت خودکار
+            frame_ms = (time.perf_counter() - frame_start) * 1000
+            self.quality.record_frame(frame_ms)
+            if self.scene_target and not self.gpu_timer.supported:
+                self.resolution.record(frame_ms, source="frame")
+            if self.session_id and self.game_state == "PLAYING":
+                self.record_frame_time(frame_ms)
+            self.startup.first_frame()
+            self.startup.poll()
+            if self.music:
+                self.music.pump()
+            self.memory_tracker.update()
             self.clock.tick(self.fps)
+        
+        self.shutdown()
+
+    def shutdown(self):
+        """آزادسازی منابع هنگام خروج"""
+        if self.stats_store:
+            self.end_session("quit")
+            self.stats_store.close()
+            self.stats_store = None
+        self.startup.shutdown()
+        self.resources.shutdown()
+        self.world.shutdown()
+        if self.particle_renderer:
+            self.particle_renderer.shutdown()
+            self.particle_renderer = None
+        if self.scene_target:
+            self.gpu_timer.shutdown()
+            self.scene_target.shutdown()
+            self.scene_target = None
+        if self.sphere_detail is not None:
+            self.delete_spheres()
+            self.sphere_detail = None
+        if self.shader_renderer:
+            self.shader_renderer.shutdown()
+            self.shader_renderer = None
+        self.sound_manager.stop_all()
+        if self.music:
+            self.music.stop()
+            self.music = None
 
     def handle_events(self):
         """مدیریت رویدادها"""
@@ -399,10 +683,26 @@ class Galaxy3DEngine:
                 self.game_state = "PAUSED"
             elif self.game_state == "PAUSED":
                 self.game_state = "PLAYING"
+        elif key == pygame.K_F3:
+            self.memory_tracker.toggle_hud()
+        elif key == pygame.K_F4:
+            self.memory_tracker.take_snapshot()
+        elif key == pygame.K_F5:
+            self.show_system_timings = not self.show_system_timings
+        elif key == pygame.K_F6:
+            self.quality.cycle()
+        elif key == pygame.K_F7:
+            self.quality.auto = not self.quality.auto
+            print(f"🎛️ Auto quality: {'on' if self.quality.auto else 'off'}")
+        elif key == pygame.K_F9:
+            self.cycle_views()
+        elif key == pygame.K_F8 and self.scene_target:
+            self.resolution.enabled = not self.resolution.enabled
+            print(f"🖥️ Dynamic resolution: {'on' if self.resolution.enabled else 'off'}")
         elif key == pygame.K_SPACE and self.game_state == "PLAYING":
             self.shoot_projectile()
         elif key == pygame.K_RETURN:
-            if self.game_state == "MAIN_MENU":
+            if self.game_state == "MAIN_MENU" and self.resources_ready():
                 self.start_game()
             elif self.game_state == "GAME_OVER":
                 self.restart_game()
@@ -419,382 +719,258 @@ class Galaxy3DEngine:
             return
 
         self.game_time += 1/self.fps
-        
-        # به‌روزرسانی بازیکن
-        self.update_player()
-        
-        # به‌روزرسانی دشمنان
-        self.update_enemies()
-        
-        # به‌روزرسانی سیارک‌ها
-        self.update_asteroids()
-        
-        # به‌روزرسانی پرتابه‌ها
-        self.update_projectiles()
-        
-        # به‌روزرسانی ذرات
-        self.update_particles()
-        
-        # تولید دشمنان جدید
-        self.spawn_entities()
-        
-        # بررسی برخوردها
-        self.check_collisions()
-        
-        # به‌روزرسانی سوخت
-        self.update_fuel()
+        self.world.update(1/self.fps, self.input_direction())
+        self.process_world_events()
 
-    def update_player(self):
-        """به‌روزرسانی وضعیت بازیکن"""
-        if not self.player:
-            return
+    def input_direction(self):
+        """جهت حرکت بازیکن بر اساس کلیدها"""
+        dx = (pygame.K_RIGHT in self.keys_pressed) - (pygame.K_LEFT in self.keys_pressed)
+        dy = (pygame.K_UP in self.keys_pressed) - (pygame.K_DOWN in self.keys_pressed)
+        return dx, dy
 
-        # حرکت بر اساس کلیدها
-        speed = 0.1
-        if pygame.K_LEFT in self.keys_pressed:
-            self.player.pos[0] -= speed
-        if pygame.K_RIGHT in self.keys_pressed:
-            self.player.pos[0] += speed
-        if pygame.K_UP in self.keys_pressed:
-            self.player.pos[1] += speed
-        if pygame.K_DOWN in self.keys_pressed:
-            self.player.pos[1] -= speed
-            
-        # محدود کردن به مرزهای صفحه
-        self.player.pos[0] = max(-4, min(4, self.player.pos[0]))
-        self.player.pos[1] = max(-3, min(3, self.player.pos[1]))
-
-    def update_enemies(self):
-        """به‌روزرسانی دشمنان"""
-        current_time = self.game_time
-        
-        for enemy in self.enemies[:]:
-            # حرکت به سمت بازیکن
-            dx = self.player.pos[0] - enemy['pos'][0]
-            dy = self.player.pos[1] - enemy['pos'][1]
-            dz = self.player.pos[2] - enemy['pos'][2]
-            
-            distance = math.sqrt(dx*dx + dy*dy + dz*dz)
-            if distance > 0:
-                enemy['vel'][0] = dx / distance * 0.05
-                enemy['vel'][1] = dy / distance * 0.05
-            
-            # به‌روزرسانی موقعیت
-            enemy['pos'][0] += enemy['vel'][0]
-            enemy['pos'][1] += enemy['vel'][1]
-            enemy['pos'][2] += enemy['vel'][2]
-            
-            # به‌روزرسانی چرخش
-            enemy['rot'][0] += enemy.get('rot_vel', [0,0,0])[0]
-            enemy['rot'][1] += enemy.get('rot_vel', [0,0,0])[1]
-            enemy['rot'][2] += enemy.get('rot_vel', [0,0,0])[2]
-            
-            # شلیک
-            if current_time - enemy['last_shot'] > enemy['shot_cooldown']:
-                self.enemy_shoot(enemy)
-                enemy['last_shot'] = current_time
-            
-            # حذف اگر خارج از صفحه شد
-            if enemy['pos'][2] > 2:
-                self.enemies.remove(enemy)
-
-    def update_asteroids(self):
-        """به‌روزرسانی سیارک‌ها"""
-        for asteroid in self.asteroids[:]:
-            # به‌روزرسانی موقعیت
-            asteroid['pos'][0] += asteroid['vel'][0]
-            asteroid['pos'][1] += asteroid['vel'][1]
-            asteroid['pos'][2] += asteroid['vel'][2]
-            
-            # به‌روزرسانی چرخش
-            asteroid['rot'][0] += asteroid['rot_vel'][0]
-            asteroid['rot'][1] += asteroid['rot_vel'][1]
-            asteroid['rot'][2] += asteroid['rot_vel'][2]
-            
-            # حذف اگر خارج از صفحه شد
-            if asteroid['pos'][2] > 5:
-                self.asteroids.remove(asteroid)
-                self.spawn_asteroid()
-
-    def update_projectiles(self):
-        """به‌روزرسانی پرتابه‌ها"""
-        for projectile in self.projectiles[:]:
-            projectile['pos'][2] += projectile['vel'][2]
-            
-            # حذف اگر خارج از صفحه شد
-            if abs(projectile['pos'][2]) > 20:
-                self.projectiles.remove(projectile)
-
-    def update_particles(self):
-        """به‌روزرسانی ذرات"""
-        for particle in self.particles[:]:
-            particle['life'] -= 1
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
-            else:
-                particle['pos'][0] += particle['vel'][0]
-                particle['pos'][1] += particle['vel'][1]
-                particle['pos'][2] += particle['vel'][2]
-                particle['vel'][1] -= 0.01  # گرانش
-
-    def spawn_entities(self):
-        """تولید موجودیت‌های جدید"""
-        current_time = self.game_time
-        
-        # تولید دشمن
-        if current_time - self.last_spawn_time > 2:  # هر 2 ثانیه
-            self.spawn_enemy()
-            self.last_spawn_time = current_time
-
-    def check_collisions(self):
-        """بررسی برخوردها"""
-        self.check_player_collisions()
-        self.check_projectile_collisions()
-
-    def check_player_collisions(self):
-        """بررسی برخوردهای بازیکن"""
-        player_pos = self.player.pos
-        
-        # برخورد با دشمنان
-        for enemy in self.enemies[:]:
-            if self.calculate_distance(player_pos, enemy['pos']) < 1:
-                self.handle_player_hit()
-                self.create_explosion(enemy['pos'])
-                self.enemies.remove(enemy)
-                break
-        
-        # برخورد با سیارک‌ها
-        for asteroid in self.asteroids[:]:
-            if self.calculate_distance(player_pos, asteroid['pos']) < asteroid['size']:
-                self.handle_player_hit()
-                self.create_explosion(asteroid['pos'])
-                self.asteroids.remove(asteroid)
-                break
-
-    def check_projectile_collisions(self):
-        """بررسی برخورد پرتابه‌ها"""
-        for projectile in self.projectiles[:]:
-            # برخورد با دشمنان
-            for enemy in self.enemies[:]:
-                if self.calculate_distance(projectile['pos'], enemy['pos']) < 0.5:
-                    enemy['health'] -= 1
-                    if enemy['health'] <= 0:
-                        self.score += 100
-                        self.create_explosion(enemy['pos'])
-                        self.enemies.remove(enemy)
-                    self.projectiles.remove(projectile)
-                    break
-            
-            # برخورد با سیارک‌ها
-            for asteroid in self.asteroids[:]:
-                if self.calculate_distance(projectile['pos'], asteroid['pos']) < asteroid['size']:
-                    asteroid['health'] -= 1
-                    if asteroid['health'] <= 0:
-                        self.score += 50
-                        self.create_explosion(asteroid['pos'])
-                        self.asteroids.remove(asteroid)
-                        self.spawn_asteroid()
-                    self.projectiles.remove(projectile)
-                    break
-
-    def calculate_distance(self, pos1, pos2):
-        """محاسبه فاصله بین دو نقطه"""
-        return math.sqrt(
-            (pos1[0]-pos2[0])**2 + 
-            (pos1[1]-pos2[1])**2 + 
-            (pos1[2]-pos2[2])**2
-        )
+    def process_world_events(self):
+        """صدا و افکت‌های رویدادهای شبیه‌سازی"""
+        for kind, data in self.world.drain_events():
+            if kind == 'explosion':
+                self.sound_manager.play('explosion', data, self.camera_pos)
+                self.shake_near(data)
+            elif kind == 'player_hit':
+                self.create_screen_shake()
+            elif kind == 'powerup':
+                self.sound_manager.play('coin')
+            elif kind == 'level':
+                print(f"🌌 Level {data}: {len(self.world.level_manager.schedule)} enemies incoming")
+                self.enter_level_models(self.world.level_manager.scheduled_types())
+            elif kind == 'game_over':
+                self.game_over()
 
-    def handle_player_hit(self):
-        """مدیریت برخورد بازیکن"""
-        self.lives -= 1
-        self.fuel -= 20
-        
-        if self.lives <= 0:
-            self.game_over()
-        else:
-            # ایجاد افکت لرزش
-            self.create_screen_shake()
+    def load_level(self, level):
+        """بارگذاری موج‌های یک مرحله"""
+        waves_file = self.waves_file if level == self.start_level else None
+        self.world.load_level(level, waves_file)
 
     def game_over(self):
         """پایان بازی"""
         self.game_state = "GAME_OVER"
-        self.sounds['explosion'].play()
-
-    def create_explosion(self, pos):
-        """ایجاد انفجار"""
-        self.sounds['explosion'].play()
-        
-        # ایجاد ذرات انفجار
-        for _ in range(20):
-            particle = {
-                'pos': pos.copy(),
-                'vel': [
-                    random.uniform(-0.2, 0.2),
-                    random.uniform(-0.2, 0.2),
-                    random.uniform(-0.1, 0.1)
-                ],
-                'life': random.randint(20, 40),
-                'color': (
-                    random.uniform(0.8, 1),
-                    random.uniform(0.3, 0.6),
-                    random.uniform(0, 0.2)
-                ),
-                'size': random.uniform(0.05, 0.2)
-            }
-            self.particles.append(particle)
-
-    def create_screen_shake(self):
-        """ایجاد افکت لرزش صفحه"""
-        # پیاده‌سازی لرزش دوربین
-        self.camera_pos[0] += random.uniform(-0.3, 0.3)
-        self.camera_pos[1] += random.uniform(-0.3, 0.3)
+        self.sound_manager.play('explosion', priority=10.0)
+        self.end_session("game_over")
+
+    def create_screen_shake(self, amount=0.6):
+        """ایجاد افکت لرزش صفحه (با گذشت زمان شبیه‌سازی محو می‌شود)"""
+        self.camera_effects.shake(amount, self.world.time)
+
+    def shake_near(self, position, radius=6.0, amount=0.25):
+        """لرزش کوچک برای انفجارهای نزدیک بازیکن"""
+        player = self.world.player
+        if not player:
+            return
+        distance = float(np.linalg.norm(np.asarray(position) - as_array(player.position)))
+        if distance < radius:
+            self.create_screen_shake(amount * (1 - distance / radius))
 
     def shoot_projectile(self):
         """شلیک پرتابه"""
         if self.game_state != "PLAYING":
             return
-            
-        projectile = {
-            'pos': self.player.pos.copy(),
-            'vel': [0, 0, 0.3],
-            'type': 'player',
-            'damage': 1
-        }
-        self.projectiles.append(projectile)
-
-    def enemy_shoot(self, enemy):
-        """شلیک دشمن"""
-        projectile = {
-            'pos': enemy['pos'].copy(),
-            'vel': [0, 0, -0.2],
-            'type': 'enemy',
-            'damage': 1
-        }
-        self.projectiles.append(projectile)
-
-    def update_fuel(self):
-        """به‌روزرسانی سوخت"""
-        self.fuel = max(0, self.fuel - 0.02)
-        if self.fuel <= 0:
-            self.game_over()
+        if self.world.fire_player() is not None:
+            # پس‌زنی کوچک دوربین به عقب
+            self.camera_effects.recoil((0, 0, 0.12), self.world.time)
+
+    def cycle_views(self):
+        """چیدمان دید بعدی"""
+        index = (VIEW_LAYOUTS.index(self.view_layout) + 1) % len(VIEW_LAYOUTS)
+        self.view_layout = VIEW_LAYOUTS[index]
+        self.views = build_layout(self.view_layout)
+        print(f"🎥 View layout: {self.view_layout}")
 
     def render(self):
         """رندر کردن صحنه"""
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        glLoadIdentity()
-        
-        # تنظیم دوربین
-        gluLookAt(
-            self.camera_pos[0], self.camera_pos[1], self.camera_pos[2],
-            0, 0, -5,
-            0, 1, 0
-        )
-        
-        if self.game_state == "PLAYING":
-            self.render_game()
-        elif self.game_state == "MAIN_MENU":
+        scaled = self.scene_target is not None and self.resolution.enabled
+        if scaled:
+            self.scene_target.begin(self.resolution.scale)
+            self.gpu_timer.begin()
+        
+        # صحنه از هر دید، سپس رابط کاربری با وضوح اصلی روی کل صفحه
+        if self.game_state == "MAIN_MENU":
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
             self.render_main_menu()
-        elif self.game_state == "PAUSED":
-            self.render_game()
-            self.render_pause_menu()
-        elif self.game_state == "GAME_OVER":
+        else:
+            self.render_views(scaled)
+            self.render_hud()
+            if self.game_state == "PAUSED":
+                self.render_pause_menu()
+            elif self.game_state == "GAME_OVER":
+                self.render_game_over()
+        self.render_queue.flush(self.camera_pos)
+        if scaled:
+            gpu_ms = self.gpu_timer.poll()
+            if gpu_ms is not None:
+                self.resolution.record(gpu_ms)
+        
+        if not self.headless:
+            pygame.display.flip()
+
+    def finish_scene(self):
+        """پایان رسم صحنه در FBO و بزرگ‌نمایی آن پیش از رسم رابط کاربری"""
+        if self.scene_target.active:
+            self.gpu_timer.end()
+            self.scene_target.end()
+
+    def render_views(self, scaled):
+        """رسم صحنه از هر دید؛ داده‌های فریم یک بار آماده و بین دیدها مشترک است
+        و هر دید فقط حذف خارج از دید و فهرست رسم خودش را می‌سازد"""
+        width, height = self.scene_target.scaled_size if scaled else (self.width, self.height)
+        player = self.world.player
+        player_pos = as_array(player.position) if player else np.zeros(3, dtype=np.float32)
+        offset = self.camera_effects.evaluate(self.world.time, player_pos)
+        self.prepare_frame()
+        for view in self.views:
+            self.view = view
+            eye = view.setup(self.camera_pos, player_pos, width, height, offset)
             self.render_game()
-            self.render_game_over()
-        
-        pygame.display.flip()
+            self.render_queue.flush(eye, final=False)
+        glViewport(0, 0, width, height)
+
+    def prepare_frame(self):
+        """بارگذاری و محاسبات یک‌باره هر فریم که همه دیدها از آن استفاده می‌کنند"""
+        particles = self.world.particle_system
+        if self.particle_renderer:
+            self.particle_renderer.sync(particles)
+            self.frame_particles = None
+        else:
+            self.frame_particles = particles.evaluate()
 
     def render_game(self):
-        """رندر صحنه بازی"""
+        """ثبت فرمان‌های رسم صحنه بازی برای دید فعلی"""
         # رسم ستاره‌ها
-        self.render_stars()
+        if self.view.stars:
+            self.render_stars()
         
         # رسم سیارک‌ها
-        for asteroid in self.asteroids:
-            self.render_asteroid(asteroid)
+        self.render_asteroids()
         
         # رسم دشمنان
-        for enemy in self.enemies:
-            self.render_enemy(enemy)
+        self.render_enemies()
+        
+        # رسم سکه‌ها و قدرت‌افزایی‌ها
+        self.render_pickups()
         
         # رسم پرتابه‌ها
-        for projectile in self.projectiles:
-            self.render_projectile(projectile)
+        self.render_projectiles()
         
         # رسم ذرات
-        for particle in self.particles:
-            self.render_particle(particle)
+        if self.view.particles:
+            self.render_particles()
         
         # رسم بازیکن
         self.render_player()
-        
-        # رسم HUD
-        self.render_hud()
 
     def render_stars(self):
-        """رسم ستاره‌ها"""
-        glBegin(GL_POINTS)
-        for star in self.stars:
-            glColor3f(star['brightness'], star['brightness'], star['brightness'])
-            glVertex3f(star['pos'][0], star['pos'][1], star['pos'][2])
-        glEnd()
+        """ثبت رسم ستاره‌ها در pass پس‌زمینه"""
+        if len(self.world.stars):
+            self.render_queue.submit_call(PASS_BACKGROUND, 'points', self.draw_stars)
+
+    def draw_stars(self):
+        """رسم ستاره‌ها مستقیم از آرایه‌های ذخیره موجودیت"""
+        stars = self.world.stars
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, stars['pos'])
+        glColorPointer(3, GL_FLOAT, 0, stars['color'])
+        glDrawArrays(GL_POINTS, 0, min(self.star_count, len(stars)))
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def visible(self, positions, radii=1.0):
+        """ماسک موجودیت‌های داخل هرم دید فعلی و نزدیک‌تر از فاصله حذف؛ فاصله‌ها از دوربین دید"""
+        view = self.view
+        distance = np.linalg.norm(positions - view.eye, axis=1)
+        visible = distance < self.quality.preset.cull_distance * view.range_scale
+        if view.planes is not None:
+            visible &= spheres_in_frustum(view.planes, positions, radii)
+        return visible, distance
+
+    def submit_spheres(self, name, positions, scales=None, colors=None, radius=0.1):
+        """ثبت کره‌ها با نسخه نزدیک یا دور بر اساس فاصله LOD"""
+        visible, distance = self.visible(positions, radius if scales is None else scales)
+        far = distance >= self.quality.preset.lod_distance * self.view.range_scale
+        for model, mask in ((name, visible & ~far), (f"{name}_far", visible & far)):
+            if mask.any():
+                self.render_queue.submit(
+                    PASS_OPAQUE, 'scene', model, positions[mask],
+                    scales=None if scales is None else scales[mask],
+                    colors=None if colors is None else colors[mask]
+                )
 
     def render_player(self):
-        """رسم سفینه بازیکن"""
-        if not self.player:
+        """ثبت رسم سفینه بازیکن"""
+        player = self.world.player
+        if not player:
             return
-            
-        glPushMatrix()
-        glTranslatef(self.player.pos[0], self.player.pos[1], self.player.pos[2])
-        self.draw_model(self.player_model)
-        glPopMatrix()
+        position = player.position
+        self.render_queue.submit(PASS_OPAQUE, 'scene', 'player', [(position.x, position.y, position.z)])
 
-    def render_enemy(self, enemy):
-        """رسم دشمن"""
-        glPushMatrix()
-        glTranslatef(enemy['pos'][0], enemy['pos'][1], enemy['pos'][2])
-        glRotatef(enemy['rot'][0], 1, 0, 0)
-        glRotatef(enemy['rot'][1], 0, 1, 0)
-        glRotatef(enemy['rot'][2], 0, 0, 1)
-        self.draw_model(self.enemy_model)
-        glPopMatrix()
+    def render_enemies(self):
+        """ثبت رسم دشمنان"""
+        enemies = self.world.enemies
+        visible, _ = self.visible(enemies['pos'])
+        for type_index, enemy_type in enumerate(ENEMY_TYPES):
+            # مدل نوعی که مرحله تازه لازم دارد ممکن است هنوز در حال بارگذاری باشد
+            if getattr(self, f"enemy_{enemy_type}_model") is None:
+                continue
+            mask = visible & (enemies['type'] == type_index)
+            self.render_queue.submit(PASS_OPAQUE, 'scene', f"enemy_{enemy_type}", enemies['pos'][mask],
+                                     rotations=enemies['rot'][mask])
 
-    def render_asteroid(self, asteroid):
-        """رسم سیارک"""
-        glPushMatrix()
-        glTranslatef(asteroid['pos'][0], asteroid['pos'][1], asteroid['pos'][2])
-        glRotatef(asteroid['rot'][0], 1, 0, 0)
-        glRotatef(asteroid['rot'][1], 0, 1, 0)
-        glRotatef(asteroid['rot'][2], 0, 0, 1)
-        glScalef(asteroid['size'], asteroid['size'], asteroid['size'])
-        self.draw_model(self.asteroid_model)
-        glPopMatrix()
+    def render_asteroids(self):
+        """ثبت رسم سیارک‌ها"""
+        asteroids = self.world.asteroids
+        visible, _ = self.visible(asteroids['pos'], asteroids['size'])
+        self.render_queue.submit(PASS_OPAQUE, 'scene', 'asteroid', asteroids['pos'][visible],
+                                 rotations=asteroids['rot'][visible], scales=asteroids['size'][visible])
 
-    def render_projectile(self, projectile):
-        """رسم پرتابه"""
-        glPushMatrix()
-        glTranslatef(projectile['pos'][0], projectile['pos'][1], projectile['pos'][2])
-        
-        if projectile['type'] == 'player':
-            glColor3f(0, 1, 1)  # آبی فیروزه‌ای
-        else:
-            glColor3f(1, 0, 0)  # قرمز
-        
-        glutSolidSphere(0.1, 8, 8)
-        glPopMatrix()
+    def render_pickups(self):
+        """ثبت رسم سکه‌ها و قدرت‌افزایی‌ها با مدل سکه در یک دسته (رنگ و اندازه از جدول نوع)"""
+        powerups = self.world.powerups
+        if not len(powerups) or self.coin_model is None:
+            return
+        types = powerups['type']
+        scales = PICKUP_SCALES[types]
+        visible, _ = self.visible(powerups['pos'], scales * 0.3)
+        self.render_queue.submit(PASS_OPAQUE, 'scene', 'coin', powerups['pos'][visible],
+                                 rotations=powerups['rot'][visible], scales=scales[visible],
+                                 colors=PICKUP_COLORS[types[visible]])
 
-    def render_particle(self, particle):
-        """رسم ذره"""
-        glPushMatrix()
-        glTranslatef(particle['pos'][0], particle['pos'][1], particle['pos'][2])
-        glColor3f(particle['color'][0], particle['color'][1], particle['color'][2])
-        glutSolidSphere(particle['size'], 6, 6)
-        glPopMatrix()
+    def render_projectiles(self):
+        """ثبت رسم پرتابه‌ها (آبی فیروزه‌ای برای بازیکن، قرمز برای دشمن)"""
+        projectiles = self.world.projectiles
+        colors = np.where((projectiles['owner'] == OWNER_PLAYER)[:, None],
+                          np.float32([0, 1, 1]), np.float32([1, 0, 0]))
+        self.submit_spheres('projectile', projectiles['pos'], colors=colors)
 
-    def draw_model(self, model):
-        """رسم مدل سه‌بعدی"""
-        glColor3f(model['color'][0], model['color'][1], model['color'][2])
-        
+    def render_particles(self):
+        """ثبت رسم ذرات (شیدر ذرات یا موقعیت‌های محاسبه‌شده یک‌باره روی CPU)"""
+        if self.particle_renderer:
+            self.render_queue.submit_call(PASS_OPAQUE, 'gpu_particles', self.draw_gpu_particles)
+            return
+        positions, colors, sizes = self.frame_particles
+        self.submit_spheres('particle', positions, scales=sizes, colors=colors)
+
+    def draw_gpu_particles(self):
+        """رسم تمام ذرات با شیدر ذرات"""
+        self.particle_renderer.draw(self.world.particle_system)
+
+    def draw_model(self, model, colored=False):
+        """رسم مدل سه‌بعدی؛ رنگ مدل فقط وقتی رنگ نمونه (colored) تنظیم نشده باشد"""
+        if not colored:
+            glColor3f(model['color'][0], model['color'][1], model['color'][2])
+        if 'display_list' in model:
+            glCallList(model['display_list'])
+        else:
+            self.draw_model_immediate(model)
+
+    def draw_model_immediate(self, model):
+        """رسم مستقیم هندسه مدل با glBegin/glEnd (بدون رنگ)"""
         glBegin(GL_TRIANGLES)
         for face in model['faces']:
             for vertex_index in face:
@@ -802,9 +978,8 @@ class Galaxy3DEngine:
                 glVertex3f(vertex[0], vertex[1], vertex[2])
         glEnd()
 
-    def render_hud(self):
-        """رسم رابط کاربری"""
-        # ذخیره حالت OpenGL
+    def begin_overlay(self):
+        """حالت رسم دوبعدی روی صفحه (HUD و منوها)"""
         glMatrixMode(GL_PROJECTION)
         glPushMatrix()
         glLoadIdentity()
@@ -816,17 +991,9 @@ class Galaxy3DEngine:
         # غیرفعال کردن نورپردازی برای HUD
         glDisable(GL_LIGHTING)
         glDisable(GL_DEPTH_TEST)
-        
-        # رسم اطلاعات بازی
-        self.draw_text(f"Score: {self.score}", 10, self.height - 30)
-        self.draw_text(f"Level: {self.level}", 10, self.height - 60)
-        self.draw_text(f"Lives: {self.lives}", 10, self.height - 90)
-        self.draw_text(f"Fuel: {int(self.fuel)}%", 10, self.height - 120)
-        
-        # نوار سوخت
-        self.draw_fuel_bar()
-        
-        # بازیابی حالت OpenGL
+
+    def end_overlay(self):
+        """بازیابی حالت OpenGL پس از رسم دوبعدی"""
         glEnable(GL_DEPTH_TEST)
         glEnable(GL_LIGHTING)
         glMatrixMode(GL_PROJECTION)
@@ -834,8 +1001,60 @@ class Galaxy3DEngine:
         glMatrixMode(GL_MODELVIEW)
         glPopMatrix()
 
+    def render_hud(self):
+        """ثبت رسم رابط کاربری"""
+        self.render_queue.submit_call(PASS_OVERLAY, 'overlay', self.draw_hud)
+
+    def draw_hud(self):
+        """رسم رابط کاربری"""
+        # رسم اطلاعات بازی
+        world = self.world
+        self.draw_text(f"Score: {world.score}", 10, self.height - 30)
+        self.draw_text(f"Coins: {world.coins}", 200, self.height - 30)
+        self.draw_text(f"Level: {world.level}", 10, self.height - 60)
+        self.draw_text(f"Lives: {world.lives}", 10, self.height - 90)
+        self.draw_text(f"Fuel: {int(world.fuel)}%", 10, self.height - 120)
+        
+        # نوار سوخت
+        self.draw_fuel_bar()
+        
+        # گزارش حافظه (F3)
+        for i, line in enumerate(self.memory_tracker.hud_lines()):
+            self.draw_text(line, self.width - 360, self.height - 30 - i * 20)
+        
+        # قاب دیدهای کوچک (نقشه و آینه)
+        self.draw_view_frames()
+        
+        # مقیاس وضوح پویا
+        if self.scene_target:
+            for line in self.resolution.report_lines(self.width, self.height, icons=False):
+                self.draw_text(line, self.width - 560, 20)
+        
+        # زمان سیستم‌های شبیه‌سازی و آمار رسم (F5)؛ فونت bitmap فقط ASCII رسم می‌کند
+        if self.show_system_timings:
+            lines = (self.world.scheduler.report_lines(icons=False) + self.render_queue.report_lines(icons=False) +
+                     self.quality.report_lines(icons=False))
+            for i, line in enumerate(lines):
+                self.draw_text(line, 10, self.height - 190 - i * 20)
+
+    def draw_view_frames(self):
+        """قاب دور دیدهای درون صفحه با مختصات پنجره"""
+        glColor3f(0.6, 0.8, 1.0)
+        for view in self.views:
+            if not view.border:
+                continue
+            x, y, w, h = view.pixel_rect(self.width, self.height)
+            glBegin(GL_LINE_LOOP)
+            glVertex2f(x, y)
+            glVertex2f(x + w, y)
+            glVertex2f(x + w, y + h)
+            glVertex2f(x, y + h)
+            glEnd()
+
     def draw_text(self, text, x, y):
         """رسم متن (ساده)"""
+        if not self.text_enabled:
+            return
         # در این نسخه ساده، از رسم متن OpenGL استفاده می‌کنیم
         glColor3f(1, 1, 1)
         glRasterPos2f(x, y)
@@ -859,10 +1078,11 @@ class Galaxy3DEngine:
         glEnd()
         
         # نوار سوخت
-        fuel_width = (self.fuel / self.max_fuel) * bar_width
-        if self.fuel > 50:
+        fuel = max(0.0, self.world.fuel)
+        fuel_width = (fuel / self.world.max_fuel) * bar_width
+        if fuel > 50:
             glColor3f(0, 1, 0)  # سبز
-        elif self.fuel > 20:
+        elif fuel > 20:
             glColor3f(1, 1, 0)  # زرد
         else:
             glColor3f(1, 0, 0)  # قرمز
@@ -875,46 +1095,48 @@ class Galaxy3DEngine:
         glEnd()
 
     def render_main_menu(self):
+        """ثبت رسم منوی اصلی"""
+        self.render_queue.submit_call(PASS_OVERLAY, 'overlay', self.draw_main_menu)
+
+    def draw_main_menu(self):
         """رسم منوی اصلی"""
-        glMatrixMode(GL_PROJECTION)
-        glPushMatrix()
-        glLoadIdentity()
-        gluOrtho2D(0, self.width, 0, self.height)
-        glMatrixMode(GL_MODELVIEW)
-        glPushMatrix()
-        glLoadIdentity()
-        
-        glDisable(GL_LIGHTING)
-        glDisable(GL_DEPTH_TEST)
-        
         # عنوان بازی
         self.draw_text("🚀 GALAXY ADVANCED 3D GAME", self.width//2 - 150, self.height//2 + 100)
         self.draw_text("ACTOn Game Studio", self.width//2 - 80, self.height//2 + 70)
         
         # دکمه‌ها
-        self.draw_text("Press ENTER to Start", self.width//2 - 80, self.height//2)
-        self.draw_text("Press ESC to Quit", self.width//2 - 70, self.height//2 - 40)
+        if self.resources_ready():
+            self.draw_text("Press ENTER to Start", self.width//2 - 80, self.height//2)
+        else:
+            progress = self.resources.progress()
+            self.draw_text(f"Loading... {int(progress * 100)}%", self.width//2 - 60, self.height//2)
+            self.draw_progress_bar(progress, self.width//2 - 100, self.height//2 - 25, 200, 10)
+        self.draw_text("Press ESC to Quit", self.width//2 - 70, self.height//2 - 60)
+
+    def draw_progress_bar(self, progress, x, y, width, height):
+        """رسم نوار پیشرفت بارگذاری"""
+        glColor3f(0.3, 0.3, 0.3)
+        glBegin(GL_QUADS)
+        glVertex2f(x, y)
+        glVertex2f(x + width, y)
+        glVertex2f(x + width, y + height)
+        glVertex2f(x, y + height)
+        glEnd()
         
-        glEnable(GL_DEPTH_TEST)
-        glEnable(GL_LIGHTING)
-        glMatrixMode(GL_PROJECTION)
-        glPopMatrix()
-        glMatrixMode(GL_MODELVIEW)
-        glPopMatrix()
+        glColor3f(0, 0.8, 1)
+        glBegin(GL_QUADS)
+        glVertex2f(x, y)
+        glVertex2f(x + width * progress, y)
+        glVertex2f(x + width * progress, y + height)
+        glVertex2f(x, y + height)
+        glEnd()
 
     def render_pause_menu(self):
+        """ثبت رسم منوی توقف"""
+        self.render_queue.submit_call(PASS_OVERLAY, 'overlay', self.draw_pause_menu)
+
+    def draw_pause_menu(self):
         """رسم منوی توقف"""
-        glMatrixMode(GL_PROJECTION)
-        glPushMatrix()
-        glLoadIdentity()
-        gluOrtho2D(0, self.width, 0, self.height)
-        glMatrixMode(GL_MODELVIEW)
-        glPushMatrix()
-        glLoadIdentity()
-        
-        glDisable(GL_LIGHTING)
-        glDisable(GL_DEPTH_TEST)
-        
         # پس‌زمینه نیمه شفاف
         glColor4f(0, 0, 0, 0.7)
         glBegin(GL_QUADS)
@@ -927,27 +1149,13 @@ class Galaxy3DEngine:
         # متن توقف
         self.draw_text("PAUSED", self.width//2 - 40, self.height//2 + 20)
         self.draw_text("Press ESC to Continue", self.width//2 - 90, self.height//2 - 20)
-        
-        glEnable(GL_DEPTH_TEST)
-        glEnable(GL_LIGHTING)
-        glMatrixMode(GL_PROJECTION)
-        glPopMatrix()
-        glMatrixMode(GL_MODELVIEW)
-        glPopMatrix()
 
     def render_game_over(self):
+        """ثبت رسم صفحه پایان بازی"""
+        self.render_queue.submit_call(PASS_OVERLAY, 'overlay', self.draw_game_over)
+
+    def draw_game_over(self):
         """رسم صفحه پایان بازی"""
-        glMatrixMode(GL_PROJECTION)
-        glPushMatrix()
-        glLoadIdentity()
-        gluOrtho2D(0, self.width, 0, self.height)
-        glMatrixMode(GL_MODELVIEW)
-        glPushMatrix()
-        glLoadIdentity()
-        
-        glDisable(GL_LIGHTING)
-        glDisable(GL_DEPTH_TEST)
-        
         # پس‌زمینه نیمه شفاف
         glColor4f(0, 0, 0, 0.8)
         glBegin(GL_QUADS)
@@ -959,54 +1167,91 @@ class Galaxy3DEngine:
         
         # متن پایان بازی
         self.draw_text("GAME OVER", self.width//2 - 50, self.height//2 + 50)
-        self.draw_text(f"Final Score: {self.score}", self.width//2 - 70, self.height//2)
+        self.draw_text(f"Final Score: {self.world.score}", self.width//2 - 70, self.height//2)
         self.draw_text("Press ENTER to Restart", self.width//2 - 90, self.height//2 - 40)
         self.draw_text("Press ESC to Quit", self.width//2 - 70, self.height//2 - 80)
         
-        glEnable(GL_DEPTH_TEST)
-        glEnable(GL_LIGHTING)
-        glMatrixMode(GL_PROJECTION)
-        glPopMatrix()
-        glMatrixMode(GL_MODELVIEW)
-        glPopMatrix()
+        # جدول امتیازها وقتی پرس‌وجو روی نخ ذخیره تمام شده باشد
+        if self.top_scores is not None and self.top_scores.done():
+            self.draw_text("High Scores", self.width//2 - 50, self.height//2 - 130)
+            for rank, row in enumerate(self.top_scores.result(), 1):
+                self.draw_text(f"{rank}. {row['score']}  (level {row['level']})",
+                               self.width//2 - 70, self.height//2 - 130 - rank * 25)
 
     def start_game(self):
         """شروع بازی جدید"""
+        self.end_session("restart")
         self.game_state = "PLAYING"
-        self.score = 0
-        self.level = 1
-        self.lives = 3
-        self.fuel = 100
-        self.player = PlayerShip()
-        self.enemies.clear()
-        self.asteroids.clear()
-        self.projectiles.clear()
-        self.particles.clear()
         self.create_game_world()
+        self.camera_effects.reset()
+        self.load_level(self.start_level)
+        self.begin_session()
+
+    def begin_session(self):
+        """شروع ثبت آمار یک جلسه بازی"""
+        if not self.stats_store:
+            return
+        self.session_id = self.stats_store.new_session_id()
+        self.session_started = time.time()
+        self.frame_times.reset()
+
+    def record_frame_time(self, frame_ms):
+        """زمان فریم جلسه؛ خلاصه هر پنجره پر در بافر ذخیره قرار می‌گیرد"""
+        if self.frame_times.record(frame_ms):
+            self.stats_store.record_frame_window(self.session_id, self.world.time, self.frame_times.take_window())
+
+    def end_session(self, outcome):
+        """ثبت نتیجه جلسه فعلی (بدون انتظار برای دیسک) و درخواست جدول امتیازها"""
+        if not self.session_id:
+            return
+        window = self.frame_times.take_window()
+        if window:
+            self.stats_store.record_frame_window(self.session_id, self.world.time, window)
+        stats, kills = self.world.session_stats()
+        self.stats_store.record_session(
+            self.session_id, stats, self.frame_times.session_summary(), kills,
+            started=self.session_started, outcome=outcome, seed=str(self.world.random.seed),
+            renderer="shader" if self.shader_renderer else "fixed", quality=self.quality.preset.name
+        )
+        self.session_id = None
+        self.top_scores = self.stats_store.leaderboard(5)
 
     def restart_game(self):
         """شروع مجدد بازی"""
         self.start_game()
 
-class PlayerShip:
-    """کلاس سفینه بازیکن"""
-    
-    def __init__(self):
-        self.pos = [0, 0, -2]  # موقعیت اولیه
-        self.vel = [0, 0, 0]   # سرعت
-        self.rot = [0, 0, 0]   # چرخش
-        self.health = 100
-        self.max_health = 100
-        self.speed = 0.1
-
 def main():
     """تابع اصلی"""
+    parser = argparse.ArgumentParser(description="Galaxy Advanced 3D Game")
+    parser.add_argument("--level", type=int, default=1, help="level to start from")
+    parser.add_argument("--waves", help="wave file for the starting level (e.g. levels/stress.waves)")
+    parser.add_argument("--renderer", choices=("auto", "shader", "fixed"), default="auto",
+                        help="GLSL renderer with fixed-function fallback, or fixed-function only")
+    parser.add_argument("--quality", choices=("LOW", "MEDIUM", "HIGH", "ULTRA", "AUTO"), default="HIGH",
+                        help="graphics budgets; AUTO adjusts them to hold the target FPS")
+    parser.add_argument("--particles", choices=("auto", "gpu", "cpu"), default="auto",
+                        help="particle motion in the vertex shader or on the CPU")
+    parser.add_argument("--views", choices=VIEW_LAYOUTS, default="single",
+                        help="viewport layout: split screen, minimap or rear-view mirror (F9 cycles)")
+    parser.add_argument("--dynamic-resolution", action="store_true",
+                        help="render the scene at a GPU-time driven scale and upscale it to the window")
+    parser.add_argument("--stats-db", default=str(DEFAULT_DB),
+                        help="SQLite file for high scores and session statistics")
+    parser.add_argument("--no-stats", action="store_true", help="do not record session statistics")
+    args = parser.parse_args()
+    
     print("🚀 Starting Galaxy Advanced 3D Game...")
     print("🎮 Controls: Arrow Keys to move, SPACE to shoot, ESC to pause")
+    print("🧠 Debug: F3 memory report, F4 tracemalloc snapshot, F5 system timings")
+    print("🎛️ Quality: F6 next preset, F7 toggle auto quality, F8 toggle dynamic resolution")
+    print("🎥 Views: F9 cycle single / split screen / minimap / rear view")
     print("🏆 Developed by ACTOn Game Studio")
     
     try:
-        game = Galaxy3DEngine()
+        game = Galaxy3DEngine(start_level=args.level, waves_file=args.waves, renderer=args.renderer,
+                               particle_backend=args.particles, quality=args.quality,
+                               dynamic_resolution=args.dynamic_resolution, views=args.views,
+                               stats_db=None if args.no_stats else args.stats_db)
         game.run()
     except Exception as e:
         print(f"❌ Fatal error: {e}")
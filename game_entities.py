@@ -1,8 +1,8 @@
 import math
-import random
 from dataclasses import dataclass
-from typing import List, Tuple
 import numpy as np
+from entity_store import ComponentPool
+from random_service import ParameterBatch
 
 @dataclass
 class Vector3:
@@ -63,7 +63,7 @@ class PlayerShip(GameObject):
         self.speed = 5.0
         self.rotation_speed = 2.0
         self.weapon_cooldown = 0.0
-        self.weapon_rate = 0.2  # شلیک در هر ثانیه
+        self.weapon_rate = 5.0  # شلیک در هر ثانیه
         self.invulnerable = 0.0
         
     def update(self, delta_time: float):
@@ -90,16 +90,12 @@ class PlayerShip(GameObject):
         """آیا می‌تواند شلیک کند؟"""
         return self.weapon_cooldown <= 0
         
-    def shoot(self):
-        """شلیک کردن"""
+    def shoot(self) -> bool:
+        """شلیک کردن؛ پرتابه توسط شبیه‌سازی ساخته می‌شود"""
         if self.can_shoot():
             self.weapon_cooldown = 1.0 / self.weapon_rate
-            return Projectile(
-                self.position + Vector3(0, 0, 0.5),
-                Vector3(0, 0, 1),
-                "player"
-            )
-        return None
+            return True
+        return False
         
     def take_damage(self, damage: int):
         """دریافت آسیب با در نظر گرفتن حالت آسیب‌ناپذیر"""
@@ -107,319 +103,403 @@ class PlayerShip(GameObject):
             super().take_damage(damage)
             self.invulnerable = 1.0  # 1 ثانیه آسیب‌ناپذیر
 
-class EnemyShip(GameObject):
-    """سفینه دشمن"""
+def as_array(position):
+    """تبدیل Vector3 یا دنباله به آرایه (3,)"""
+    if isinstance(position, Vector3):
+        return np.array([position.x, position.y, position.z], dtype=np.float32)
+    return np.asarray(position, dtype=np.float32).reshape(3)
+
+class EntityView:
+    """دسترسی شیءگرا به یک موجودیت ذخیره‌شده در ComponentPool با شناسه پایدار"""
     
-    def __init__(self, position: Vector3, enemy_type: str = "fighter"):
-        super().__init__(position)
-        self.enemy_type = enemy_type
-        self.speed = 2.0
-        self.weapon_cooldown = 0.0
-        self.detection_range = 10.0
-        self.attack_range = 5.0
-        
-        # تنظیمات بر اساس نوع دشمن
-        if enemy_type == "fighter":
-            self.health = 50
-            self.max_health = 50
-            self.weapon_rate = 1.0
-        elif enemy_type == "bomber":
-            self.health = 100
-            self.max_health = 100
-            self.weapon_rate = 0.5
-        elif enemy_type == "scout":
-            self.health = 30
-            self.max_health = 30
-            self.weapon_rate = 2.0
-            
-    def update(self, delta_time: float, player_position: Vector3):
-        """به‌روزرسانی دشمن"""
-        super().update(delta_time)
+    def __init__(self, pool: ComponentPool, entity_id: int):
+        self.pool = pool
+        self.entity_id = entity_id
         
-        if self.weapon_cooldown > 0:
-            self.weapon_cooldown -= delta_time
-            
-        # AI ساده برای تعقیب بازیکن
-        direction = player_position - self.position
-        distance = direction.length()
-        
-        if distance < self.detection_range:
-            # حرکت به سمت بازیکن
-            if distance > self.attack_range:
-                self.velocity = direction.normalize() * self.speed
-            else:
-                # مانور در فاصله حمله
-                self.velocity = Vector3(0, 0, 0)
-                
-    def can_shoot(self, player_position: Vector3) -> bool:
-        """آیا می‌تواند به بازیکن شلیک کند؟"""
-        if self.weapon_cooldown > 0:
+    @property
+    def row(self) -> int:
+        return self.pool.row_of(self.entity_id)
+        
+    @property
+    def is_alive(self) -> bool:
+        row = self.row
+        if row < 0:
             return False
+        return 'health' not in self.pool or self.pool['health'][row] > 0
+        
+    def get(self, component: str):
+        """مقدار یک مؤلفه (None اگر موجودیت حذف شده باشد)"""
+        row = self.row
+        return None if row < 0 else self.pool[component][row]
+        
+    def set(self, component: str, value):
+        """تغییر مقدار یک مؤلفه"""
+        row = self.row
+        if row >= 0:
+            self.pool[component][row] = value
             
-        direction = player_position - self.position
-        return direction.length() <= self.attack_range
+    @property
+    def position(self) -> Vector3:
+        return Vector3(*self.get('pos').tolist())
         
-    def shoot(self, player_position: Vector3):
-        """شلیک به سمت بازیکن"""
-        if self.can_shoot(player_position):
-            self.weapon_cooldown = 1.0 / self.weapon_rate
-            direction = (player_position - self.position).normalize()
-            return Projectile(
-                self.position,
-                direction,
-                "enemy"
-            )
-        return None
-
-class Asteroid(GameObject):
-    """سیارک"""
-    
-    def __init__(self, position: Vector3, size: float = 1.0):
-        super().__init__(position)
-        self.size = size
-        self.rotation_velocity = Vector3(
-            random.uniform(-2, 2),
-            random.uniform(-2, 2),
-            random.uniform(-2, 2)
-        )
+    @position.setter
+    def position(self, value):
+        self.set('pos', as_array(value))
         
-        # سلامت بر اساس اندازه
-        self.health = int(size * 20)
-        self.max_health = self.health
+    @property
+    def velocity(self) -> Vector3:
+        return Vector3(*self.get('vel').tolist())
         
-    def update(self, delta_time: float):
-        super().update(delta_time)
+    @velocity.setter
+    def velocity(self, value):
+        self.set('vel', as_array(value))
         
-        # چرخش سیارک
-        self.rotation.x += self.rotation_velocity.x * delta_time
-        self.rotation.y += self.rotation_velocity.y * delta_time
-        self.rotation.z += self.rotation_velocity.z * delta_time
-
-class Projectile(GameObject):
-    """پرتابه"""
-    
-    def __init__(self, position: Vector3, direction: Vector3, owner: str):
-        super().__init__(position)
-        self.direction = direction
-        self.speed = 10.0
-        self.owner = owner  # "player" یا "enemy"
-        self.damage = 25 if owner == "player" else 10
-        self.lifetime = 3.0  # زمان زندگی بر حسب ثانیه
+    @property
+    def health(self) -> float:
+        return float(self.get('health'))
         
-    def update(self, delta_time: float):
-        self.position = self.position + self.direction * self.speed * delta_time
-        self.lifetime -= delta_time
+    @property
+    def size(self) -> float:
+        return float(self.get('size'))
         
-        if self.lifetime <= 0:
-            self.is_alive = False
+    def take_damage(self, damage: float):
+        """دریافت آسیب؛ حذف موجودیت در سیستم‌های شبیه‌سازی انجام می‌شود"""
+        row = self.row
+        if row >= 0:
+            self.pool['health'][row] -= damage
 
-class PowerUp(GameObject):
-    """قدرت‌افزایی"""
+class TrailEmitter:
+    """منبع پیوسته رد موتور: نرخ تولید (ذره در ثانیه برای هر موجودیت) و سقف تولید هر تیک"""
     
-    def __init__(self, position: Vector3, power_type: str):
-        super().__init__(position)
-        self.power_type = power_type  # "health", "fuel", "weapon", "shield"
-        self.rotation_velocity = Vector3(0, 2, 0)
-        
-    def update(self, delta_time: float):
-        super().update(delta_time)
+    def __init__(self, rate=30.0, burst=2, offset=(0, 0, 0), color=(0.2, 0.8, 1.0),
+                 speed_factor=-0.5, spread=0.6, life=(0.3, 1.0), size=(0.05, 0.15), budget_share=0.75):
+        self.rate = rate
+        self.burst = burst
+        self.budget_share = budget_share  # باقی بودجه برای انفجارها می‌ماند
+        self.offset = np.asarray(offset, dtype=np.float32)
+        self.color = color
+        self.speed_factor = speed_factor
+        self.spread = spread
+        self.life = life
+        self.size = size
         
-        # چرخش آرام
-        self.rotation.y += self.rotation_velocity.y * delta_time
+    def counts(self, accumulators, delta_time):
+        """تعداد ذرات هر منبع در این تیک؛ accumulators درجا به‌روز می‌شود"""
+        accumulators += self.rate * delta_time
+        counts = np.minimum(np.floor(accumulators), self.burst).astype(np.int64)
+        accumulators -= counts
+        np.minimum(accumulators, 1.0, out=accumulators)  # عقب‌ماندگی پس از سقف انباشته نمی‌شود
+        return counts
 
 class ParticleSystem:
-    """سیستم ذرات برای افکت‌های بصری"""
+    """سیستم ذرات برای افکت‌های بصری؛ فقط پارامترهای تولید هر ذره نگه داشته می‌شوند
+
+    حرکت ذرات بالستیک است و موقعیت هر لحظه از فرم بسته محاسبه می‌شود:
+        pos = origin + vel * age - 0.5 * gravity * age² * ŷ ،  age = time - born
+    (gravity برای هر ذره جداست؛ رد موتور بدون گرانش است)
+    بنابراین CPU در هر فریم فقط ساعت را جلو می‌برد؛ همین فرمول در evaluate (مسیر CPU)
+    و در شیدر ذرات (shader_renderer.ParticleRenderer) اجرا می‌شود.
+
+    ذرات در یک حلقه با ظرفیت ثابت ذخیره می‌شوند: ذره جدید جای قدیمی‌ترین ردیف را می‌گیرد
+    و ردیف‌های مرده (age >= life) رسم نمی‌شوند. emitted شمارنده کل ذرات نوشته‌شده است
+    تا مسیر GPU فقط ردیف‌های تازه را بارگذاری کند. budget سقف ذرات زنده است و ذرات اضافه
+    هر دسته تولید نمی‌شوند.
+    """
     
-    def __init__(self):
-        self.particles = []
+    COMPONENTS = {
+        'origin': ((3,), np.float32),
+        'vel': ((3,), np.float32),
+        'color': ((3,), np.float32),
+        'size': ((), np.float32),
+        'born': ((), np.float32),
+        'life': ((), np.float32),
+        'gravity': ((), np.float32),
+    }
+    
+    # مقادیر بر حسب ثانیه (معادل ظاهر قبلی موتور در 60 FPS)
+    EXPLOSION_SPEED = (12.0, 12.0, 6.0)
+    EXPLOSION_LIFE = (1 / 3, 2 / 3)
+    GRAVITY = 36.0
+    CAPACITY = 2048
+    
+    # ستون‌های پارامترهای تصادفی هر ذره در [0, 1)
+    RANDOM_COLUMNS = 8
+    # انفجار: رنگ (3)، جهت سرعت (3)، عمر، اندازه
+    EXPLOSION_LOW = np.float32([0.8, 0.3, 0.0, -1, -1, -1, EXPLOSION_LIFE[0], 0.05])
+    EXPLOSION_HIGH = np.float32([1.0, 0.6, 0.2, 1, 1, 1, EXPLOSION_LIFE[1], 0.2])
+    
+    def __init__(self, pool: ComponentPool = None, gravity: float = GRAVITY, random: ParameterBatch = None,
+                 capacity: int = CAPACITY, budget: int = None):
+        self.pool = pool if pool is not None else ComponentPool('particles', self.COMPONENTS, capacity)
+        self.gravity = gravity
+        # پارامترهای یکنواخت [0, 1) پیش‌تولیدشده که برای هر افکت به بازه آن مقیاس می‌شوند
+        self.random = random or ParameterBatch(np.random.default_rng(), np.zeros(self.RANDOM_COLUMNS),
+                                               np.ones(self.RANDOM_COLUMNS))
+        self.capacity = capacity
+        self.budget = capacity if budget is None else min(budget, capacity)
+        self.resets = 0
+        self.reset()
         
-    def create_explosion(self, position: Vector3, count: int = 20):
+    def reset(self):
+        """حذف تمام ذرات و صفر کردن ساعت؛ ردیف‌های حلقه از پیش ساخته می‌شوند"""
+        self.pool.clear()
+        self.pool.spawn(self.capacity)
+        self.time = 0.0
+        self.emitted = 0
+        self.resets += 1
+        
+    def __len__(self):
+        return int(np.count_nonzero(self.alive()))
+        
+    def available(self, share=1.0):
+        """تعداد ذراتی که تا رسیدن به سهم share از بودجه می‌توان تولید کرد"""
+        return max(int(self.budget * share) - len(self), 0)
+        
+    def alive(self, time=None):
+        """ماسک ردیف‌های زنده در زمان داده‌شده"""
+        age = np.float32(self.time if time is None else time) - self.pool['born']
+        return (age >= 0) & (age < self.pool['life'])
+        
+    def emit(self, positions, velocities, life, size, color, gravity=None):
+        """نوشتن دسته‌ای پارامترهای تولید در حلقه تا سقف بودجه؛ اندیس ردیف‌ها را برمی‌گرداند"""
+        velocities = np.asarray(velocities, dtype=np.float32).reshape(-1, 3)
+        values = {'origin': positions, 'vel': velocities, 'color': color, 'size': size, 'life': life,
+                  'gravity': self.gravity if gravity is None else gravity}
+        count = min(len(velocities), self.available())
+        rows = (self.emitted + np.arange(count)) % self.capacity
+        for component, value in values.items():
+            value = np.asarray(value, dtype=np.float32)
+            if value.ndim == self.pool[component].ndim:
+                value = value[:count]
+            self.pool[component][rows] = value
+        self.pool['born'][rows] = self.time
+        self.emitted += count
+        return rows
+        
+    def create_explosion(self, position, count: int = 20):
         """ایجاد افکت انفجار"""
-        for _ in range(count):
-            particle = {
-                'position': Vector3(position.x, position.y, position.z),
-                'velocity': Vector3(
-                    random.uniform(-2, 2),
-                    random.uniform(-2, 2),
-                    random.uniform(-1, 1)
-                ),
-                'life': random.uniform(0.5, 2.0),
-                'max_life': 2.0,
-                'size': random.uniform(0.1, 0.3),
-                'color': (
-                    random.uniform(0.8, 1.0),
-                    random.uniform(0.3, 0.6),
-                    random.uniform(0.0, 0.2)
-                )
-            }
-            self.particles.append(particle)
+        params = self.EXPLOSION_LOW + (self.EXPLOSION_HIGH - self.EXPLOSION_LOW) * self.random.take(count)
+        return self.emit(
+            as_array(position),
+            params[:, 3:6] * np.float32(self.EXPLOSION_SPEED),
+            params[:, 6],
+            params[:, 7],
+            params[:, 0:3]
+        )
             
-    def create_engine_trail(self, position: Vector3, velocity: Vector3):
-        """ایجاد رد موتور"""
-        particle = {
-            'position': Vector3(position.x, position.y, position.z),
-            'velocity': velocity * -0.5 + Vector3(
-                random.uniform(-0.1, 0.1),
-                random.uniform(-0.1, 0.1),
-                random.uniform(-0.1, 0.1)
-            ),
-            'life': random.uniform(0.3, 1.0),
-            'max_life': 1.0,
-            'size': random.uniform(0.05, 0.15),
-            'color': (0.2, 0.8, 1.0)
-        }
-        self.particles.append(particle)
+    def create_engine_trail(self, position, velocity, emitter=None):
+        """ایجاد یک ذره رد موتور"""
+        accumulator = np.ones(1, dtype=np.float32)
+        return self.emit_trails(emitter or TrailEmitter(), [as_array(position)], [as_array(velocity)],
+                                accumulator, 0.0)
+        
+    def emit_trails(self, emitter, positions, velocities, accumulators, delta_time):
+        """تولید دسته‌ای رد موتور برای چند منبع با یک فراخوانی emit
+
+        accumulators (یک مقدار برای هر منبع) درجا به‌روز می‌شود؛ اگر بودجه کافی نباشد
+        منابع اول اولویت دارند. تعداد ذرات تولیدشده را برمی‌گرداند.
+        """
+        counts = emitter.counts(accumulators, delta_time)
+        before = np.cumsum(counts) - counts
+        counts = np.clip(self.available(emitter.budget_share) - before, 0, counts)
+        total = int(counts.sum())
+        if total == 0:
+            return 0
+        
+        # ستون‌های 0-2 پخش سرعت، 3 عمر و 4 اندازه
+        unit = self.random.take(total)
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        velocities = np.asarray(velocities, dtype=np.float32).reshape(-1, 3)
+        life, size = emitter.life, emitter.size
+        self.emit(
+            np.repeat(positions + emitter.offset, counts, axis=0),
+            np.repeat(velocities * emitter.speed_factor, counts, axis=0) +
+            emitter.spread * (2 * unit[:, 0:3] - 1),
+            life[0] + (life[1] - life[0]) * unit[:, 3],
+            size[0] + (size[1] - size[0]) * unit[:, 4],
+            emitter.color,
+            gravity=0.0
+        )
+        return total
         
     def update(self, delta_time: float):
-        """به‌روزرسانی تمام ذرات"""
-        for particle in self.particles[:]:
-            # به‌روزرسانی موقعیت
-            particle['position'] = particle['position'] + particle['velocity'] * delta_time
-            
-            # کاهش عمر
-            particle['life'] -= delta_time
-            
-            # حذف ذرات مرده
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
+        """جلو بردن ساعت ذرات؛ موقعیت‌ها هنگام رسم محاسبه می‌شوند"""
+        self.time += delta_time
+        
+    def evaluate(self, time=None):
+        """مسیر CPU: موقعیت، رنگ و اندازه ذرات زنده در زمان داده‌شده"""
+        time = np.float32(self.time if time is None else time)
+        pool = self.pool
+        live = np.flatnonzero(self.alive(time))
+        age = (time - pool['born'][live])[:, None]
+        positions = pool['origin'][live] + pool['vel'][live] * age
+        positions[:, 1] -= np.float32(0.5) * pool['gravity'][live] * age[:, 0] * age[:, 0]
+        return positions, pool['color'][live], pool['size'][live]
                 
     def get_particles(self):
-        """دریافت لیست ذرات"""
-        return self.particles
+        """دریافت آرایه‌های ذرات"""
+        return self.pool
+
+
+class AsteroidField:
+    """میدان سیارک با تعداد ثابت روی یک ComponentPool
+
+    سیارکی که از صفحه عبور کند یا نابود شود حذف نمی‌شود: همان ردیف با پارامترهای تصادفی تازه
+    (با همان شناسه) بازیافت می‌شود. پارامترهای تمام ردیف‌های بازیافتی یک تیک با یک take از
+    بلوک‌های پیش‌تولیدشده در بازه SPAWN_LOW..SPAWN_HIGH گرفته می‌شوند، پس میدان‌های متراکم (10k+) هم
+    فقط چند عملیات برداری در هر تیک هزینه دارند.
+    """
+    
+    COMPONENTS = {
+        'pos': ((3,), np.float32),
+        'vel': ((3,), np.float32),
+        'rot': ((3,), np.float32),
+        'rot_vel': ((3,), np.float32),
+        'size': ((), np.float32),
+        'health': ((), np.float32),
+    }
+    
+    # ستون‌های پارامترهای تولید: pos (3)، vel (3)، rot_vel (3)، size — بر حسب ثانیه
+    SPAWN_LOW = np.float32([-8, -6, -15, -6, -6, 3, -120, -120, -120, 0.5])
+    SPAWN_HIGH = np.float32([8, 6, -5, 6, 6, 12, 120, 120, 120, 2.0])
+    HEALTH = 3
+    EXIT_Z = 5.0
+    
+    def __init__(self, pool: ComponentPool = None, parameters: ParameterBatch = None):
+        self.pool = pool if pool is not None else ComponentPool('asteroids', self.COMPONENTS)
+        self.parameters = parameters or ParameterBatch(np.random.default_rng(), self.SPAWN_LOW, self.SPAWN_HIGH)
+        self.recycled = 0
+        
+    def __len__(self):
+        return len(self.pool)
+        
+    def draw_parameters(self, count: int):
+        """پارامترهای تولید count سیارک از بلوک‌های پیش‌تولیدشده"""
+        return self.parameters.take(count)
+        
+    def reset(self, count: int):
+        """میدان جدید با count سیارک"""
+        self.pool.clear()
+        self.recycled = 0
+        return self.spawn(count)
+        
+    def spawn(self, count: int = 1, positions=None, sizes=None):
+        """افزودن count سیارک به میدان (موقعیت و اندازه تصادفی در صورت عدم تعیین)"""
+        params = self.draw_parameters(count)
+        return self.pool.spawn(
+            count, pos=params[:, 0:3] if positions is None else positions, vel=params[:, 3:6],
+            rot=0, rot_vel=params[:, 6:9], size=params[:, 9] if sizes is None else sizes,
+            health=self.HEALTH
+        )
+        
+    def recycle(self, rows):
+        """بازیافت درجای ردیف‌ها (ماسک بولی یا اندیس) با پارامترهای جدید؛ تعداد را برمی‌گرداند
+
+        شناسه سیارک حفظ می‌شود و فقط داده ردیف از نو مقدار می‌گیرد؛ شناسه تازه برای هر بازیافت
+        نقشه شناسه->ردیف pool را بی‌پایان بزرگ می‌کرد.
+        """
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        if not len(rows):
+            return 0
+        params = self.draw_parameters(len(rows))
+        arrays = self.pool.arrays
+        arrays['pos'][rows] = params[:, 0:3]
+        arrays['vel'][rows] = params[:, 3:6]
+        arrays['rot'][rows] = 0
+        arrays['rot_vel'][rows] = params[:, 6:9]
+        arrays['size'][rows] = params[:, 9]
+        arrays['health'][rows] = self.HEALTH
+        self.recycled += len(rows)
+        return len(rows)
+        
+    def update(self, delta_time: float):
+        """حرکت و چرخش تمام سیارک‌ها و بازیافت سیارک‌های عبورکرده از EXIT_Z"""
+        pool = self.pool
+        pool['pos'] += pool['vel'] * delta_time
+        pool['rot'] += pool['rot_vel'] * delta_time
+        return self.recycle(pool['pos'][:, 2] > self.EXIT_Z)
 
 class GameWorld:
-    """مدیر دنیای بازی"""
+    """مدیر دنیای بازی؛ رابط شیءگرا روی همان شبیه‌سازی که موتور اجرا می‌کند"""
     
-    def __init__(self):
-        self.player = None
-        self.enemies = []
-        self.asteroids = []
-        self.projectiles = []
-        self.powerups = []
-        self.particle_system = ParticleSystem()
+    def __init__(self, seed=None):
+        from simulation import GalaxySimulation
+        self.simulation = GalaxySimulation(star_count=0, seed=seed)
+        self.particle_system = self.simulation.particle_system
+        
+    @property
+    def player(self):
+        return self.simulation.player
+        
+    @player.setter
+    def player(self, player: PlayerShip):
+        self.simulation.player = player
+        
+    def views(self, pool: ComponentPool):
+        """نمای شیءگرای تمام موجودیت‌های یک pool"""
+        return [EntityView(pool, entity_id) for entity_id in pool.ids.tolist()]
+        
+    @property
+    def enemies(self):
+        return self.views(self.simulation.enemies)
+        
+    @property
+    def asteroids(self):
+        return self.views(self.simulation.asteroids)
+        
+    @property
+    def projectiles(self):
+        return self.views(self.simulation.projectiles)
+        
+    @property
+    def powerups(self):
+        return self.views(self.simulation.powerups)
+        
+    def spawned(self, pool: ComponentPool, rows: slice):
+        """نمای اولین موجودیت تولیدشده در بازه rows"""
+        return EntityView(pool, int(pool.arrays['id'][rows.start]))
         
     def spawn_enemy(self, position: Vector3, enemy_type: str = "fighter"):
         """تولید دشمن جدید"""
-        enemy = EnemyShip(position, enemy_type)
-        self.enemies.append(enemy)
-        return enemy
+        rows = self.simulation.spawn_enemy(enemy_type, position)
+        return self.spawned(self.simulation.enemies, rows)
         
     def spawn_asteroid(self, position: Vector3 = None, size: float = None):
         """تولید سیارک جدید"""
-        if position is None:
-            position = Vector3(
-                random.uniform(-15, 15),
-                random.uniform(-10, 10),
-                random.uniform(-20, -10)
-            )
-            
-        if size is None:
-            size = random.uniform(0.5, 3.0)
-            
-        asteroid = Asteroid(position, size)
-        self.asteroids.append(asteroid)
-        return asteroid
+        rows = self.simulation.spawn_asteroids(
+            1,
+            positions=None if position is None else as_array(position)[None, :],
+            sizes=size
+        )
+        return self.spawned(self.simulation.asteroids, rows)
         
     def spawn_powerup(self, position: Vector3, power_type: str):
         """تولید قدرت‌افزایی جدید"""
-        powerup = PowerUp(position, power_type)
-        self.powerups.append(powerup)
-        return powerup
+        rows = self.simulation.spawn_powerup(position, power_type)
+        return self.spawned(self.simulation.powerups, rows)
+        
+    def shoot(self):
+        """شلیک بازیکن با رعایت زمان آماده‌باش سلاح"""
+        rows = self.simulation.fire_player()
+        return None if rows is None else self.spawned(self.simulation.projectiles, rows)
         
     def update(self, delta_time: float):
-        """به‌روزرسانی تمام موجودیت‌های دنیا"""
-        # به‌روزرسانی بازیکن
-        if self.player:
-            self.player.update(delta_time)
-            
-        # به‌روزرسانی دشمنان
-        for enemy in self.enemies[:]:
-            if self.player:
-                enemy.update(delta_time, self.player.position)
-            if not enemy.is_alive:
-                self.enemies.remove(enemy)
-                self.particle_system.create_explosion(enemy.position)
-                
-        # به‌روزرسانی سیارک‌ها
-        for asteroid in self.asteroids[:]:
-            asteroid.update(delta_time)
-            if not asteroid.is_alive:
-                self.asteroids.remove(asteroid)
-                self.particle_system.create_explosion(asteroid.position, 30)
-                
-        # به‌روزرسانی پرتابه‌ها
-        for projectile in self.projectiles[:]:
-            projectile.update(delta_time)
-            if not projectile.is_alive:
-                self.projectiles.remove(projectile)
-                
-        # به‌روزرسانی قدرت‌افزایی‌ها
-        for powerup in self.powerups[:]:
-            powerup.update(delta_time)
-            
-        # به‌روزرسانی سیستم ذرات
-        self.particle_system.update(delta_time)
+        """به‌روزرسانی تمام موجودیت‌های دنیا (شامل برخوردها)"""
+        self.simulation.update(delta_time)
         
     def check_collisions(self):
         """بررسی برخورد بین موجودیت‌ها"""
-        if not self.player:
-            return
-            
-        # برخورد پرتابه‌ها با دشمنان
-        for projectile in self.projectiles[:]:
-            if projectile.owner == "player":
-                for enemy in self.enemies[:]:
-                    if self.is_colliding(projectile, enemy):
-                        enemy.take_damage(projectile.damage)
-                        if projectile in self.projectiles:
-                            self.projectiles.remove(projectile)
-                        break
-                        
-            elif projectile.owner == "enemy":
-                if self.is_colliding(projectile, self.player):
-                    self.player.take_damage(projectile.damage)
-                    if projectile in self.projectiles:
-                        self.projectiles.remove(projectile)
-                        
-        # برخورد بازیکن با دشمنان
-        for enemy in self.enemies[:]:
-            if self.is_colliding(self.player, enemy):
-                self.player.take_damage(10)
-                enemy.take_damage(20)
-                
-        # برخورد بازیکن با سیارک‌ها
-        for asteroid in self.asteroids[:]:
-            if self.is_colliding(self.player, asteroid):
-                self.player.take_damage(15)
-                asteroid.take_damage(50)
-                
-        # برخورد بازیکن با قدرت‌افزایی‌ها
-        for powerup in self.powerups[:]:
-            if self.is_colliding(self.player, powerup):
-                self.apply_powerup(self.player, powerup.power_type)
-                self.powerups.remove(powerup)
-                
-    def is_colliding(self, obj1: GameObject, obj2: GameObject) -> bool:
-        """بررسی برخورد بین دو شیء"""
-        distance = (obj1.position - obj2.position).length()
-        
-        # شعاع برخورد ساده
-        radius1 = getattr(obj1, 'size', 1.0) if isinstance(obj1, Asteroid) else 0.5
-        radius2 = getattr(obj2, 'size', 1.0) if isinstance(obj2, Asteroid) else 0.5
-        
-        return distance < (radius1 + radius2)
+        self.simulation.check_collisions()
         
     def apply_powerup(self, player: PlayerShip, power_type: str):
         """اعمال قدرت‌افزایی به بازیکن"""
-        if power_type == "health":
-            player.health = min(player.max_health, player.health + 30)
-        elif power_type == "fuel":
-            # در اینجا می‌توان سوخت را افزایش داد
-            pass
-        elif power_type == "weapon":
-            player.weapon_rate *= 1.5  # افزایش سرعت شلیک
-        elif power_type == "shield":
-            player.invulnerable = 5.0  # 5 ثانیه آسیب‌ناپذیری
+        self.simulation.apply_powerup(power_type, player)
+        
+    def shutdown(self):
+        """آزاد کردن نخ‌های شبیه‌سازی (زمان‌بند سیستم‌ها و ساخت بلوک‌های تصادفی)؛ پس از کنار گذاشتن دنیا"""
+        self.simulation.shutdown()
             
     def get_all_entities(self):
         """دریافت تمام موجودیت‌های دنیا"""
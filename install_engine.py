@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Install Engine - نصب دسته‌ای و کش‌شده وابستگی‌های بازی
+ACTOn Game Studio
+"""
+
+import os
+import sys
+import time
+import subprocess
+import importlib
+import importlib.util
+from importlib import metadata
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class PackageInstallEngine:
+    """بررسی سریع و نصب دسته‌ای پکیج‌ها با پشتیبانی از wheelhouse محلی"""
+
+    def __init__(self, packages, wheelhouse=None, offline=False, python=None):
+        self.packages = packages  # نام توزیع -> نام ماژول
+        self.wheelhouse = Path(wheelhouse) if wheelhouse else None
+        self.offline = offline
+        self.python = python or sys.executable
+        self.timings = []
+
+    @contextmanager
+    def timed(self, step):
+        """اندازه‌گیری زمان یک مرحله"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((step, time.perf_counter() - start))
+
+    def probe(self, package, import_name):
+        """بررسی نصب بودن پکیج بدون import کردن آن؛ نسخه یا None برمی‌گرداند"""
+        try:
+            return metadata.version(package)
+        except metadata.PackageNotFoundError:
+            pass
+
+        # برخی پکیج‌ها با نام توزیع متفاوت نصب شده‌اند (مثلاً opencv-python-headless)
+        try:
+            if importlib.util.find_spec(import_name) is not None:
+                return "unknown"
+        except (ImportError, ValueError):
+            pass
+        return None
+
+    def find_missing(self):
+        """یافتن پکیج‌های نصب‌نشده"""
+        missing = []
+        with self.timed("probe"):
+            for package, import_name in self.packages.items():
+                version = self.probe(package, import_name)
+                if version is None:
+                    missing.append(package)
+                else:
+                    print(f"✅ {package} already installed ({version})")
+        return missing
+
+    def pip_command(self, *args):
+        """ساخت فرمان pip"""
+        return [self.python, "-m", "pip", *args, "--disable-pip-version-check"]
+
+    def wheelhouse_args(self):
+        """آرگومان‌های pip برای استفاده از wheelhouse محلی"""
+        args = []
+        if self.wheelhouse and self.wheelhouse.is_dir():
+            args += ["--find-links", str(self.wheelhouse)]
+        if self.offline:
+            args.append("--no-index")
+        return args
+
+    def install(self, packages):
+        """نصب تمام پکیج‌ها در یک فراخوانی pip"""
+        if not packages:
+            return True
+
+        if self.offline and not (self.wheelhouse and self.wheelhouse.is_dir()):
+            print("❌ Offline install requires an existing wheelhouse directory")
+            return False
+
+        print(f"📥 Installing {', '.join(packages)}...")
+        command = self.pip_command("install", *self.wheelhouse_args(), *packages)
+        with self.timed("pip install"):
+            try:
+                subprocess.check_call(command)
+            except subprocess.CalledProcessError:
+                print(f"❌ Failed to install: {', '.join(packages)}")
+                return False
+        return True
+
+    def fill_wheelhouse(self, packages=None):
+        """ذخیره wheel پکیج‌ها در wheelhouse برای نصب‌های بعدی بدون شبکه"""
+        if not self.wheelhouse or self.offline:
+            return False
+
+        packages = list(packages or self.packages)
+        self.wheelhouse.mkdir(parents=True, exist_ok=True)
+        command = self.pip_command("wheel", "--wheel-dir", str(self.wheelhouse),
+                                   *self.wheelhouse_args(), *packages)
+        with self.timed("wheelhouse"):
+            try:
+                subprocess.check_call(command, stdout=subprocess.DEVNULL)
+            except subprocess.CalledProcessError:
+                print("⚠️ Could not populate wheelhouse")
+                return False
+        return True
+
+    def run(self):
+        """بررسی، نصب و در صورت نیاز پر کردن wheelhouse"""
+        self.timings.clear()
+        missing = self.find_missing()
+        if not self.install(missing):
+            return False
+
+        if missing and self.wheelhouse and not self.offline:
+            self.fill_wheelhouse(missing)
+
+        # پکیج‌های تازه نصب‌شده باید بدون راه‌اندازی مجدد قابل import باشند
+        if missing:
+            importlib.invalidate_caches()
+        return True
+
+    def report_timings(self):
+        """نمایش زمان هر مرحله"""
+        total = sum(seconds for _, seconds in self.timings)
+        print("⏱️ Install timings:")
+        for step, seconds in self.timings:
+            print(f"  {step}: {seconds:.2f}s")
+        print(f"  total: {total:.2f}s")
+
+
+def default_wheelhouse():
+    """مسیر wheelhouse از متغیر محیطی GALAXY_WHEELHOUSE"""
+    path = os.environ.get("GALAXY_WHEELHOUSE")
+    return Path(path) if path else None
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Install Manifest - همگام‌سازی افزایشی فایل‌های بازی بر اساس checksum
+ACTOn Game Studio
+"""
+
+import os
+import json
+import hashlib
+import shutil
+from pathlib import Path
+
+MANIFEST_NAME = "install_manifest.json"
+TEMP_SUFFIX = ".partial"
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """محاسبه sha256 یک فایل به صورت جریانی"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def atomic_copy(source, destination):
+    """کپی اتمیک: نوشتن در فایل موقت و جایگزینی با rename"""
+    temp_path = destination.with_name(destination.name + TEMP_SUFFIX)
+    with open(source, 'rb') as src, open(temp_path, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+        dst.flush()
+        os.fsync(dst.fileno())
+    shutil.copystat(source, temp_path)
+    os.replace(temp_path, destination)
+
+
+def atomic_write_text(destination, content):
+    """نوشتن اتمیک یک فایل متنی"""
+    temp_path = destination.with_name(destination.name + TEMP_SUFFIX)
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, destination)
+
+
+class InstallManifest:
+    """فهرست فایل‌های نصب‌شده با hash و اندازه"""
+
+    def __init__(self, install_dir):
+        self.install_dir = Path(install_dir)
+        self.path = self.install_dir / MANIFEST_NAME
+        self.version = None
+        self.files = {}  # مسیر نسبی -> {'sha256', 'size'}
+
+    def load(self):
+        """بارگذاری manifest موجود (در صورت وجود)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.version = data.get('version')
+            self.files = data.get('files', {})
+            return True
+        except FileNotFoundError:
+            return False
+        except (ValueError, OSError) as e:
+            print(f"⚠️ Ignoring unreadable manifest: {e}")
+            self.files = {}
+            return False
+
+    def save(self):
+        """ذخیره اتمیک manifest"""
+        data = {'version': self.version, 'files': self.files}
+        atomic_write_text(self.path, json.dumps(data, indent=2, sort_keys=True))
+
+    def record(self, name, sha256=None):
+        """ثبت فایلی که در پوشه نصب قرار دارد"""
+        path = self.install_dir / name
+        self.files[name] = {
+            'sha256': sha256 or file_digest(path),
+            'size': path.stat().st_size
+        }
+
+    def cleanup_partials(self):
+        """حذف فایل‌های موقت باقی‌مانده از اجرای قطع‌شده"""
+        for partial in self.install_dir.rglob('*' + TEMP_SUFFIX):
+            partial.unlink()
+
+    def sync(self, source_dir, names, version=None, keep=()):
+        """کپی فقط فایل‌های تغییرکرده؛ manifest پس از هر فایل ذخیره می‌شود تا قابل ادامه باشد
+
+        فایل‌های ثبت‌شده‌ای که نه در names و نه در keep هستند حذف می‌شوند.
+        """
+        source_dir = Path(source_dir)
+        self.load()
+        self.cleanup_partials()
+        stats = {'copied': [], 'unchanged': [], 'removed': []}
+
+        for name in names:
+            source = source_dir / name
+            if not source.exists():
+                continue
+
+            source_hash = file_digest(source)
+            destination = self.install_dir / name
+            entry = self.files.get(name)
+
+            if destination.exists():
+                size = destination.stat().st_size
+                if entry and entry['sha256'] == source_hash and entry['size'] == size:
+                    stats['unchanged'].append(name)
+                    continue
+                # فایل سالم است ولی در manifest ثبت نشده (مثلاً قطع پس از rename)
+                if size == source.stat().st_size and file_digest(destination) == source_hash:
+                    self.record(name, source_hash)
+                    self.save()
+                    stats['unchanged'].append(name)
+                    continue
+
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            atomic_copy(source, destination)
+            self.record(name, source_hash)
+            self.save()
+            stats['copied'].append(name)
+
+        stats['removed'] = self.remove_stale(set(names) | set(keep))
+
+        if version is not None:
+            self.version = version
+        self.save()
+        return stats
+
+    def remove_stale(self, keep):
+        """حذف فایل‌هایی که در نسخه جدید وجود ندارند"""
+        removed = []
+        for name in list(self.files):
+            if name in keep:
+                continue
+            path = self.install_dir / name
+            if path.exists():
+                path.unlink()
+            del self.files[name]
+            removed.append(name)
+        return removed
+
+    def verify(self, full=False):
+        """بررسی فایل‌ها با manifest؛ لیست مشکلات را برمی‌گرداند
+
+        در حالت عادی فقط وجود و اندازه بررسی می‌شود و با full=True hash هم محاسبه می‌شود.
+        """
+        problems = []
+        for name, entry in self.files.items():
+            path = self.install_dir / name
+            if not path.exists():
+                problems.append(f"missing: {name}")
+            elif path.stat().st_size != entry['size']:
+                problems.append(f"size mismatch: {name}")
+            elif full and file_digest(path) != entry['sha256']:
+                problems.append(f"checksum mismatch: {name}")
+        return problems
@@ -5,24 +5,27 @@ ACTOn Game Studio
 """
 
 import os
-import sys
-import subprocess
 import platform
 import urllib.request
 import zipfile
 import tarfile
 import shutil
+import argparse
 from pathlib import Path
+from install_engine import PackageInstallEngine, default_wheelhouse
+from install_manifest import InstallManifest, atomic_write_text
 
 class GameInstaller:
     """نصب کننده حرفه‌ای بازی"""
     
-    def __init__(self):
+    def __init__(self, wheelhouse=None, offline=False):
         self.game_name = "Galaxy Advanced 3D Game"
         self.version = "1.0.0"
         self.developer = "ACTOn Game Studio"
         self.install_dir = self.get_default_install_dir()
         self.required_packages = self.get_required_packages()
+        self.wheelhouse = wheelhouse or default_wheelhouse()
+        self.offline = offline
         
     def get_default_install_dir(self):
         """دریافت مسیر پیش‌فرض نصب"""
@@ -90,25 +93,32 @@ class GameInstaller:
         """نصب پکیج‌های پایتون"""
         print("📦 Installing Python packages...")
         
-        for package, import_name in self.required_packages.items():
-            try:
-                # بررسی اگر پکیج از قبل نصب شده
-                __import__(import_name)
-                print(f"✅ {package} already installed")
-            except ImportError:
-                print(f"📥 Installing {package}...")
-                try:
-                    subprocess.check_call([
-                        sys.executable, "-m", "pip", "install", package
-                    ])
-                    print(f"✅ {package} installed successfully")
-                except subprocess.CalledProcessError:
-                    print(f"❌ Failed to install {package}")
-                    return False
+        engine = PackageInstallEngine(
+            self.required_packages,
+            wheelhouse=self.wheelhouse,
+            offline=self.offline
+        )
+        success = engine.run()
+        engine.report_timings()
+        
+        if not success:
+            return False
                     
         print("✅ All Python packages installed!")
         return True
         
+    def build_wheelhouse(self):
+        """ساخت wheelhouse برای نصب بدون شبکه روی سیستم‌های دیگر"""
+        if not self.wheelhouse:
+            print("❌ No wheelhouse directory given (--wheelhouse or GALAXY_WHEELHOUSE)")
+            return False
+            
+        print(f"📦 Building wheelhouse: {self.wheelhouse}")
+        engine = PackageInstallEngine(self.required_packages, wheelhouse=self.wheelhouse)
+        success = engine.fill_wheelhouse()
+        engine.report_timings()
+        return success
+        
     def create_game_directory(self):
         """ایجاد دایرکتوری بازی"""
         print("📁 Creating game directory...")
@@ -121,28 +131,66 @@ class GameInstaller:
             print(f"❌ Failed to create game directory: {e}")
             return False
             
+    def get_game_files(self):
+        """لیست فایل‌های بازی که نصب می‌شوند"""
+        return [
+            'galaxy_game_3d.py',
+            'game_entities.py', 
+            'memory_tracker.py',
+            'audio_stream.py',
+            'sound_manager.py',
+            'startup_profiler.py',
+            'resource_manager.py',
+            'level_system.py',
+            'spatial_index.py',
+            'flocking.py',
+            'collision.py',
+            'entity_store.py',
+            'simulation.py',
+            'scheduler.py',
+            'render_queue.py',
+            'shader_renderer.py',
+            'render_benchmark.py',
+            'particle_check.py',
+            'quality.py',
+            'dynamic_resolution.py',
+            'random_service.py',
+            'viewports.py',
+            'camera_effects.py',
+            'loot.py',
+            'stats_store.py',
+            'requirements.txt'
+        ] + self.get_level_files()
+        
+    def get_level_files(self):
+        """فایل‌های تعریف موج مراحل"""
+        levels_dir = Path(__file__).parent / "levels"
+        return sorted(f"levels/{path.name}" for path in levels_dir.glob("*.waves"))
+        
     def copy_game_files(self):
         """کپی فایل‌های بازی"""
         print("📄 Copying game files...")
         
         try:
-            # کپی فایل‌های اصلی
+            # فقط فایل‌هایی کپی می‌شوند که hash آن‌ها با manifest فرق دارد
             current_dir = Path(__file__).parent
-            game_files = [
-                'galaxy_game_3d.py',
-                'game_entities.py', 
-                'requirements.txt'
-            ]
-            
-            for file in game_files:
-                source = current_dir / file
-                destination = self.install_dir / file
-                if source.exists():
-                    shutil.copy2(source, destination)
-                    print(f"✅ Copied {file}")
+            manifest = InstallManifest(self.install_dir)
+            stats = manifest.sync(
+                current_dir,
+                self.get_game_files(),
+                version=self.version,
+                keep=[self.get_launcher_name()]
+            )
+            
+            for file in stats['copied']:
+                print(f"✅ Copied {file}")
+            for file in stats['removed']:
+                print(f"🗑️ Removed obsolete {file}")
+            if stats['unchanged']:
+                print(f"⏭️ {len(stats['unchanged'])} files unchanged")
                     
             # ایجاد فایل اجرایی
-            self.create_launcher()
+            self.create_launcher(manifest)
             
             print("✅ Game files copied successfully!")
             return True
@@ -151,20 +199,23 @@ class GameInstaller:
             print(f"❌ Failed to copy game files: {e}")
             return False
             
-    def create_launcher(self):
+    def create_launcher(self, manifest=None):
         """ایجاد فایل اجرایی"""
         system = platform.system()
         launcher_content = self.generate_launcher_script()
         launcher_path = self.install_dir / self.get_launcher_name()
         
         try:
-            with open(launcher_path, 'w', encoding='utf-8') as f:
-                f.write(launcher_content)
+            atomic_write_text(launcher_path, launcher_content)
                 
             # قابل اجرا کردن در لینوکس و مک
             if system != "Windows":
                 launcher_path.chmod(0o755)
                 
+            if manifest is not None:
+                manifest.record(self.get_launcher_name())
+                manifest.save()
+                
             print(f"✅ Launcher created: {launcher_path}")
             return True
             
@@ -327,38 +378,35 @@ Categories=Game;
         except Exception as e:
             print(f"⚠️ Could not create game icon: {e}")
             
-    def verify_installation(self):
+    def verify_installation(self, full=False):
         """بررسی صحت نصب"""
         print("🔍 Verifying installation...")
         
-        required_files = [
-            'galaxy_game_3d.py',
-            'game_entities.py',
-            self.get_launcher_name()
-        ]
+        manifest = InstallManifest(self.install_dir)
+        if not manifest.load():
+            print("❌ Install manifest not found")
+            return False
         
+        required_files = [f for f in self.get_game_files() if f.endswith('.py')]
+        required_files.append(self.get_launcher_name())
         for file in required_files:
-            if not (self.install_dir / file).exists():
+            if file not in manifest.files:
                 print(f"❌ Missing file: {file}")
                 return False
+        
+        # بررسی اندازه فایل‌ها (و در حالت کامل، hash آن‌ها) با manifest
+        problems = manifest.verify(full=full)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            return False
                 
-        # تست اجرای بازی
-        try:
-            result = subprocess.run([
-                sys.executable, "-c", 
-                "import pygame; import numpy; print('✅ Dependencies OK')"
-            ], capture_output=True, text=True, cwd=self.install_dir, timeout=10)
-            
-            if "OK" in result.stdout:
-                print("✅ Game dependencies verified!")
-            else:
-                print("❌ Dependency check failed")
-                return False
-                
-        except subprocess.TimeoutExpired:
-            print("⚠️ Dependency check timed out")
-        except Exception as e:
-            print(f"⚠️ Verification error: {e}")
+        # بررسی وابستگی‌ها از روی metadata بدون اجرای پروسه جدید
+        engine = PackageInstallEngine({'pygame': 'pygame', 'numpy': 'numpy'})
+        if engine.find_missing():
+            print("❌ Dependency check failed")
+            return False
+        print("✅ Game dependencies verified!")
             
         print("✅ Installation verified successfully!")
         return True
@@ -418,6 +466,26 @@ Categories=Game;
         print("✅ Installation completed successfully!")
         return True
         
+    def update(self):
+        """به‌روزرسانی نصب موجود با کپی فقط فایل‌های تغییرکرده"""
+        print(f"🔄 Updating {self.game_name} to {self.version}...")
+        
+        if not self.install_dir.exists():
+            print("❌ Game is not installed. Run the installer first.")
+            return False
+            
+        if not self.install_python_packages():
+            return False
+            
+        if not self.copy_game_files():
+            return False
+            
+        if not self.verify_installation():
+            return False
+            
+        print("✅ Update completed successfully!")
+        return True
+        
     def uninstall(self):
         """حذف بازی"""
         print("🗑️ Uninstalling Galaxy Advanced 3D Game...")
@@ -466,10 +534,28 @@ Categories=Game;
 
 def main():
     """تابع اصلی نصب کننده"""
-    installer = GameInstaller()
+    parser = argparse.ArgumentParser(description="Galaxy Advanced 3D Game Installer")
+    parser.add_argument("--uninstall", action="store_true", help="remove the game")
+    parser.add_argument("--update", action="store_true", help="copy only changed files")
+    parser.add_argument("--verify", action="store_true",
+                        help="verify installed files against the manifest checksums")
+    parser.add_argument("--wheelhouse", help="local wheel cache directory")
+    parser.add_argument("--offline", action="store_true",
+                        help="install only from the wheelhouse, without network access")
+    parser.add_argument("--build-wheelhouse", action="store_true",
+                        help="download wheels of all required packages into the wheelhouse")
+    args = parser.parse_args()
+    
+    installer = GameInstaller(wheelhouse=args.wheelhouse, offline=args.offline)
     
-    if len(sys.argv) > 1 and sys.argv[1] == "--uninstall":
+    if args.uninstall:
         installer.uninstall()
+    elif args.update:
+        installer.update()
+    elif args.verify:
+        installer.verify_installation(full=True)
+    elif args.build_wheelhouse:
+        installer.build_wheelhouse()
     else:
         installer.install()
 
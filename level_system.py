@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Level System - مراحل بازی با تعریف موج‌ها از فایل داده
+ACTOn Game Studio
+
+قالب فایل موج (levels/level_<n>.waves)، هر خط یک موج:
+
+    # time  count  type     formation  interval  [x  y]
+    0.0     5      fighter  line       0.5
+    6.0     12     scout    v          0.1       -3  1
+
+time زمان شروع موج (ثانیه از شروع مرحله)، interval فاصله زمانی بین اعضای موج
+و x, y مرکز آرایش است (پیش‌فرض: تصادفی).
+"""
+
+import math
+from pathlib import Path
+import numpy as np
+
+ENEMY_TYPES = ('fighter', 'bomber', 'scout')
+FORMATIONS = ('line', 'v', 'circle', 'grid', 'random')
+
+LEVELS_DIR = Path(__file__).parent / "levels"
+SPAWN_DEPTH = (-12.0, -8.0)
+SPAWN_AREA = (7.0, 5.0)
+
+
+def parse_waves(text):
+    """تبدیل متن فایل موج به لیست موج‌ها"""
+    waves = []
+    for line_number, line in enumerate(text.splitlines(), 1):
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+
+        fields = line.split()
+        if len(fields) not in (5, 7):
+            raise ValueError(f"line {line_number}: expected 5 or 7 fields, got {len(fields)}")
+
+        wave = {
+            'time': float(fields[0]),
+            'count': int(fields[1]),
+            'type': fields[2],
+            'formation': fields[3],
+            'interval': float(fields[4]),
+            'center': (float(fields[5]), float(fields[6])) if len(fields) == 7 else None
+        }
+        if wave['count'] < 1:
+            raise ValueError(f"line {line_number}: wave count must be at least 1, got {wave['count']}")
+        if wave['type'] not in ENEMY_TYPES:
+            raise ValueError(f"line {line_number}: unknown enemy type '{wave['type']}'")
+        if wave['formation'] not in FORMATIONS:
+            raise ValueError(f"line {line_number}: unknown formation '{wave['formation']}'")
+        waves.append(wave)
+    return waves
+
+
+def read_waves(path):
+    """خواندن فایل موج؛ فایل بدون موج خطاست (مرحله خالی بلافاصله تمام و مرحله بعد بارگذاری می‌شد)"""
+    waves = parse_waves(Path(path).read_text(encoding='utf-8'))
+    if not waves:
+        raise ValueError(f"{path}: no waves defined")
+    return waves
+
+
+def formation_offsets(formation, count, spacing=1.0, rng=None):
+    """محاسبه برداری آفست اعضای یک آرایش نسبت به مرکز آن (count, 3)"""
+    index = np.arange(count, dtype=np.float32)
+    offsets = np.zeros((count, 3), dtype=np.float32)
+
+    if formation == 'line':
+        offsets[:, 0] = (index - (count - 1) / 2) * spacing
+    elif formation == 'v':
+        side = np.where(index % 2 == 0, 1.0, -1.0)
+        rank = np.ceil(index / 2)
+        offsets[:, 0] = side * rank * spacing
+        offsets[:, 2] = -rank * spacing
+    elif formation == 'circle':
+        angle = 2 * np.pi * index / max(count, 1)
+        radius = max(spacing, count * spacing / (2 * np.pi))
+        offsets[:, 0] = np.cos(angle) * radius
+        offsets[:, 1] = np.sin(angle) * radius
+    elif formation == 'grid':
+        columns = max(1, int(math.ceil(math.sqrt(count))))
+        offsets[:, 0] = (index % columns - (columns - 1) / 2) * spacing
+        offsets[:, 1] = (index // columns - (columns - 1) / 2) * spacing
+    elif formation == 'random':
+        rng = rng or np.random.default_rng()
+        offsets[:, 0] = rng.uniform(-SPAWN_AREA[0], SPAWN_AREA[0], count)
+        offsets[:, 1] = rng.uniform(-SPAWN_AREA[1], SPAWN_AREA[1], count)
+        offsets[:, 2] = rng.uniform(-2, 2, count)
+    return offsets
+
+
+class WaveSchedule:
+    """زمان‌بندی از پیش محاسبه‌شده یک مرحله به صورت آرایه‌های مرتب"""
+
+    def __init__(self, times, types, positions):
+        self.times = times          # (n,) float64 مرتب‌شده
+        self.types = types          # (n,) int8 اندیس در ENEMY_TYPES
+        self.positions = positions  # (n, 3) float32
+        self.cursor = 0
+
+    @classmethod
+    def from_waves(cls, waves, count_scale=1.0, rng=None):
+        """ساخت زمان‌بندی از لیست موج‌ها"""
+        rng = rng or np.random.default_rng()
+        times, types, positions = [], [], []
+
+        for wave in waves:
+            count = max(1, int(round(wave['count'] * count_scale)))
+            if wave['center'] is not None:
+                center = (wave['center'][0], wave['center'][1])
+            else:
+                center = (rng.uniform(-SPAWN_AREA[0], SPAWN_AREA[0]) * 0.5,
+                          rng.uniform(-SPAWN_AREA[1], SPAWN_AREA[1]) * 0.5)
+
+            wave_positions = formation_offsets(wave['formation'], count, rng=rng)
+            wave_positions[:, 0] += center[0]
+            wave_positions[:, 1] += center[1]
+            wave_positions[:, 2] += rng.uniform(*SPAWN_DEPTH)
+
+            times.append(wave['time'] + np.arange(count) * wave['interval'])
+            types.append(np.full(count, ENEMY_TYPES.index(wave['type']), dtype=np.int8))
+            positions.append(wave_positions)
+
+        if not times:
+            return cls(np.zeros(0), np.zeros(0, dtype=np.int8), np.zeros((0, 3), dtype=np.float32))
+
+        times = np.concatenate(times)
+        order = np.argsort(times, kind='stable')
+        return cls(times[order], np.concatenate(types)[order], np.concatenate(positions)[order])
+
+    def __len__(self):
+        return len(self.times)
+
+    def due(self, level_time):
+        """بازه اندیس ورودی‌هایی که زمان تولیدشان رسیده است (start, end)"""
+        start = self.cursor
+        end = int(np.searchsorted(self.times, level_time, side='right'))
+        self.cursor = max(start, end)
+        return start, self.cursor
+
+    def finished(self):
+        """آیا تمام ورودی‌ها تولید شده‌اند؟"""
+        return self.cursor >= len(self.times)
+
+
+class LevelManager:
+    """بارگذاری مراحل و تولید دشمنان بر اساس زمان‌بندی موج‌ها"""
+
+    def __init__(self, levels_dir=None, seed=None, rng=None):
+        self.levels_dir = Path(levels_dir) if levels_dir else LEVELS_DIR
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+        self.level = 0
+        self.level_time = 0.0
+        self.schedule = None
+
+    def level_path(self, level):
+        """مسیر فایل موج یک مرحله"""
+        return self.levels_dir / f"level_{level}.waves"
+
+    def defined_levels(self):
+        """شماره مراحلی که فایل دارند"""
+        levels = []
+        for path in self.levels_dir.glob("level_*.waves"):
+            suffix = path.stem.split('_', 1)[1]
+            if suffix.isdigit():
+                levels.append(int(suffix))
+        return sorted(levels)
+
+    def resolve_level(self, level, path=None):
+        """فایل موج مرحله و ضریب تراکم آن (path، count_scale)"""
+        count_scale = 1.0
+        if path is None:
+            path = self.level_path(level)
+            if not path.exists():
+                # مراحل بعد از آخرین فایل با تکرار آن و افزایش تراکم ساخته می‌شوند
+                defined = self.defined_levels()
+                if not defined:
+                    raise FileNotFoundError(f"No wave files in {self.levels_dir}")
+                last = defined[-1]
+                path = self.level_path(last)
+                count_scale = 1.0 + 0.5 * (level - last)
+        return Path(path), count_scale
+
+    def enemy_types(self, level, path=None):
+        """نوع دشمنانی که در مرحله ظاهر می‌شوند (برای بارگذاری پیشاپیش مدل‌های مرحله)"""
+        path, _ = self.resolve_level(level, path)
+        waves = read_waves(path)
+        return [enemy_type for enemy_type in ENEMY_TYPES if any(wave['type'] == enemy_type for wave in waves)]
+
+    def scheduled_types(self):
+        """نوع دشمنان زمان‌بندی مرحله فعلی"""
+        if self.schedule is None:
+            return []
+        return [ENEMY_TYPES[index] for index in np.unique(self.schedule.types).tolist()]
+
+    def load_level(self, level, path=None):
+        """پیش‌پردازش موج‌های یک مرحله در زمان‌بندی"""
+        path, count_scale = self.resolve_level(level, path)
+        waves = read_waves(path)
+        self.schedule = WaveSchedule.from_waves(waves, count_scale, self.rng)
+        self.level = level
+        self.level_time = 0.0
+        return self.schedule
+
+    def update(self, delta_time):
+        """پیشبرد زمان مرحله؛ بازه ورودی‌های قابل تولید را برمی‌گرداند"""
+        if self.schedule is None:
+            return 0, 0
+        self.level_time += delta_time
+        return self.schedule.due(self.level_time)
+
+    def spawns(self, start, end):
+        """نوع و موقعیت ورودی‌های بازه داده‌شده"""
+        return self.schedule.types[start:end], self.schedule.positions[start:end]
+
+    def waves_finished(self):
+        """آیا همه دشمنان مرحله تولید شده‌اند؟"""
+        return self.schedule is None or self.schedule.finished()
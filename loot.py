@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Loot - جدول‌های رهاشدن سکه و قدرت‌افزایی هنگام نابودی دشمنان و سیارک‌ها
+ACTOn Game Studio
+
+هر ردیف جدول (نوع، احتمال، حداقل، حداکثر) است. برای تمام نابودشده‌های یک تیک یکجا و برداری
+تاس ریخته می‌شود: یک ماتریس (نابودشده × ردیف) احتمال و یک ماتریس تعداد، سپس با np.repeat
+به فهرست رهاشده‌ها (منبع، نوع) تبدیل می‌شود.
+"""
+
+import numpy as np
+
+# اندیس هر نوع در مؤلفه type استخر قدرت‌افزایی‌ها
+POWERUP_TYPES = ('health', 'fuel', 'weapon', 'shield', 'coin')
+
+
+class DropTable:
+    """احتمال و تعداد رهاشدن هر نوع برای یک منبع (مثلاً یک نوع دشمن)"""
+
+    def __init__(self, entries):
+        self.entries = tuple(entries)
+        self.types = np.array([POWERUP_TYPES.index(name) for name, _, _, _ in self.entries], dtype=np.int8)
+        self.chance = np.array([chance for _, chance, _, _ in self.entries], dtype=np.float64)
+        self.low = np.array([low for _, _, low, _ in self.entries], dtype=np.int64)
+        self.high = np.array([high for _, _, _, high in self.entries], dtype=np.int64) + 1
+
+    def roll(self, rng, count):
+        """رهاشده‌های count منبع؛ (اندیس منبع، اندیس نوع) برای هر رهاشده"""
+        if count == 0 or not len(self.types):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int8)
+        shape = (count, len(self.types))
+        amounts = rng.integers(self.low, self.high, shape)
+        amounts[rng.random(shape) >= self.chance] = 0
+        amounts = amounts.ravel()
+        sources = np.repeat(np.repeat(np.arange(count), len(self.types)), amounts)
+        types = np.repeat(np.tile(self.types, count), amounts)
+        return sources, types
+
+
+# جدول هر منبع؛ نوع‌های دشمن (ENEMY_TYPES) در صورت نبودن جدول خاص از 'enemy' استفاده می‌کنند
+DROP_TABLES = {
+    'enemy': DropTable([
+        ('coin', 0.75, 1, 3),
+        ('health', 0.05, 1, 1),
+        ('fuel', 0.08, 1, 1),
+        ('weapon', 0.03, 1, 1),
+        ('shield', 0.02, 1, 1),
+    ]),
+    'bomber': DropTable([
+        ('coin', 0.9, 2, 5),
+        ('health', 0.08, 1, 1),
+        ('fuel', 0.1, 1, 1),
+        ('weapon', 0.05, 1, 1),
+        ('shield', 0.04, 1, 1),
+    ]),
+    'asteroid': DropTable([
+        ('coin', 0.5, 1, 2),
+        ('fuel', 0.05, 1, 1),
+    ]),
+}
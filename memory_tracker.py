@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Memory Tracker - پایش مصرف حافظه موتور بازی
+ACTOn Game Studio
+"""
+
+import sys
+import time
+import tracemalloc
+
+
+def estimate_object_size(obj, seen=None):
+    """تخمین اندازه عمیق یک شیء بر حسب بایت"""
+    if seen is None:
+        seen = set()
+    obj_id = id(obj)
+    if obj_id in seen:
+        return 0
+    seen.add(obj_id)
+
+    # آرایه‌های numpy اندازه بافر خود را گزارش می‌کنند
+    nbytes = getattr(obj, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return sys.getsizeof(obj) + (0 if getattr(obj, 'base', None) is not None else nbytes)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += estimate_object_size(key, seen)
+            size += estimate_object_size(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += estimate_object_size(item, seen)
+    elif hasattr(obj, '__dict__'):
+        size += estimate_object_size(vars(obj), seen)
+    return size
+
+
+def estimate_collection_size(collection, sample_size=32):
+    """تخمین اندازه یک مجموعه با نمونه‌برداری از اعضای آن"""
+    count = len(collection)
+    size = sys.getsizeof(collection)
+    if count == 0:
+        return size
+
+    # برای مجموعه‌های بزرگ، میانگین چند عضو اول را برون‌یابی می‌کنیم
+    items = collection if count <= sample_size else [collection[i] for i in range(sample_size)]
+    sampled = sum(estimate_object_size(item) for item in items)
+    return size + int(sampled / len(items) * count)
+
+
+class MemoryTracker:
+    """ردیابی تعداد و حجم مجموعه‌های بازی و گزارش رشد آن‌ها"""
+
+    def __init__(self, report_interval=10.0, growth_reports=3, snapshot_frames=1):
+        self.report_interval = report_interval
+        self.growth_reports = growth_reports  # تعداد گزارش‌های پیاپی رو به رشد برای هشدار
+        self.snapshot_frames = snapshot_frames
+
+        self.collections = {}  # name -> (getter, size_fn)
+        self.last_sample = {}
+        self.growth_streaks = {}
+        self.last_report_time = None
+        self.show_hud = False
+
+        self.snapshots = []
+        self.max_snapshots = 2
+
+    def track(self, name, getter, size_fn=None):
+        """ثبت یک مجموعه برای پایش
+
+        getter مجموعه را برمی‌گرداند و size_fn (اختیاری) حجم آن را محاسبه می‌کند.
+        """
+        self.collections[name] = (getter, size_fn)
+        self.growth_streaks[name] = 0
+
+    def untrack(self, name):
+        """حذف یک مجموعه از پایش"""
+        self.collections.pop(name, None)
+        self.last_sample.pop(name, None)
+        self.growth_streaks.pop(name, None)
+
+    def sample(self):
+        """نمونه‌برداری از تعداد و حجم تمام مجموعه‌ها"""
+        stats = {}
+        for name, (getter, size_fn) in self.collections.items():
+            collection = getter()
+            if collection is None:
+                stats[name] = {'count': 0, 'bytes': 0}
+                continue
+
+            try:
+                count = len(collection)
+            except TypeError:
+                count = 1
+
+            if size_fn is not None:
+                size = size_fn(collection)
+            elif isinstance(collection, list):
+                size = estimate_collection_size(collection)
+            else:
+                size = estimate_object_size(collection)
+
+            stats[name] = {'count': count, 'bytes': size}
+        return stats
+
+    def update(self, current_time=None):
+        """گزارش دوره‌ای؛ در صورت رسیدن زمان گزارش، خطوط گزارش را برمی‌گرداند"""
+        if current_time is None:
+            current_time = time.time()
+
+        if self.last_report_time is not None and \
+                current_time - self.last_report_time < self.report_interval:
+            return None
+
+        self.last_report_time = current_time
+        stats = self.sample()
+        self.detect_growth(stats)
+        self.last_sample = stats
+
+        lines = self.format_report(stats)
+        for line in lines:
+            print(line)
+        return lines
+
+    def detect_growth(self, stats):
+        """به‌روزرسانی شمارنده رشد پیاپی هر مجموعه"""
+        for name, current in stats.items():
+            previous = self.last_sample.get(name)
+            if previous is not None and current['bytes'] > previous['bytes']:
+                self.growth_streaks[name] = self.growth_streaks.get(name, 0) + 1
+            else:
+                self.growth_streaks[name] = 0
+
+    def is_growing(self, name):
+        """آیا مجموعه در چند گزارش پیاپی رشد کرده است؟"""
+        return self.growth_streaks.get(name, 0) >= self.growth_reports
+
+    def format_report(self, stats=None, icons=True):
+        """قالب‌بندی گزارش حافظه به صورت خطوط متنی"""
+        if stats is None:
+            stats = self.last_sample
+
+        total = sum(entry['bytes'] for entry in stats.values())
+        header = f"Memory: {self.format_bytes(total)} tracked"
+        lines = [f"🧠 {header}" if icons else header]
+        for name, entry in stats.items():
+            line = f"  {name}: {entry['count']} items, {self.format_bytes(entry['bytes'])}"
+            if self.is_growing(name):
+                warning = f"growing for {self.growth_streaks[name]} reports"
+                line += f" ⚠️ {warning}" if icons else f" ! {warning}"
+            lines.append(line)
+        return lines
+
+    def hud_lines(self):
+        """خطوط قابل نمایش در HUD"""
+        if not self.show_hud:
+            return []
+        if not self.last_sample:
+            self.last_sample = self.sample()
+        # فونت bitmap در GLUT فقط کاراکترهای ASCII را رسم می‌کند
+        return self.format_report(icons=False)
+
+    def toggle_hud(self):
+        """نمایش/عدم نمایش گزارش حافظه در HUD"""
+        self.show_hud = not self.show_hud
+        return self.show_hud
+
+    def take_snapshot(self, top=10):
+        """گرفتن snapshot از tracemalloc و مقایسه با snapshot قبلی"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.snapshot_frames)
+            print("🧠 tracemalloc started; take another snapshot to compare")
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        self.snapshots.append(snapshot)
+        if len(self.snapshots) > self.max_snapshots:
+            self.snapshots.pop(0)
+
+        if len(self.snapshots) > 1:
+            stats = snapshot.compare_to(self.snapshots[-2], 'lineno')
+            print(f"🧠 Top {top} allocation changes since last snapshot:")
+        else:
+            stats = snapshot.statistics('lineno')
+            print(f"🧠 Top {top} allocations:")
+
+        for stat in stats[:top]:
+            print(f"  {stat}")
+        return stats[:top]
+
+    def stop(self):
+        """توقف tracemalloc و پاک کردن snapshotها"""
+        self.snapshots.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @staticmethod
+    def format_bytes(size):
+        """نمایش خوانای حجم"""
+        if size < 1024:
+            return f"{size} B"
+        for unit in ('KB', 'MB', 'GB'):
+            size /= 1024
+            if size < 1024:
+                break
+        return f"{size:.1f} {unit}"
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Particle Check - مقایسه موقعیت ذرات در مسیر CPU (ParticleSystem.evaluate) و شیدر ParticleRenderer
+ACTOn Game Studio
+
+برنامه شیدر خود ParticleRenderer با transform feedback دوباره link می‌شود تا gl_Position هر رأس
+بدون رسترسازی خوانده شود. مش ذره یک مثلث تباهیده در مبدأ و ماتریس‌های صحنه همانی هستند، پس
+خروجی هر نمونه دقیقاً مرکز ذره (یا نقطه خارج از دید برای ذرات مرده) است. انفجارها و رد موتور
+در زمان‌های مختلف و با حلقه کوچک تولید می‌شوند تا بارگذاری تدریجی و دور زدن حلقه هم آزموده شود.
+
+    python particle_check.py --capacity 256 --frames 240
+"""
+
+import argparse
+import ctypes
+import sys
+import numpy as np
+from render_benchmark import OffscreenContext
+from OpenGL.GL import *
+from game_entities import ParticleSystem, TrailEmitter
+from random_service import ParameterBatch
+from shader_renderer import ShaderRenderer, ParticleRenderer, SCENE_BINDING
+
+# موقعیت رأس‌های ذره مرده در PARTICLE_VERTEX_SHADER
+DEAD_POSITION = (2.0, 2.0, 2.0, 1.0)
+
+
+def capture_positions(renderer, system):
+    """gl_Position رأس اول هر نمونه (min(emitted, capacity) ردیف حلقه) با transform feedback"""
+    count = min(system.emitted, system.capacity)
+    floats = count * renderer.vertex_count * 4
+    if count == 0:
+        return np.zeros((0, 4), dtype=np.float32)
+
+    buffer = glGenBuffers(1)
+    glBindBuffer(GL_TRANSFORM_FEEDBACK_BUFFER, buffer)
+    glBufferData(GL_TRANSFORM_FEEDBACK_BUFFER, floats * 4, None, GL_STREAM_READ)
+    glBindBufferBase(GL_TRANSFORM_FEEDBACK_BUFFER, 0, buffer)
+
+    glEnable(GL_RASTERIZER_DISCARD)
+    renderer.begin()
+    glBeginTransformFeedback(GL_TRIANGLES)
+    renderer.draw(system)
+    glEndTransformFeedback()
+    renderer.end()
+    glDisable(GL_RASTERIZER_DISCARD)
+
+    data = np.empty(floats, dtype=np.float32)
+    glGetBufferSubData(GL_TRANSFORM_FEEDBACK_BUFFER, 0, data.nbytes, data.ctypes.data_as(ctypes.c_void_p))
+    glBindBufferBase(GL_TRANSFORM_FEEDBACK_BUFFER, 0, 0)
+    glDeleteBuffers(1, [buffer])
+    return data.reshape(count, renderer.vertex_count, 4)[:, 0]
+
+
+def capture_program(renderer):
+    """link دوباره برنامه ParticleRenderer با gl_Position به عنوان خروجی transform feedback"""
+    program = renderer.program
+    varyings = (ctypes.c_char_p * 1)(b"gl_Position")
+    glTransformFeedbackVaryings(program, 1, ctypes.cast(varyings, ctypes.POINTER(ctypes.POINTER(GLchar))),
+                                GL_INTERLEAVED_ATTRIBS)
+    glLinkProgram(program)
+    if not glGetProgramiv(program, GL_LINK_STATUS):
+        raise RuntimeError(glGetProgramInfoLog(program))
+    glUniformBlockBinding(program, glGetUniformBlockIndex(program, "Scene"), SCENE_BINDING)
+    renderer.time_location = glGetUniformLocation(program, "time")
+
+
+def compare_particle_paths(capacity=256, frames=240, fps=60, seed=0, tolerance=1e-4):
+    """اجرای چند انفجار و رد موتور و مقایسه CPU و GPU در هر فریم؛ بیشترین خطا را برمی‌گرداند"""
+    context = OffscreenContext(16, 16)
+    shader = ShaderRenderer(light_pos=(0, 0, 0))
+    renderer = ParticleRenderer(shader, np.zeros((3, 6), dtype=np.float32))
+    capture_program(renderer)
+    for mode in (GL_PROJECTION, GL_MODELVIEW):
+        glMatrixMode(mode)
+        glLoadIdentity()
+
+    rng = np.random.default_rng(seed)
+    random = ParameterBatch(np.random.default_rng(seed), np.zeros(ParticleSystem.RANDOM_COLUMNS),
+                            np.ones(ParticleSystem.RANDOM_COLUMNS))
+    system = ParticleSystem(random=random, capacity=capacity)
+    emitter = TrailEmitter()
+    sources = rng.uniform(-5, 5, (4, 3)).astype(np.float32)
+    source_velocities = rng.uniform(-3, 3, (4, 3)).astype(np.float32)
+    accumulators = np.zeros(len(sources), dtype=np.float32)
+
+    delta_time = 1 / fps
+    worst = 0.0
+    mismatches = 0
+    try:
+        for frame in range(frames):
+            if frame % 20 == 0:
+                system.create_explosion(rng.uniform(-5, 5, 3), count=int(rng.integers(10, 60)))
+            system.emit_trails(emitter, sources, source_velocities, accumulators, delta_time)
+            system.update(delta_time)
+
+            gpu = capture_positions(renderer, system)
+            live = np.flatnonzero(system.alive()[:len(gpu)])
+            cpu, _, _ = system.evaluate()
+            error = float(np.abs(gpu[live, :3] - cpu).max()) if len(live) else 0.0
+            dead = np.ones(len(gpu), dtype=bool)
+            dead[live] = False
+            dead_ok = np.array_equal(gpu[dead], np.broadcast_to(DEAD_POSITION, (int(dead.sum()), 4)))
+            scale = max(1.0, float(np.abs(cpu).max()) if len(cpu) else 1.0)
+            if error > tolerance * scale or not dead_ok or len(cpu) != len(live):
+                mismatches += 1
+            worst = max(worst, error / scale)
+    finally:
+        renderer.shutdown()
+        shader.shutdown()
+        context.shutdown()
+
+    print(f"🧪 Particle check: {frames} frames, ring {capacity}, {system.emitted} particles emitted, "
+          f"{system.resets} reset(s)")
+    print(f"  max relative error {worst:.2e} (tolerance {tolerance:.0e}), mismatched frames {mismatches}")
+    return worst, mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare CPU and GPU particle positions")
+    parser.add_argument('--capacity', type=int, default=256, help="particle ring size (small to force wraparound)")
+    parser.add_argument('--frames', type=int, default=240)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    _, mismatches = compare_particle_paths(args.capacity, args.frames, seed=args.seed)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
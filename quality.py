@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Quality Settings - پیش‌تنظیم‌های کیفیت گرافیک و تنظیم خودکار آن‌ها از زمان فریم
+ACTOn Game Studio
+
+هر سطح (LOW تا ULTRA) بودجه‌های مشخص رندر را تعیین می‌کند. در حالت خودکار میانگین
+زمان کار هر فریم با بودجه FPS هدف مقایسه و سطح با تأخیر (hysteresis) یک پله جابه‌جا می‌شود.
+"""
+
+import time
+
+
+class QualityPreset:
+    """بودجه‌های رندر یک سطح کیفیت"""
+
+    def __init__(self, name, max_particles, star_count, sphere_detail, far_sphere_detail,
+                 lod_distance, cull_distance):
+        self.name = name
+        self.max_particles = max_particles
+        self.star_count = star_count
+        self.sphere_detail = sphere_detail          # (slices, stacks) کره‌های نزدیک
+        self.far_sphere_detail = far_sphere_detail  # کره‌های دورتر از lod_distance
+        self.lod_distance = lod_distance
+        self.cull_distance = cull_distance          # موجودیت‌های دورتر رسم نمی‌شوند
+
+
+QUALITY_PRESETS = {
+    'LOW': QualityPreset('LOW', 150, 250, (6, 4), (4, 3), 8.0, 25.0),
+    'MEDIUM': QualityPreset('MEDIUM', 300, 500, (8, 6), (5, 3), 12.0, 35.0),
+    'HIGH': QualityPreset('HIGH', 500, 1000, (8, 6), (6, 4), 18.0, 50.0),
+    'ULTRA': QualityPreset('ULTRA', 1500, 2500, (16, 12), (8, 6), 30.0, 80.0),
+}
+QUALITY_LEVELS = tuple(QUALITY_PRESETS)
+
+
+class QualityManager:
+    """انتخاب سطح کیفیت و تغییر خودکار آن برای حفظ FPS هدف
+
+    on_change(preset) پس از هر تغییر سطح فراخوانی می‌شود.
+    """
+
+    def __init__(self, level="HIGH", auto=False, target_fps=60, on_change=None,
+                 smoothing=0.05, warmup_frames=60, cooldown=3.0, downgrade=1.15, upgrade=0.6):
+        if level not in QUALITY_PRESETS:
+            raise ValueError(f"Unknown quality level: {level}")
+        self.level = level
+        self.auto = auto
+        self.target_ms = 1000.0 / target_fps
+        self.on_change = on_change
+        self.smoothing = smoothing
+        self.warmup_frames = warmup_frames
+        self.cooldown = cooldown
+        self.downgrade = downgrade  # کاهش وقتی میانگین از این ضریب بودجه بیشتر شود
+        self.upgrade = upgrade      # افزایش وقتی میانگین از این ضریب بودجه کمتر بماند
+        self.average_ms = 0.0
+        self.frames = 0
+        self.last_change = None
+
+    @property
+    def preset(self):
+        return QUALITY_PRESETS[self.level]
+
+    @property
+    def max_preset(self):
+        """بزرگ‌ترین بودجه‌ها برای تخصیص یک‌باره ظرفیت"""
+        return QUALITY_PRESETS[QUALITY_LEVELS[-1]]
+
+    def set_level(self, level, now=None):
+        """تغییر سطح کیفیت؛ اگر سطح عوض شود True برمی‌گرداند"""
+        if level not in QUALITY_PRESETS:
+            raise ValueError(f"Unknown quality level: {level}")
+        if level == self.level:
+            return False
+
+        self.level = level
+        self.frames = 0
+        self.last_change = time.monotonic() if now is None else now
+        print(f"🎛️ Graphics quality: {level}" + (" (auto)" if self.auto else ""))
+        if self.on_change:
+            self.on_change(self.preset)
+        return True
+
+    def step(self, offset, now=None):
+        """رفتن به سطح بالاتر (+1) یا پایین‌تر (-1) در محدوده سطوح"""
+        index = QUALITY_LEVELS.index(self.level) + offset
+        index = max(0, min(len(QUALITY_LEVELS) - 1, index))
+        return self.set_level(QUALITY_LEVELS[index], now)
+
+    def cycle(self):
+        """سطح بعدی (پس از ULTRA دوباره LOW)؛ حالت خودکار خاموش می‌شود"""
+        self.auto = False
+        index = (QUALITY_LEVELS.index(self.level) + 1) % len(QUALITY_LEVELS)
+        return self.set_level(QUALITY_LEVELS[index])
+
+    def record_frame(self, frame_ms, now=None):
+        """ثبت زمان کار یک فریم؛ در حالت خودکار ممکن است سطح را یک پله تغییر دهد"""
+        if self.frames == 0:
+            self.average_ms = frame_ms
+        else:
+            self.average_ms += (frame_ms - self.average_ms) * self.smoothing
+        self.frames += 1
+
+        if not self.auto or self.frames < self.warmup_frames:
+            return False
+        now = time.monotonic() if now is None else now
+        if self.last_change is not None and now - self.last_change < self.cooldown:
+            return False
+
+        if self.average_ms > self.target_ms * self.downgrade:
+            return self.step(-1, now)
+        if self.average_ms < self.target_ms * self.upgrade:
+            return self.step(1, now)
+        return False
+
+    def report_lines(self, icons=True):
+        """خطوط گزارش برای HUD (icons=False برای فونت‌های فقط ASCII)"""
+        mode = "auto" if self.auto else "fixed"
+        preset = self.preset
+        header = f"Quality: {self.level} ({mode}), frame {self.average_ms:.2f}/{self.target_ms:.2f} ms"
+        return [
+            f"🎛️ {header}" if icons else header,
+            f"  particles {preset.max_particles}, stars {preset.star_count}, "
+            f"spheres {preset.sphere_detail[0]}x{preset.sphere_detail[1]}, "
+            f"LOD {preset.lod_distance:.0f}, cull {preset.cull_distance:.0f}"
+        ]
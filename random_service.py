@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Random Service - جریان‌های تصادفی seedدار برای هر زیرسیستم و بلوک‌های پیش‌تولیدشده پارامترها
+ACTOn Game Studio
+
+هر زیرسیستم (سیارک‌ها، ذرات، دشمنان، مراحل...) Generator مستقل خود را از روی seed اصلی و
+نام جریان می‌گیرد؛ پس دنباله هر جریان به ترتیب ساخت یا مصرف جریان‌های دیگر بستگی ندارد و
+با همان seed بازی قابل تکرار (replay و تست قطعی) است.
+
+ParameterBatch پارامترهای تولید را به صورت بلوک‌های بزرگ می‌سازد و بلوک بعدی را در پس‌زمینه
+پر می‌کند؛ چون هر بلوک فقط از Generator همان دسته و به ترتیب ساخته می‌شود، خروجی با یا بدون
+نخ پس‌زمینه یکسان است.
+"""
+
+import sys
+import zlib
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ParameterBatch:
+    """بلوک‌های پیش‌تولیدشده از ستون‌های یکنواخت در [low, high)
+
+    take(n) آرایه (n, ستون‌ها) را از بلوک فعلی برمی‌دارد؛ هنگام تمام شدن بلوک، بلوک بعدی
+    که در پس‌زمینه ساخته شده جایگزین می‌شود و ساخت بلوک پس از آن شروع می‌شود.
+    """
+
+    def __init__(self, rng, low, high, block_size=4096, executor=None):
+        self.rng = rng
+        self.low = np.asarray(low, dtype=np.float32).reshape(-1)
+        self.high = np.asarray(high, dtype=np.float32).reshape(-1)
+        self.block_size = block_size
+        self.executor = executor
+        self.pending = None
+        self.refills = 0
+        self.block = self.generate()
+        self.cursor = 0
+        self.refill()
+
+    @property
+    def columns(self):
+        return len(self.low)
+
+    def generate(self):
+        """ساخت یک بلوک کامل با یک فراخوانی Generator"""
+        return self.rng.uniform(self.low, self.high, (self.block_size, self.columns)).astype(np.float32)
+
+    def refill(self):
+        """شروع ساخت بلوک بعدی (در پس‌زمینه اگر executor داشته باشیم)"""
+        self.pending = self.executor.submit(self.generate) if self.executor else None
+
+    def next_block(self):
+        self.block = self.pending.result() if self.pending else self.generate()
+        self.cursor = 0
+        self.refills += 1
+        self.refill()
+
+    def take(self, count):
+        """count ردیف پارامتر؛ نتیجه فقط‌خواندنی است و نباید درجا تغییر کند"""
+        end = self.cursor + count
+        if end <= self.block_size:
+            rows = self.block[self.cursor:end]
+            self.cursor = end
+            return rows
+
+        parts = []
+        while count > 0:
+            if self.cursor == self.block_size:
+                self.next_block()
+            taken = min(count, self.block_size - self.cursor)
+            parts.append(self.block[self.cursor:self.cursor + taken])
+            self.cursor += taken
+            count -= taken
+        return np.concatenate(parts) if parts else self.block[:0]
+
+
+class RandomService:
+    """seed اصلی بازی و جریان‌های نام‌دار زیرسیستم‌ها
+
+    جریان هر نام از SeedSequence(seed, spawn_key=crc32(name)) ساخته می‌شود. هر Generator
+    فقط باید از یک نخ (همان زیرسیستم) استفاده شود.
+    """
+
+    def __init__(self, seed=None, background=True):
+        self.root = np.random.SeedSequence(seed)
+        self.streams = {}
+        self.batches = []
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rng") if background else None
+
+    @property
+    def seed(self):
+        """seed مؤثر (برای ثبت در replay وقتی seed داده نشده)"""
+        return self.root.entropy
+
+    def stream(self, name):
+        """Generator قطعی جریان name (با هر بار فراخوانی همان شیء)"""
+        if name not in self.streams:
+            sequence = np.random.SeedSequence(self.root.entropy, spawn_key=(zlib.crc32(name.encode()),))
+            self.streams[name] = np.random.default_rng(sequence)
+        return self.streams[name]
+
+    def batch(self, name, low, high, block_size=4096):
+        """دسته پارامترهای پیش‌تولیدشده روی جریان name (جریان فقط به این دسته تعلق دارد)"""
+        batch = ParameterBatch(self.stream(name), low, high, block_size, self.executor)
+        self.batches.append(batch)
+        return batch
+
+    def report_lines(self):
+        """خطوط گزارش برای HUD یا بنچمارک"""
+        refills = sum(batch.refills for batch in self.batches)
+        mode = "background" if self.executor else "inline"
+        return [f"🎲 RNG: seed {self.seed}, {len(self.streams)} streams, {refills} block refills ({mode})"]
+
+    def shutdown(self):
+        """توقف نخ ساخت بلوک‌ها"""
+        if self.executor:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+            for batch in self.batches:
+                batch.executor = None
+
+
+def verify_determinism(seed=1234, names=('asteroids', 'particles', 'enemies', 'loot', 'levels'), takes=2000,
+                       block_size=64):
+    """بررسی تکرارپذیری: همان seed همان مقادیر جریان‌ها و بلوک‌های ParameterBatch را می‌دهد
+
+    جریان‌ها در دو سرویس با ترتیب ساخت مخالف گرفته می‌شوند. دسته‌ها یک بار بدون نخ پس‌زمینه و
+    یک بار با نخ پس‌زمینه ساخته می‌شوند و هر دسته را یک نخ مصرف‌کننده جدا با اندازه‌های تصادفی
+    take می‌کند؛ block_size کوچک باعث می‌شود پر کردن بلوک‌ها مدام با مصرف هم‌زمان شود.
+    """
+    failures = []
+
+    first, second = RandomService(seed, background=False), RandomService(seed, background=False)
+    for name in names:
+        first.stream(name)
+    for name in reversed(names):
+        second.stream(name)
+    for name in names:
+        if not np.array_equal(first.stream(name).random(1000), second.stream(name).random(1000)):
+            failures.append(f"stream '{name}' differs between services")
+    other = RandomService(seed + 1, background=False)
+    if np.array_equal(other.stream(names[0]).random(1000), RandomService(seed).stream(names[0]).random(1000)):
+        failures.append(f"seeds {seed} and {seed + 1} give the same stream")
+
+    def drain(batch, sizes):
+        return np.concatenate([batch.take(int(size)).copy() for size in sizes])
+
+    def consume(service):
+        """خروجی تمام دسته‌ها؛ هر دسته در نخ مصرف‌کننده خودش"""
+        batches = [service.batch(name, np.zeros(5), np.arange(1, 6), block_size) for name in names]
+        sizes = np.random.default_rng(seed).integers(1, 3 * block_size, (len(names), takes))
+        with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="consumer") as consumers:
+            futures = [consumers.submit(drain, batch, row) for batch, row in zip(batches, sizes)]
+            outputs = [future.result() for future in futures]
+        refills = sum(batch.refills for batch in batches)
+        service.shutdown()
+        return outputs, refills
+
+    inline, _ = consume(RandomService(seed, background=False))
+    background, refills = consume(RandomService(seed, background=True))
+    for name, expected, actual in zip(names, inline, background):
+        if not np.array_equal(expected, actual):
+            failures.append(f"batch '{name}' differs with background refills")
+
+    print(f"🧪 RNG determinism: seed {seed}, {len(names)} streams, {refills} background refills")
+    for failure in failures:
+        print(f"  ❌ {failure}")
+    if not failures:
+        print("  ✅ streams and parameter blocks match")
+    return not failures
+
+
+if __name__ == "__main__":
+    sys.exit(0 if verify_determinism() else 1)
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Render Benchmark - رندر بدون پنجره صحنه‌های بازی به تصویر و اندازه‌گیری هزینه رسم
+ACTOn Game Studio
+
+صحنه‌ها با تعداد ثابت موجودیت از مسیر render_game موتور در یک FBO رسم می‌شوند.
+روی لینوکس بدون نمایشگر context با EGL (پلتفرم surfaceless، مثلاً llvmpipe در Mesa)
+ساخته می‌شود؛ در غیر این صورت یک پنجره مخفی pygame فقط برای context استفاده می‌شود.
+
+    python render_benchmark.py --sizes 100 1000 5000 --renderer shader --output frames
+"""
+
+import os
+import sys
+
+# پلتفرم PyOpenGL باید پیش از اولین import از OpenGL انتخاب شود
+if not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY') and sys.platform.startswith('linux'):
+    os.environ.setdefault('PYOPENGL_PLATFORM', 'egl')
+    os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+
+import time
+import ctypes
+import argparse
+import numpy as np
+import pygame
+from OpenGL.GL import *
+from galaxy_game_3d import Galaxy3DEngine
+from simulation import GalaxySimulation, PLAYER_SHOT_SPEED, ENEMY_SHOT_SPEED, COIN
+from level_system import ENEMY_TYPES
+from game_entities import ParticleSystem
+from viewports import VIEW_LAYOUTS
+
+DEFAULT_SIZES = (100, 500, 1000, 2000, 5000)
+
+
+class OffscreenContext:
+    """context OpenGL بدون پنجره همراه با FBO رنگ و عمق به اندازه تصویر"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.egl = None
+        if os.environ.get('PYOPENGL_PLATFORM') == 'egl':
+            self.backend = 'egl'
+            self.create_egl_context()
+        else:
+            self.backend = 'pygame'
+            self.create_window_context()
+        self.create_framebuffer()
+
+    def create_egl_context(self):
+        """context OpenGL (نه GLES) روی display پیش‌فرض EGL با یک pbuffer کوچک"""
+        from OpenGL import EGL
+
+        display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        if not EGL.eglInitialize(display, None, None):
+            raise RuntimeError("eglInitialize failed")
+
+        attributes = (EGL.EGLint * 13)(
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+            EGL.EGL_DEPTH_SIZE, 24,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_NONE
+        )
+        config = EGL.EGLConfig()
+        found = EGL.EGLint()
+        EGL.eglChooseConfig(display, attributes, ctypes.pointer(config), 1, ctypes.pointer(found))
+        if found.value == 0:
+            raise RuntimeError("No EGL config with desktop OpenGL support")
+
+        # تصویر در FBO رسم می‌شود؛ pbuffer فقط سطح لازم برای فعال کردن context است
+        surface = EGL.eglCreatePbufferSurface(
+            display, config, (EGL.EGLint * 5)(EGL.EGL_WIDTH, 16, EGL.EGL_HEIGHT, 16, EGL.EGL_NONE))
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        context = EGL.eglCreateContext(display, config, EGL.EGL_NO_CONTEXT, None)
+        if not context or not EGL.eglMakeCurrent(display, surface, surface, context):
+            raise RuntimeError("Could not create EGL OpenGL context")
+        self.egl = (EGL, display, surface, context)
+
+    def create_window_context(self):
+        """پنجره مخفی pygame وقتی نمایشگر در دسترس است"""
+        pygame.display.init()
+        pygame.display.set_mode((16, 16), pygame.OPENGL | pygame.HIDDEN)
+
+    def create_framebuffer(self):
+        """FBO با renderbufferهای RGBA8 و DEPTH24"""
+        self.framebuffer = glGenFramebuffers(1)
+        self.renderbuffers = glGenRenderbuffers(2)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.framebuffer)
+        for renderbuffer, storage, attachment in (
+                (self.renderbuffers[0], GL_RGBA8, GL_COLOR_ATTACHMENT0),
+                (self.renderbuffers[1], GL_DEPTH_COMPONENT24, GL_DEPTH_ATTACHMENT)):
+            glBindRenderbuffer(GL_RENDERBUFFER, renderbuffer)
+            glRenderbufferStorage(GL_RENDERBUFFER, storage, self.width, self.height)
+            glFramebufferRenderbuffer(GL_FRAMEBUFFER, attachment, GL_RENDERBUFFER, renderbuffer)
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+
+        status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError(f"Framebuffer incomplete: 0x{int(status):x}")
+        glViewport(0, 0, self.width, self.height)
+
+    def read_pixels(self):
+        """تصویر RGB فعلی FBO با سطر اول در بالا"""
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        data = glReadPixels(0, 0, self.width, self.height, GL_RGB, GL_UNSIGNED_BYTE)
+        pixels = np.frombuffer(data, dtype=np.uint8).reshape(self.height, self.width, 3)
+        return np.flipud(pixels)
+
+    def save_image(self, path):
+        """ذخیره تصویر FBO (PNG یا هر قالب پشتیبانی‌شده pygame)"""
+        surface = pygame.surfarray.make_surface(self.read_pixels().swapaxes(0, 1))
+        pygame.image.save(surface, path)
+
+    def shutdown(self):
+        """آزادسازی FBO و context"""
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        glDeleteRenderbuffers(2, self.renderbuffers)
+        glDeleteFramebuffers(1, [self.framebuffer])
+        if self.egl is not None:
+            EGL, display, surface, context = self.egl
+            EGL.eglMakeCurrent(display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+            EGL.eglDestroyContext(display, context)
+            EGL.eglDestroySurface(display, surface)
+            EGL.eglTerminate(display)
+            self.egl = None
+        else:
+            pygame.display.quit()
+
+
+class GpuTimer:
+    """زمان اجرای فرمان‌های GL با GL_TIME_ELAPSED؛ بدون آن None برمی‌گرداند
+
+    در رندرکننده‌های نرم‌افزاری (llvmpipe) این مقدار تقریبی است؛ زمان انتظار glFinish
+    هم جداگانه گزارش می‌شود.
+    """
+
+    def __init__(self):
+        try:
+            self.query = int(glGenQueries(1)[0])
+        except Exception:
+            self.query = None
+        self.active = False
+
+    def begin(self):
+        if self.query is not None:
+            glBeginQuery(GL_TIME_ELAPSED, self.query)
+            self.active = True
+
+    def end(self):
+        if self.active:
+            glEndQuery(GL_TIME_ELAPSED)
+
+    def result_ms(self):
+        """زمان GPU آخرین بازه (منتظر آماده شدن نتیجه می‌ماند)"""
+        if not self.active:
+            return None
+        self.active = False
+        # بافر خروجی صریح: تبدیل خودکار PyOpenGL نوع 64 بیتی را نمی‌شناسد
+        elapsed = ctypes.c_uint64()
+        glGetQueryObjectui64v(self.query, GL_QUERY_RESULT, ctypes.byref(elapsed))
+        return elapsed.value / 1e6
+
+    def shutdown(self):
+        if self.query is not None:
+            glDeleteQueries(1, [self.query])
+            self.query = None
+
+
+def create_engine(width, height, renderer="auto", particle_backend="auto", quality="HIGH", star_count=1000,
+                  seed=0, particle_capacity=ParticleSystem.CAPACITY, resolution_scale=None, views="single",
+                  timeout=10.0):
+    """موتور بدون پنجره با مدل‌های آماده و شبیه‌سازی با seed ثابت
+
+    بودجه ذرات سطح کیفیت اعمال نمی‌شود تا تعداد موجودیت‌های صحنه ثابت بماند.
+    resolution_scale صحنه را با مقیاس ثابت در FBO وضوح پویا رسم می‌کند.
+    """
+    engine = Galaxy3DEngine(width, height, renderer=renderer, particle_backend=particle_backend,
+                            quality=quality, headless=True, dynamic_resolution=resolution_scale is not None,
+                            views=views)
+    if resolution_scale is not None:
+        scaler = engine.resolution
+        scaler.min_scale = scaler.max_scale = scaler.scale = resolution_scale
+
+    # صحنه بنچمارک همه نوع دشمن را دارد
+    engine.enter_level_models(ENEMY_TYPES)
+    deadline = time.perf_counter() + timeout
+    models = Galaxy3DEngine.REQUIRED_MODELS + ('coin_model',) + engine.level_models
+    while not engine.resources.all_ready(models):
+        if time.perf_counter() > deadline:
+            raise TimeoutError("Models were not ready in time")
+        engine.resources.process_uploads()
+        time.sleep(0.001)
+
+    engine.world.shutdown()
+    engine.world = GalaxySimulation(star_count=star_count, seed=seed, workers=1,
+                                    particle_capacity=particle_capacity)
+    engine.game_state = "PLAYING"
+    return engine
+
+
+def build_scene(world, count):
+    """صحنه ثابت: count دشمن، count/4 سیارک، count/2 پرتابه، count رهاشده و count ذره روبه‌روی دوربین"""
+    world.reset(asteroid_count=max(count // 4, 1))
+    rng = world.random.stream('benchmark')
+
+    def positions(n, depth=(-30, -6)):
+        return np.column_stack([rng.uniform(-8, 8, n), rng.uniform(-6, 6, n), rng.uniform(*depth, n)])
+
+    world.spawn_enemies(rng.integers(len(ENEMY_TYPES), size=count), positions(count))
+    world.enemies['rot'] = rng.uniform(0, 360, (count, 3))
+
+    shots = count // 2
+    owners = np.arange(shots) % 2
+    shot_positions = positions(shots)
+    world.projectiles.spawn(
+        shots, pos=shot_positions, prev=shot_positions, owner=owners, damage=1,
+        vel=np.column_stack([np.zeros(shots), np.zeros(shots),
+                             np.where(owners == 0, PLAYER_SHOT_SPEED, ENEMY_SHOT_SPEED)])
+    )
+
+    # سکه‌ها با یک قدرت‌افزایی در هر هشت رهاشده
+    types = np.full(count, COIN, dtype=np.int8)
+    types[::8] = np.arange(len(types[::8])) % COIN
+    world.powerups.spawn(count, pos=positions(count, depth=(-15, -3)), type=types,
+                         rot=np.column_stack([np.zeros(count), rng.uniform(0, 360, count), np.zeros(count)]))
+
+    world.particle_system.emit(
+        positions(count, depth=(-20, -4)), np.zeros((count, 3)), 1.0,
+        rng.uniform(0.05, 0.2, count),
+        np.column_stack([rng.uniform(0.8, 1.0, count), rng.uniform(0.3, 0.6, count),
+                         rng.uniform(0.0, 0.2, count)])
+    )
+
+
+def benchmark_scene(engine, context, count, frames=30, warmup=3, image_path=None):
+    """رندر frames فریم از یک صحنه ثابت؛ میانگین زمان‌ها و آمار صف رندر را برمی‌گرداند"""
+    build_scene(engine.world, count)
+    # queryهای GL_TIME_ELAPSED تودرتو مجاز نیستند: با وضوح پویا زمان GPU صحنه از زمان‌سنج موتور خوانده می‌شود
+    scaled = engine.scene_target is not None
+    timer = GpuTimer() if not scaled else None
+    frame_ms = np.zeros(frames)
+    submit_ms = np.zeros(frames)
+    gl_ms = []
+
+    for frame in range(warmup + frames):
+        start = time.perf_counter()
+        if timer:
+            timer.begin()
+        engine.render()
+        if timer:
+            timer.end()
+        submitted = time.perf_counter()
+        glFinish()
+        finished = time.perf_counter()
+        if timer:
+            elapsed = timer.result_ms()
+        else:
+            # نتیجه query صحنه در render بعدی خوانده می‌شود
+            elapsed = engine.resolution.last_ms if engine.gpu_timer.supported else None
+
+        if frame >= warmup:
+            frame_ms[frame - warmup] = (finished - start) * 1000
+            submit_ms[frame - warmup] = (submitted - start) * 1000
+            if elapsed is not None:
+                gl_ms.append(elapsed)
+    if timer:
+        timer.shutdown()
+
+    if image_path:
+        context.save_image(image_path)
+
+    stats = engine.render_queue.stats
+    return {
+        'entities': count,
+        'fps': 1000 / frame_ms.mean(),
+        'frame_ms': frame_ms.mean(),
+        'p95_ms': np.percentile(frame_ms, 95),
+        'submit_ms': submit_ms.mean(),
+        'finish_ms': (frame_ms - submit_ms).mean(),
+        'gl_ms': np.mean(gl_ms) if gl_ms else None,
+        'draw_calls': stats['draw_calls'],
+        'commands': stats['commands'],
+        'image': image_path,
+    }
+
+
+def benchmark_render(sizes=DEFAULT_SIZES, frames=30, warmup=3, width=1200, height=800,
+                     renderer="auto", particle_backend="auto", quality="HIGH", output=None, seed=0,
+                     resolution_scale=None, views="single"):
+    """بنچمارک رندر بدون پنجره برای اندازه‌های صحنه؛ در صورت تعیین output تصویر هر صحنه ذخیره می‌شود"""
+    context = OffscreenContext(width, height)
+    engine = create_engine(width, height, renderer=renderer, particle_backend=particle_backend,
+                           quality=quality, seed=seed, particle_capacity=max(sizes),
+                           resolution_scale=resolution_scale, views=views)
+    if output:
+        os.makedirs(output, exist_ok=True)
+
+    mode = "shader" if engine.shader_renderer else "fixed-function"
+    mode += ", GPU particles" if engine.particle_renderer else ", CPU particles"
+    mode += f", {engine.graphics_quality} quality"
+    if engine.scene_target:
+        mode += f", {engine.resolution.scale * 100:.0f}% scene resolution"
+    if len(engine.views) > 1:
+        mode += f", {views} views"
+    print(f"🧪 Render benchmark: {width}x{height}, {mode}, {context.backend} "
+          f"({glGetString(GL_RENDERER).decode()})")
+    results = []
+    try:
+        for count in sizes:
+            image_path = os.path.join(output, f"scene_{count}.png") if output else None
+            result = benchmark_scene(engine, context, count, frames, warmup, image_path)
+            results.append(result)
+            gl_time = "n/a" if result['gl_ms'] is None else f"{result['gl_ms']:.2f} ms"
+            print(f"  {count:>6} entities: {result['fps']:7.1f} FPS, frame {result['frame_ms']:.2f} ms "
+                  f"(p95 {result['p95_ms']:.2f}), submit {result['submit_ms']:.2f} ms, "
+                  f"finish {result['finish_ms']:.2f} ms, GL {gl_time}, "
+                  f"{result['draw_calls']} draw calls ({result['commands']} commands)")
+    finally:
+        engine.shutdown()
+        context.shutdown()
+    return results
+
+
+def main():
+    """اجرای بنچمارک از خط فرمان"""
+    parser = argparse.ArgumentParser(description="Offscreen render benchmark for Galaxy 3D")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="enemy count per scene (asteroids, projectiles and particles scale with it)")
+    parser.add_argument("--frames", type=int, default=30, help="measured frames per scene")
+    parser.add_argument("--warmup", type=int, default=3, help="frames rendered before measuring")
+    parser.add_argument("--width", type=int, default=1200)
+    parser.add_argument("--height", type=int, default=800)
+    parser.add_argument("--renderer", choices=("auto", "shader", "fixed"), default="auto")
+    parser.add_argument("--particles", choices=("auto", "gpu", "cpu"), default="auto")
+    parser.add_argument("--quality", choices=("LOW", "MEDIUM", "HIGH", "ULTRA"), default="HIGH")
+    parser.add_argument("--output", help="directory for one PNG per scene")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--views", choices=VIEW_LAYOUTS, default="single", help="viewport layout")
+    parser.add_argument("--resolution-scale", type=float,
+                        help="render the scene at this fixed scale and upscale it (dynamic resolution path)")
+    args = parser.parse_args()
+
+    benchmark_render(args.sizes, args.frames, args.warmup, args.width, args.height,
+                     args.renderer, args.particles, args.quality, args.output, args.seed,
+                     args.resolution_scale, args.views)
+
+
+if __name__ == "__main__":
+    main()
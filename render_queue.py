@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Render Queue - ثبت فرمان‌های رسم با کلید مرتب‌سازی و اجرای دسته‌ای آن‌ها
+ACTOn Game Studio
+
+کلید هر فرمان یک int64 است: pass | state | model | depth
+(در pass شفاف عمق قبل از state قرار می‌گیرد تا رسم از عقب به جلو باشد).
+پس از مرتب‌سازی، state و مدل فقط هنگام تغییر عوض می‌شوند.
+"""
+
+import numpy as np
+from OpenGL.GL import *
+
+PASS_BACKGROUND = 0
+PASS_OPAQUE = 1
+PASS_TRANSPARENT = 2
+PASS_OVERLAY = 3
+
+PASS_SHIFT = 60
+STATE_SHIFT = 48
+MODEL_SHIFT = 32
+DEPTH_BITS = 32
+DEPTH_SCALE = 1000.0
+DEPTH_MAX = (1 << DEPTH_BITS) - 1
+
+
+class RenderState:
+    """یک حالت رندر با توابع ورود و خروج"""
+
+    def __init__(self, name, enter=None, leave=None):
+        self.name = name
+        self.enter = enter
+        self.leave = leave
+
+
+class RenderQueue:
+    """صف فرمان‌های رسم یک فریم"""
+
+    def __init__(self):
+        self.states = []
+        self.state_ids = {}
+        self.models = []
+        self.instanced = []
+        self.model_ids = {}
+        self.batches = []
+        self.calls = []
+        self.pass_hooks = {}
+        self.stats = {'commands': 0, 'draw_calls': 0, 'state_changes': 0, 'model_changes': 0}
+        self.partial_stats = None
+
+    def register_state(self, name, enter=None, leave=None):
+        """ثبت حالت رندر؛ شناسه آن را برمی‌گرداند"""
+        self.state_ids[name] = len(self.states)
+        self.states.append(RenderState(name, enter, leave))
+        return self.state_ids[name]
+
+    def register_model(self, name, draw, draw_instanced=None):
+        """ثبت مدل؛ draw(colored) مدل را در مبدأ مختصات محلی رسم می‌کند
+
+        colored یعنی رنگ نمونه پیش از رسم با glColor تنظیم شده و مدل نباید رنگ خود را اعمال کند.
+
+        draw_instanced (اختیاری) تمام نمونه‌های پیاپی یک دسته را با یک فراخوانی رسم می‌کند:
+        draw_instanced(positions, rotations, scales, colors)
+        """
+        self.model_ids[name] = len(self.models)
+        self.models.append(draw)
+        self.instanced.append(draw_instanced)
+        return self.model_ids[name]
+
+    def register_pass_hook(self, render_pass, hook):
+        """hook در هر flush پیش از اولین فرمان pass (یا در پایان flush اگر فرمانی نباشد)
+        و پس از خروج از state فعلی اجرا می‌شود؛ مثلاً تغییر render target پیش از HUD"""
+        self.pass_hooks[render_pass] = hook
+
+    def begin_frame(self):
+        """شروع ثبت فرمان‌های فریم جدید"""
+        self.batches.clear()
+        self.calls.clear()
+
+    def submit(self, render_pass, state, model, positions, rotations=None, scales=None, colors=None):
+        """ثبت دسته‌ای نمونه‌های یک مدل؛ آرایه‌ها (n, 3) و scales (n,)"""
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        if len(positions) == 0:
+            return
+        self.batches.append((render_pass, self.state_ids[state], self.model_ids[model],
+                             positions, rotations, scales, colors))
+
+    def submit_call(self, render_pass, state, draw, depth=0.0):
+        """ثبت یک فرمان دلخواه (مثل متن HUD یا ابر نقاط)"""
+        self.calls.append((render_pass, self.state_ids[state], draw, depth))
+
+    def build_keys(self, render_pass, state, model, depth):
+        """کلیدهای مرتب‌سازی برای آرایه عمق"""
+        depth = np.clip(depth * DEPTH_SCALE, 0, DEPTH_MAX).astype(np.int64)
+        base = np.int64(render_pass) << PASS_SHIFT
+        if render_pass == PASS_TRANSPARENT:
+            # از عقب به جلو: عمق معکوس پیش از state و مدل
+            return base | ((DEPTH_MAX - depth) << (PASS_SHIFT - DEPTH_BITS)) | \
+                (np.int64(state) << 16) | np.int64(model)
+        return base | (np.int64(state) << STATE_SHIFT) | (np.int64(model) << MODEL_SHIFT) | depth
+
+    def flush(self, camera_pos, final=True):
+        """مرتب‌سازی و اجرای تمام فرمان‌ها؛ آمار فریم را برمی‌گرداند
+
+        final=False یک بخش از فریم (مثلاً یک viewport) را اجرا می‌کند: hookهای pass اجرا
+        نمی‌شوند و آمار تا flush نهایی فریم جمع می‌شود.
+        """
+        camera = np.asarray(camera_pos, dtype=np.float32)
+        keys, batch_ids, rows = [], [], []
+        for batch_id, (render_pass, state, model, positions, _, _, _) in enumerate(self.batches):
+            depth = np.linalg.norm(positions - camera, axis=1)
+            keys.append(self.build_keys(render_pass, state, model, depth))
+            batch_ids.append(np.full(len(positions), batch_id))
+            rows.append(np.arange(len(positions)))
+
+        # فرمان‌های دلخواه با شناسه دسته منفی
+        for call_id, (render_pass, state, _, depth) in enumerate(self.calls):
+            keys.append(self.build_keys(render_pass, state, 0, np.array([depth], dtype=np.float32)))
+            batch_ids.append(np.array([-1 - call_id]))
+            rows.append(np.array([call_id]))
+
+        stats = self.partial_stats or {'commands': 0, 'draw_calls': 0, 'state_changes': 0, 'model_changes': 0}
+        if keys:
+            keys = np.concatenate(keys)
+            # مرتب‌سازی پایدار: فرمان‌های هم‌کلید به ترتیب ثبت اجرا می‌شوند
+            order = np.argsort(keys, kind='stable')
+            self.execute(np.concatenate(batch_ids)[order], np.concatenate(rows)[order], stats, final)
+        elif final:
+            self.run_pass_hooks(None)
+        if final:
+            self.stats = stats
+            self.partial_stats = None
+        else:
+            self.partial_stats = stats
+        self.begin_frame()
+        return stats
+
+    def execute(self, batch_ids, rows, stats, hooks=True):
+        """اجرای فرمان‌های مرتب‌شده با حداقل تغییر state و مدل"""
+        current_state = None
+        current_model = None
+        batch_lists = {}
+        pending_hooks = sorted(self.pass_hooks) if hooks else []
+
+        # نمونه‌های پیاپی یک دسته یک run را تشکیل می‌دهند
+        run_starts = np.flatnonzero(np.diff(batch_ids, prepend=batch_ids[0] - 1))
+        run_ends = np.append(run_starts[1:], len(batch_ids))
+        batch_ids = batch_ids.tolist()
+        row_list = rows.tolist()
+
+        for start, end in zip(run_starts.tolist(), run_ends.tolist()):
+            batch_id = batch_ids[start]
+            if batch_id < 0:
+                render_pass, state, draw, _ = self.calls[-1 - batch_id]
+                model = None
+            else:
+                render_pass, state, model = self.batches[batch_id][:3]
+
+            if pending_hooks and pending_hooks[0] <= render_pass:
+                if current_state is not None and self.states[current_state].leave:
+                    self.states[current_state].leave()
+                current_state = None
+                pending_hooks = self.run_pass_hooks(render_pass, pending_hooks)
+
+            if state != current_state:
+                if current_state is not None and self.states[current_state].leave:
+                    self.states[current_state].leave()
+                if self.states[state].enter:
+                    self.states[state].enter()
+                current_state = state
+                current_model = None
+                stats['state_changes'] += 1
+
+            stats['commands'] += end - start
+            if batch_id < 0:
+                for _ in range(start, end):
+                    draw()
+                stats['draw_calls'] += end - start
+                continue
+
+            if model != current_model:
+                current_model = model
+                stats['model_changes'] += 1
+
+            _, _, _, positions, rotations, scales, colors = self.batches[batch_id]
+            draw_instanced = self.instanced[model]
+            if draw_instanced is not None:
+                # یک فراخوانی برای کل run به ترتیب مرتب‌شده
+                run_rows = rows[start:end]
+                draw_instanced(*(None if values is None else np.asarray(values)[run_rows]
+                                 for values in (positions, rotations, scales, colors)))
+                stats['draw_calls'] += 1
+                continue
+
+            # تبدیل آرایه‌های دسته به لیست فقط یک بار
+            if batch_id not in batch_lists:
+                batch_lists[batch_id] = tuple(
+                    None if values is None else np.asarray(values).tolist()
+                    for values in (positions, rotations, scales, colors)
+                )
+            positions, rotations, scales, colors = batch_lists[batch_id]
+            draw = self.models[model]
+            colored = colors is not None
+
+            for row in row_list[start:end]:
+                glPushMatrix()
+                x, y, z = positions[row]
+                glTranslatef(x, y, z)
+                if rotations is not None:
+                    rx, ry, rz = rotations[row]
+                    glRotatef(rx, 1, 0, 0)
+                    glRotatef(ry, 0, 1, 0)
+                    glRotatef(rz, 0, 0, 1)
+                if scales is not None:
+                    scale = scales[row]
+                    glScalef(scale, scale, scale)
+                if colors is not None:
+                    r, g, b = colors[row]
+                    glColor3f(r, g, b)
+                draw(colored)
+                glPopMatrix()
+            stats['draw_calls'] += end - start
+
+        if current_state is not None and self.states[current_state].leave:
+            self.states[current_state].leave()
+        self.run_pass_hooks(None, pending_hooks)
+
+    def run_pass_hooks(self, up_to_pass, pending=None):
+        """اجرای hookهای passهای تا up_to_pass (None: همه)؛ hookهای باقی‌مانده را برمی‌گرداند"""
+        pending = sorted(self.pass_hooks) if pending is None else pending
+        while pending and (up_to_pass is None or pending[0] <= up_to_pass):
+            self.pass_hooks[pending.pop(0)]()
+        return pending
+
+    def report_lines(self, icons=True):
+        """خطوط گزارش آمار آخرین فریم (icons=False برای فونت‌های فقط ASCII)"""
+        stats = self.stats
+        header = f"Draw calls: {stats['draw_calls']} ({stats['commands']} commands)"
+        return [
+            f"🎨 {header}" if icons else header,
+            f"  state changes: {stats['state_changes']}, model changes: {stats['model_changes']}"
+        ]
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Resource Manager - بارگذاری ناهمگام منابع با شمارش ارجاع
+ACTOn Game Studio
+"""
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ResourceHandle:
+    """دستگیره یک منبع در حال بارگذاری یا آماده"""
+
+    PENDING = "PENDING"      # در صف ThreadPool
+    UPLOADING = "UPLOADING"  # منتظر ارسال به GPU روی نخ رندر
+    READY = "READY"
+    FAILED = "FAILED"
+    UNLOADED = "UNLOADED"
+
+    def __init__(self, name, upload=None, unload=None, on_ready=None):
+        self.name = name
+        self.upload = upload
+        self.unload = unload
+        self.on_ready = on_ready
+        self.state = self.PENDING
+        self.value = None
+        self.error = None
+        self.refcount = 1
+        self.future = None
+        self.event = threading.Event()
+
+    def done(self):
+        """آیا بارگذاری (موفق یا ناموفق) تمام شده است؟"""
+        return self.state in (self.READY, self.FAILED, self.UNLOADED)
+
+    def ready(self):
+        """آیا منبع قابل استفاده است؟"""
+        return self.state == self.READY
+
+    def result(self, timeout=None):
+        """منتظر ماندن برای منبع؛ فقط از نخ‌های غیر از نخ رندر فراخوانی شود"""
+        if not self.event.wait(timeout):
+            raise TimeoutError(f"Resource '{self.name}' not ready")
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class ResourceManager:
+    """زمان‌بندی تولید منابع روی ThreadPool و ارسال بودجه‌بندی‌شده به GPU در هر فریم"""
+
+    def __init__(self, max_workers=2, upload_budget_ms=4.0):
+        self.upload_budget = upload_budget_ms / 1000.0
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="resource")
+        self.handles = {}
+        self.uploads = deque()  # دستگیره‌هایی که منتظر نخ رندر هستند
+        self.unloads = deque()
+        self.lock = threading.Lock()
+
+    def load(self, name, loader, upload=None, unload=None, on_ready=None):
+        """شروع بارگذاری یک منبع؛ اگر از قبل وجود داشته باشد فقط ارجاع آن افزایش می‌یابد
+
+        loader روی نخ پس‌زمینه، و upload، on_ready و unload روی نخ رندر اجرا می‌شوند.
+        """
+        with self.lock:
+            handle = self.handles.get(name)
+            if handle is not None and handle.state != ResourceHandle.UNLOADED:
+                handle.refcount += 1
+                return handle
+
+            handle = ResourceHandle(name, upload, unload, on_ready)
+            self.handles[name] = handle
+
+        handle.future = self.executor.submit(self._run_loader, handle, loader)
+        return handle
+
+    def _run_loader(self, handle, loader):
+        """اجرای loader روی نخ پس‌زمینه"""
+        try:
+            handle.value = loader()
+        except Exception as e:
+            handle.error = e
+        with self.lock:
+            handle.state = ResourceHandle.UPLOADING
+            self.uploads.append(handle)
+
+    def process_uploads(self):
+        """اجرای کارهای نخ رندر در محدوده بودجه زمانی فریم؛ تعداد کارهای انجام‌شده را برمی‌گرداند"""
+        start = time.perf_counter()
+        processed = 0
+
+        while self.unloads:
+            self._finish_unload(self.unloads.popleft())
+
+        while True:
+            with self.lock:
+                if not self.uploads:
+                    break
+                handle = self.uploads.popleft()
+
+            self._finish_upload(handle)
+            processed += 1
+            if time.perf_counter() - start >= self.upload_budget:
+                break
+        return processed
+
+    def _finish_upload(self, handle):
+        """ارسال به GPU و اعلام آماده بودن منبع"""
+        if handle.error is None:
+            try:
+                if handle.upload is not None:
+                    handle.value = handle.upload(handle.value)
+                if handle.on_ready is not None:
+                    handle.on_ready(handle.value)
+            except Exception as e:
+                handle.error = e
+
+        if handle.error is not None:
+            handle.state = ResourceHandle.FAILED
+            print(f"⚠️ Could not load resource '{handle.name}': {handle.error}")
+        else:
+            handle.state = ResourceHandle.READY
+        handle.event.set()
+
+        # منبعی که پیش از آماده شدن آزاد شده
+        if handle.refcount <= 0:
+            self.unloads.append(handle)
+
+    def _finish_unload(self, handle):
+        """آزادسازی منبع روی نخ رندر"""
+        with self.lock:
+            # پیش از این فریم دوباره ارجاع گرفته شده (مثلاً مدل مشترک دو مرحله)
+            if handle.refcount > 0 or handle.state == ResourceHandle.UNLOADED:
+                return
+        if handle.state == ResourceHandle.READY and handle.unload is not None:
+            try:
+                handle.unload(handle.value)
+            except Exception as e:
+                print(f"⚠️ Could not unload resource '{handle.name}': {e}")
+        handle.state = ResourceHandle.UNLOADED
+        handle.value = None
+        with self.lock:
+            if self.handles.get(handle.name) is handle:
+                del self.handles[handle.name]
+
+    def acquire(self, name):
+        """افزایش ارجاع یک منبع موجود"""
+        with self.lock:
+            handle = self.handles.get(name)
+            if handle is not None:
+                handle.refcount += 1
+            return handle
+
+    def release(self, name):
+        """کاهش ارجاع؛ با رسیدن به صفر، منبع در فریم بعد آزاد می‌شود"""
+        with self.lock:
+            handle = self.handles.get(name)
+            if handle is None:
+                return
+            handle.refcount -= 1
+            if handle.refcount > 0 or not handle.done():
+                return
+        self.unloads.append(handle)
+
+    def get(self, name):
+        """مقدار منبع آماده یا None"""
+        handle = self.handles.get(name)
+        if handle is not None and handle.ready():
+            return handle.value
+        return None
+
+    def all_ready(self, names):
+        """آیا همه منابع نام‌برده آماده‌اند؟"""
+        return all(name in self.handles and self.handles[name].ready() for name in names)
+
+    def progress(self):
+        """نسبت منابع تمام‌شده به کل منابع"""
+        with self.lock:
+            handles = list(self.handles.values())
+        if not handles:
+            return 1.0
+        return sum(1 for handle in handles if handle.done()) / len(handles)
+
+    def shutdown(self):
+        """توقف ThreadPool"""
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+System Scheduler - اجرای سیستم‌های شبیه‌سازی بر اساس مؤلفه‌هایی که می‌خوانند و می‌نویسند
+ACTOn Game Studio
+
+هر سیستم منابعی را که می‌خواند و می‌نویسد اعلام می‌کند؛ منبع یا یک مؤلفه ('enemies.pos')
+یا کل یک pool ('enemies'، برای تولید و حذف) یا یک وضعیت سراسری ('fuel') است.
+سیستمی که با سیستم‌های قبلی خود تداخل ندارد، هم‌زمان با آن‌ها روی ThreadPool اجرا می‌شود.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+def resources_overlap(first, second):
+    """آیا دو منبع یکسان هستند یا یکی بخشی از دیگری است؟ ('enemies' و 'enemies.pos')"""
+    return first == second or first.startswith(second + '.') or second.startswith(first + '.')
+
+
+class System:
+    """یک سیستم شبیه‌سازی همراه با منابع خواندنی و نوشتنی آن"""
+
+    def __init__(self, name, update, reads=(), writes=()):
+        self.name = name
+        self.update = update
+        self.reads = tuple(reads)
+        self.writes = tuple(writes)
+        self.last_ms = 0.0
+        self.average_ms = 0.0
+
+    def conflicts_with(self, other):
+        """تداخل نوشتن-خواندن یا نوشتن-نوشتن با سیستم دیگر"""
+        for written in self.writes:
+            if any(resources_overlap(written, used) for used in other.reads + other.writes):
+                return True
+        for read in self.reads:
+            if any(resources_overlap(read, written) for written in other.writes):
+                return True
+        return False
+
+
+class SystemScheduler:
+    """زمان‌بندی سیستم‌ها به صورت گراف وابستگی و اندازه‌گیری زمان هر سیستم"""
+
+    def __init__(self, max_workers=4, parallel=True, smoothing=0.1):
+        self.max_workers = max_workers
+        self.parallel = parallel and max_workers > 1
+        self.smoothing = smoothing
+        self.systems = []
+        self.dependencies = {}  # name -> سیستم‌های قبلی که باید تمام شوند
+        self.executor = None
+        self.last_tick_ms = 0.0
+
+    def add(self, name, update, reads=(), writes=()):
+        """افزودن سیستم؛ ترتیب افزودن ترتیب منطقی اجرای سیستم‌های متداخل است"""
+        system = System(name, update, reads, writes)
+        self.dependencies[name] = [earlier for earlier in self.systems if system.conflicts_with(earlier)]
+        self.systems.append(system)
+        return system
+
+    def stages(self):
+        """مراحل موازی: سیستم‌های هر مرحله با هم تداخل ندارند (برای گزارش)"""
+        level = {}
+        for system in self.systems:
+            level[system.name] = 1 + max((level[dep.name] for dep in self.dependencies[system.name]),
+                                         default=-1)
+        grouped = {}
+        for system in self.systems:
+            grouped.setdefault(level[system.name], []).append(system.name)
+        return [grouped[index] for index in sorted(grouped)]
+
+    def run(self, delta_time):
+        """اجرای یک تیک تمام سیستم‌ها"""
+        start = time.perf_counter()
+        if not self.parallel:
+            for system in self.systems:
+                self.run_system(system, delta_time)
+        else:
+            self.run_parallel(delta_time)
+        self.last_tick_ms = (time.perf_counter() - start) * 1000
+
+    def run_parallel(self, delta_time):
+        """ارسال هر سیستم به ThreadPool؛ هر کار فقط منتظر کارهای زودتر ارسال‌شده می‌ماند
+        و چون صف FIFO است، آن کارها قبلاً نخ گرفته‌اند (بن‌بست رخ نمی‌دهد)"""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="system")
+
+        futures = {}
+        for system in self.systems:
+            dependencies = [futures[dep.name] for dep in self.dependencies[system.name]]
+            futures[system.name] = self.executor.submit(self.run_after, dependencies, system, delta_time)
+
+        done, _ = wait(futures.values())
+        for future in done:
+            future.result()  # انتشار خطای سیستم‌ها به نخ اصلی
+
+    def run_after(self, dependencies, system, delta_time):
+        """اجرای سیستم پس از پایان وابستگی‌ها"""
+        for dependency in dependencies:
+            dependency.result()
+        self.run_system(system, delta_time)
+
+    def run_system(self, system, delta_time):
+        """اجرای یک سیستم و به‌روزرسانی زمان آن"""
+        start = time.perf_counter()
+        system.update(delta_time)
+        system.last_ms = (time.perf_counter() - start) * 1000
+        system.average_ms += (system.last_ms - system.average_ms) * self.smoothing
+
+    def timings(self):
+        """میانگین زمان هر سیستم بر حسب میلی‌ثانیه"""
+        return {system.name: system.average_ms for system in self.systems}
+
+    def report_lines(self, icons=True):
+        """خطوط گزارش زمان سیستم‌ها برای HUD یا کنسول (icons=False برای فونت‌های فقط ASCII)"""
+        mode = f"{self.max_workers} threads" if self.parallel else "serial"
+        header = f"Systems: {self.last_tick_ms:.2f} ms/tick ({mode})"
+        lines = [f"⚙️ {header}" if icons else header]
+        for system in self.systems:
+            lines.append(f"  {system.name}: {system.average_ms:.2f} ms")
+        return lines
+
+    def shutdown(self):
+        """توقف ThreadPool"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Shader Renderer - مسیر رندر GLSL (VAO، UBO و رسم instanced) با نورپردازی هر رأس
+ACTOn Game Studio
+
+شیدرها GLSL 330 core هستند و صحنه فقط از اشیای پروفایل core استفاده می‌کند؛ HUD و منوها
+همچنان با خط لوله ثابت رسم می‌شوند. نورپردازی معادل GL_LIGHT0 موتور است
+(نور نقطه‌ای در فضای چشم، ambient سراسری + ambient نور + diffuse).
+ذرات با ParticleRenderer از پارامترهای تولید در شیدر رأس جابه‌جا می‌شوند.
+"""
+
+import ctypes
+import math
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GL import shaders
+
+# بلوک مشترک صحنه و نورپردازی برای تمام شیدرهای رأس
+SCENE_BLOCK = """
+#version 330 core
+layout(std140) uniform Scene {
+    mat4 projection;
+    mat4 view;
+    vec4 light_position;   // در فضای چشم
+    vec4 light_ambient;
+    vec4 light_diffuse;
+    vec4 scene_ambient;
+};
+
+vec3 shade(vec4 eye, vec3 normal, vec3 color) {
+    vec3 to_light = normalize(light_position.xyz - eye.xyz);
+    float diffuse = abs(dot(normal, to_light));  // دوطرفه: جهت رأس‌های مدل‌ها یکسان نیست
+    return color * (scene_ambient.rgb + light_ambient.rgb + light_diffuse.rgb * diffuse);
+}
+"""
+
+VERTEX_SHADER = SCENE_BLOCK + """
+layout(location = 0) in vec3 vertex_position;
+layout(location = 1) in vec3 vertex_normal;
+layout(location = 2) in vec3 instance_offset;
+layout(location = 3) in vec3 instance_rotation;  // درجه، به ترتیب glRotatef روی x، y و z
+layout(location = 4) in float instance_scale;
+layout(location = 5) in vec3 instance_color;
+
+out vec3 lit_color;
+
+mat3 rotation_x(float a) { float c = cos(a), s = sin(a); return mat3(1, 0, 0, 0, c, s, 0, -s, c); }
+mat3 rotation_y(float a) { float c = cos(a), s = sin(a); return mat3(c, 0, -s, 0, 1, 0, s, 0, c); }
+mat3 rotation_z(float a) { float c = cos(a), s = sin(a); return mat3(c, s, 0, -s, c, 0, 0, 0, 1); }
+
+void main() {
+    vec3 angles = radians(instance_rotation);
+    mat3 rotation = rotation_x(angles.x) * rotation_y(angles.y) * rotation_z(angles.z);
+    vec4 eye = view * vec4(instance_offset + rotation * (vertex_position * instance_scale), 1.0);
+
+    vec3 normal = normalize(mat3(view) * rotation * vertex_normal);
+    lit_color = shade(eye, normal, instance_color);
+    gl_Position = projection * eye;
+}
+"""
+
+# ذرات: موقعیت از پارامترهای تولید و زمان (همان فرمول ParticleSystem.evaluate)
+PARTICLE_VERTEX_SHADER = SCENE_BLOCK + """
+uniform float time;
+
+layout(location = 0) in vec3 vertex_position;
+layout(location = 1) in vec3 vertex_normal;
+layout(location = 2) in vec3 particle_origin;
+layout(location = 3) in vec3 particle_velocity;
+layout(location = 4) in vec3 particle_color;
+layout(location = 5) in float particle_size;
+layout(location = 6) in float particle_born;
+layout(location = 7) in float particle_life;
+layout(location = 8) in float particle_gravity;
+
+out vec3 lit_color;
+
+void main() {
+    float age = time - particle_born;
+    if (age < 0.0 || age >= particle_life) {
+        // ذره مرده: تمام رأس‌ها خارج از حجم دید و مثلث حذف می‌شود
+        lit_color = vec3(0.0);
+        gl_Position = vec4(2.0, 2.0, 2.0, 1.0);
+        return;
+    }
+
+    vec3 center = particle_origin + particle_velocity * age;
+    center.y -= 0.5 * particle_gravity * age * age;
+    vec4 eye = view * vec4(center + vertex_position * particle_size, 1.0);
+    lit_color = shade(eye, normalize(mat3(view) * vertex_normal), particle_color);
+    gl_Position = projection * eye;
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330 core
+in vec3 lit_color;
+out vec4 frag_color;
+
+void main() {
+    frag_color = vec4(lit_color, 1.0);
+}
+"""
+
+SCENE_BINDING = 0
+INSTANCE_FLOATS = 10  # offset(3) rotation(3) scale(1) color(3)
+PARTICLE_FLOATS = 13  # origin(3) velocity(3) color(3) size(1) born(1) life(1) gravity(1)
+
+
+def flat_mesh(vertices, faces):
+    """تبدیل رأس‌ها و وجه‌ها به لیست مثلث با نرمال هر وجه (n, 6)"""
+    vertices = np.asarray(vertices, dtype=np.float32)
+    triangles = vertices[np.asarray(faces, dtype=np.int64)]  # (faces, 3, 3)
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-9)
+    normals = np.repeat(normals[:, None, :], 3, axis=1)
+    return np.concatenate([triangles, normals], axis=2).reshape(-1, 6).astype(np.float32)
+
+
+def sphere_mesh(radius, slices, stacks):
+    """کره UV به صورت لیست مثلث (n, 6)"""
+    theta = np.linspace(0, math.pi, stacks + 1)
+    phi = np.linspace(0, 2 * math.pi, slices + 1)
+    grid = np.stack([
+        np.outer(np.sin(theta), np.cos(phi)),
+        np.outer(np.sin(theta), np.sin(phi)),
+        np.repeat(np.cos(theta)[:, None], slices + 1, axis=1)
+    ], axis=-1)  # (stacks+1, slices+1, 3)
+
+    a, b = grid[:-1, :-1], grid[1:, :-1]
+    c, d = grid[1:, 1:], grid[:-1, 1:]
+    normals = np.concatenate([np.stack([a, b, c], 2), np.stack([a, c, d], 2)]).reshape(-1, 3)
+    return np.concatenate([normals * radius, normals], axis=1).astype(np.float32)
+
+
+class ShaderMesh:
+    """VAO یک مدل همراه با VBO رأس‌ها"""
+
+    def __init__(self, vao, vbo, vertex_count, color):
+        self.vao = vao
+        self.vbo = vbo
+        self.vertex_count = vertex_count
+        self.color = np.asarray(color, dtype=np.float32)
+
+
+class ShaderRenderer:
+    """برنامه شیدر، UBO صحنه و رسم instanced مدل‌ها"""
+
+    def __init__(self, light_pos, light_ambient=(0.2, 0.2, 0.2), light_diffuse=(0.8, 0.8, 0.8),
+                 scene_ambient=(0.2, 0.2, 0.2)):
+        self.light = np.zeros((4, 4), dtype=np.float32)
+        self.light[0, :3] = light_pos
+        self.light[0, 3] = 1.0
+        self.light[1, :3] = light_ambient
+        self.light[2, :3] = light_diffuse
+        self.light[3, :3] = scene_ambient
+
+        self.program = self.create_program(VERTEX_SHADER)
+
+        self.scene_ubo = glGenBuffers(1)
+        glBindBuffer(GL_UNIFORM_BUFFER, self.scene_ubo)
+        glBufferData(GL_UNIFORM_BUFFER, 2 * 64 + self.light.nbytes, None, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+
+        self.instance_vbo = glGenBuffers(1)
+        self.instance_capacity = 0
+        self.meshes = []
+
+    @staticmethod
+    def create_program(vertex_shader):
+        """کامپایل شیدر رأس با شیدر fragment مشترک و اتصال بلوک Scene"""
+        program = shaders.compileProgram(
+            shaders.compileShader(vertex_shader, GL_VERTEX_SHADER),
+            shaders.compileShader(FRAGMENT_SHADER, GL_FRAGMENT_SHADER),
+            validate=False
+        )
+        block = glGetUniformBlockIndex(program, "Scene")
+        glUniformBlockBinding(program, block, SCENE_BINDING)
+        return program
+
+    @staticmethod
+    def supported():
+        """آیا context فعلی GLSL 3.30 و VAO دارد؟"""
+        try:
+            version = glGetString(GL_SHADING_LANGUAGE_VERSION).decode().split()[0]
+            major, minor = (int(part) for part in version.split('.')[:2])
+            return (major, minor) >= (3, 30) and bool(glGenVertexArrays)
+        except Exception:
+            return False
+
+    def create_mesh(self, vertex_data, color):
+        """ساخت VAO برای داده رأس (n, 6) و اتصال ویژگی‌های نمونه"""
+        vao = glGenVertexArrays(1)
+        glBindVertexArray(vao)
+
+        vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertex_data.nbytes, vertex_data, GL_STATIC_DRAW)
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 24, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(1)
+        glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 24, ctypes.c_void_p(12))
+
+        # ویژگی‌های هر نمونه از بافر مشترک نمونه‌ها
+        glBindBuffer(GL_ARRAY_BUFFER, self.instance_vbo)
+        stride = INSTANCE_FLOATS * 4
+        for location, size, offset in ((2, 3, 0), (3, 3, 12), (4, 1, 24), (5, 3, 28)):
+            glEnableVertexAttribArray(location)
+            glVertexAttribPointer(location, size, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(offset))
+            glVertexAttribDivisor(location, 1)
+
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        mesh = ShaderMesh(vao, vbo, len(vertex_data), color)
+        self.meshes.append(mesh)
+        return mesh
+
+    def create_model_mesh(self, model):
+        """VAO مدل موتور ({'vertices', 'faces', 'color'}) با نرمال وجه‌ها"""
+        return self.create_mesh(flat_mesh(model['vertices'], model['faces']), model['color'])
+
+    def delete_mesh(self, mesh):
+        """آزادسازی VAO و VBO مدل"""
+        glDeleteVertexArrays(1, [mesh.vao])
+        glDeleteBuffers(1, [mesh.vbo])
+        if mesh in self.meshes:
+            self.meshes.remove(mesh)
+
+    def begin(self):
+        """فعال‌سازی برنامه و به‌روزرسانی UBO با ماتریس‌های فعلی دوربین"""
+        self.upload_scene()
+        glUseProgram(self.program)
+
+    def upload_scene(self):
+        """به‌روزرسانی UBO صحنه با ماتریس‌های فعلی دوربین"""
+        projection = np.asarray(glGetFloatv(GL_PROJECTION_MATRIX), dtype=np.float32)
+        view = np.asarray(glGetFloatv(GL_MODELVIEW_MATRIX), dtype=np.float32)
+        scene = np.concatenate([projection.ravel(), view.ravel(), self.light.ravel()])
+
+        glBindBuffer(GL_UNIFORM_BUFFER, self.scene_ubo)
+        glBufferSubData(GL_UNIFORM_BUFFER, 0, scene.nbytes, scene)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+        glBindBufferBase(GL_UNIFORM_BUFFER, SCENE_BINDING, self.scene_ubo)
+
+    def end(self):
+        """بازگشت به خط لوله ثابت"""
+        glBindVertexArray(0)
+        glUseProgram(0)
+
+    def draw_instances(self, mesh, positions, rotations=None, scales=None, colors=None):
+        """رسم تمام نمونه‌های یک مدل با یک glDrawArraysInstanced"""
+        count = len(positions)
+        instances = np.empty((count, INSTANCE_FLOATS), dtype=np.float32)
+        instances[:, 0:3] = positions
+        instances[:, 3:6] = 0 if rotations is None else rotations
+        instances[:, 6] = 1 if scales is None else scales
+        instances[:, 7:10] = mesh.color if colors is None else colors
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.instance_vbo)
+        if count > self.instance_capacity:
+            self.instance_capacity = max(count, self.instance_capacity * 2, 256)
+            glBufferData(GL_ARRAY_BUFFER, self.instance_capacity * INSTANCE_FLOATS * 4, None, GL_STREAM_DRAW)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, instances.nbytes, instances)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+        glBindVertexArray(mesh.vao)
+        glDrawArraysInstanced(GL_TRIANGLES, 0, mesh.vertex_count, count)
+
+    def shutdown(self):
+        """آزادسازی تمام اشیای GL"""
+        for mesh in list(self.meshes):
+            self.delete_mesh(mesh)
+        glDeleteBuffers(2, [self.scene_ubo, self.instance_vbo])
+        glDeleteProgram(self.program)
+
+
+class ParticleRenderer:
+    """مسیر GPU ذرات: پارامترهای تولید در یک VBO و محاسبه موقعیت در شیدر رأس
+
+    بافر آینه حلقه ParticleSystem است؛ در هر فریم فقط ردیف‌هایی که از آخرین همگام‌سازی
+    نوشته شده‌اند بارگذاری می‌شوند و به‌روزرسانی ذرات روی CPU فقط جلو بردن ساعت است.
+    """
+
+    def __init__(self, shader, vertex_data):
+        self.shader = shader
+        self.program = shader.create_program(PARTICLE_VERTEX_SHADER)
+        self.time_location = glGetUniformLocation(self.program, "time")
+
+        self.vao = glGenVertexArrays(1)
+        glBindVertexArray(self.vao)
+        self.vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertex_data.nbytes, vertex_data, GL_STATIC_DRAW)
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 24, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(1)
+        glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 24, ctypes.c_void_p(12))
+
+        self.particle_vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.particle_vbo)
+        stride = PARTICLE_FLOATS * 4
+        for location, size, offset in ((2, 3, 0), (3, 3, 12), (4, 3, 24), (5, 1, 36), (6, 1, 40), (7, 1, 44),
+                                       (8, 1, 48)):
+            glEnableVertexAttribArray(location)
+            glVertexAttribPointer(location, size, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(offset))
+            glVertexAttribDivisor(location, 1)
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+        self.vertex_count = len(vertex_data)
+        self.capacity = 0
+        self.synced = 0
+        self.resets = None
+        self.uploaded_bytes = 0
+
+    def set_mesh(self, vertex_data):
+        """جایگزینی مش ذره (مثلاً با تفکیک سطح کیفیت جدید)"""
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertex_data.nbytes, vertex_data, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.vertex_count = len(vertex_data)
+
+    def pack(self, pool, start, end):
+        """ردیف‌های [start, end) حلقه به صورت درهم (n, PARTICLE_FLOATS)"""
+        data = np.empty((end - start, PARTICLE_FLOATS), dtype=np.float32)
+        data[:, 0:3] = pool['origin'][start:end]
+        data[:, 3:6] = pool['vel'][start:end]
+        data[:, 6:9] = pool['color'][start:end]
+        data[:, 9] = pool['size'][start:end]
+        data[:, 10] = pool['born'][start:end]
+        data[:, 11] = pool['life'][start:end]
+        data[:, 12] = pool['gravity'][start:end]
+        return data
+
+    def sync(self, system):
+        """بارگذاری ردیف‌هایی از حلقه که از آخرین همگام‌سازی نوشته شده‌اند"""
+        capacity = system.capacity
+        pending = system.emitted - self.synced
+        glBindBuffer(GL_ARRAY_BUFFER, self.particle_vbo)
+        if system.resets != self.resets or capacity != self.capacity:
+            # حلقه جدید یا پاک‌شده: تخصیص و بارگذاری کامل
+            self.capacity = capacity
+            self.resets = system.resets
+            glBufferData(GL_ARRAY_BUFFER, capacity * PARTICLE_FLOATS * 4, None, GL_DYNAMIC_DRAW)
+            ranges = [(0, capacity)]
+        elif pending <= 0:
+            ranges = []
+        elif pending >= capacity:
+            ranges = [(0, capacity)]
+        else:
+            start = self.synced % capacity
+            end = start + pending
+            ranges = [(start, min(end, capacity))] + ([(0, end - capacity)] if end > capacity else [])
+
+        for start, end in ranges:
+            data = self.pack(system.pool, start, end)
+            glBufferSubData(GL_ARRAY_BUFFER, start * PARTICLE_FLOATS * 4, data.nbytes, data)
+            self.uploaded_bytes += data.nbytes
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.synced = system.emitted
+
+    def begin(self):
+        """فعال‌سازی برنامه ذرات با UBO صحنه"""
+        self.shader.upload_scene()
+        glUseProgram(self.program)
+
+    def end(self):
+        glBindVertexArray(0)
+        glUseProgram(0)
+
+    def draw(self, system):
+        """همگام‌سازی و رسم تمام ردیف‌های استفاده‌شده حلقه با یک glDrawArraysInstanced"""
+        self.sync(system)
+        count = min(system.emitted, system.capacity)
+        if count == 0:
+            return
+        glUniform1f(self.time_location, np.float32(system.time))
+        glBindVertexArray(self.vao)
+        glDrawArraysInstanced(GL_TRIANGLES, 0, self.vertex_count, count)
+
+    def shutdown(self):
+        """آزادسازی اشیای GL"""
+        glDeleteVertexArrays(1, [self.vao])
+        glDeleteBuffers(2, [self.vbo, self.particle_vbo])
+        glDeleteProgram(self.program)
@@ -0,0 +1,616 @@
+#!/usr/bin/env python3
+"""
+Simulation - منطق شبیه‌سازی بازی بدون وابستگی به OpenGL
+ACTOn Game Studio
+
+تمام موجودیت‌ها در یک EntityStore نگه داشته می‌شوند و سیستم‌ها روی آرایه‌های مؤلفه کار می‌کنند.
+واحدها بر حسب ثانیه هستند؛ مقادیر قبلی موتور (بر حسب فریم در 60 FPS) در ثابت‌ها تبدیل شده‌اند.
+"""
+
+import time
+import numpy as np
+from entity_store import EntityStore
+from flocking import FlockingController
+from collision import SweptCollider
+from spatial_index import SpatialHashGrid
+from loot import DROP_TABLES, POWERUP_TYPES
+from level_system import LevelManager, ENEMY_TYPES
+from scheduler import SystemScheduler
+from random_service import RandomService
+from game_entities import PlayerShip, ParticleSystem, AsteroidField, TrailEmitter, Vector3, as_array
+
+FRAME = 1 / 60
+
+PLAYER_BOUNDS = (4.0, 3.0)
+HIT_INVULNERABILITY = 1.0
+MAX_LIVES = 5
+WEAPON_BOOST = 1.5  # ضریب سرعت شلیک هر قدرت‌افزایی سلاح
+MAX_WEAPON_RATE = 15.0  # شلیک در ثانیه
+
+ENEMY_HEALTH = 2
+ENEMY_RADIUS = 0.5
+ENEMY_FORWARD_SPEED = 0.1 / FRAME
+ENEMY_MAX_SPEED = 0.06 / FRAME
+ENEMY_SHOT_COOLDOWN = (1.0, 3.0)
+ENEMY_EXIT_Z = 2.0
+
+ASTEROID_COUNT = 20
+
+PLAYER_SHOT_SPEED = -0.3 / FRAME
+ENEMY_SHOT_SPEED = 0.2 / FRAME
+PROJECTILE_RANGE = 20.0
+PLAYER_RADIUS = 0.5
+PICKUP_RADIUS = 1.0
+POWERUP_SPIN = 2.0 / FRAME
+# رهاشده‌ها کمی پخش می‌شوند و بعد به سمت بازیکن (+z) می‌آیند
+PICKUP_DRIFT_SPEED = 3.0
+PICKUP_SCATTER = 1.5
+PICKUP_DAMPING = 2.0
+PICKUP_LIFETIME = 12.0
+PICKUP_EXIT_Z = 3.0
+
+# رد موتور: بازیکن ظاهراً با سرعت دشمنان رو به جلو (-z) پرواز می‌کند
+PLAYER_CRUISE_SPEED = 0.1 / FRAME
+PLAYER_TRAIL = TrailEmitter(rate=40.0, burst=3, offset=(0, -0.1, 0.4), color=(0.2, 0.8, 1.0),
+                            life=(0.2, 0.5), size=(0.03, 0.08))
+ENEMY_TRAIL = TrailEmitter(rate=12.0, burst=2, offset=(0, 0, -0.4), color=(1.0, 0.5, 0.2))
+
+FUEL_BURN = 0.02 / FRAME
+HIT_FUEL_COST = 20
+SCORES = {'enemy': 100, 'asteroid': 50, 'coin': 10}
+
+OWNER_PLAYER = 0
+OWNER_ENEMY = 1
+
+ENEMY_COMPONENTS = {
+    'pos': ((3,), np.float32),
+    'vel': ((3,), np.float32),
+    'rot': ((3,), np.float32),
+    'rot_vel': ((3,), np.float32),
+    'health': ((), np.float32),
+    'type': ((), np.int8),
+    'last_shot': ((), np.float64),
+    'shot_cooldown': ((), np.float32),
+    'trail': ((), np.float32),  # انباشت تولید رد موتور
+}
+
+PROJECTILE_COMPONENTS = {
+    'pos': ((3,), np.float32),
+    'prev': ((3,), np.float32),
+    'vel': ((3,), np.float32),
+    'owner': ((), np.int8),
+    'damage': ((), np.float32),
+}
+
+POWERUP_COMPONENTS = {
+    'pos': ((3,), np.float32),
+    'vel': ((3,), np.float32),
+    'rot': ((3,), np.float32),
+    'type': ((), np.int8),
+    'born': ((), np.float64),
+}
+
+STAR_COMPONENTS = {
+    'pos': ((3,), np.float32),
+    'size': ((), np.float32),
+    'color': ((3,), np.float32),
+}
+
+COIN = POWERUP_TYPES.index('coin')
+# منابع شمارش نابودی در آمار جلسه: نوع‌های دشمن و سیارک
+KILL_SOURCES = ENEMY_TYPES + ('asteroid',)
+ASTEROID_KILL = KILL_SOURCES.index('asteroid')
+
+
+class GalaxySimulation:
+    """دنیای بازی: ذخیره موجودیت‌ها، سیستم‌های به‌روزرسانی و قوانین بازی"""
+
+    def __init__(self, star_count=1000, seed=None, levels_dir=None, workers=1,
+                 particle_capacity=ParticleSystem.CAPACITY, particle_budget=None):
+        # جریان تصادفی جدا برای هر زیرسیستم: سیستم‌ها بر سر rng مشترک صف نمی‌کشند و
+        # هر جریان با همان seed تکرارپذیر است
+        self.random = RandomService(seed)
+        self.enemy_rng = self.random.stream('enemies')
+        self.loot_rng = self.random.stream('loot')
+        self.store = EntityStore()
+        self.enemies = self.store.create_pool('enemies', ENEMY_COMPONENTS, capacity=256)
+        self.asteroid_field = AsteroidField(
+            self.store.create_pool('asteroids', AsteroidField.COMPONENTS),
+            parameters=self.random.batch('asteroids', AsteroidField.SPAWN_LOW, AsteroidField.SPAWN_HIGH)
+        )
+        self.asteroids = self.asteroid_field.pool
+        self.projectiles = self.store.create_pool('projectiles', PROJECTILE_COMPONENTS, capacity=256)
+        self.powerups = self.store.create_pool('powerups', POWERUP_COMPONENTS, capacity=512)
+        self.stars = self.store.create_pool('stars', STAR_COMPONENTS, capacity=star_count)
+        self.particle_system = ParticleSystem(
+            self.store.create_pool('particles', ParticleSystem.COMPONENTS, capacity=particle_capacity),
+            random=self.random.batch('particles', np.zeros(ParticleSystem.RANDOM_COLUMNS),
+                                     np.ones(ParticleSystem.RANDOM_COLUMNS)),
+            capacity=particle_capacity, budget=particle_budget
+        )
+        self.player_trail = np.zeros(1, dtype=np.float32)
+        self.star_count = star_count
+
+        # هوش مصنوعی گروهی؛ سرعت‌ها بر حسب ثانیه هستند و وزن هم‌راستایی متناسب کوچک شده است
+        self.flocking = FlockingController(
+            max_force=0.01 / FRAME ** 2, alignment_weight=0.4 * FRAME,
+            formation='grid', slot_spacing=1.0
+        )
+        # برخورد پیوسته پرتابه‌ها (پرتابه نقطه‌ای)
+        self.collider = SweptCollider(cell_size=2.0, projectile_radius=0.0)
+        # برداشتن رهاشده‌ها با جستجوی شعاعی به جای پیمایش تمام سکه‌ها
+        self.pickup_grid = SpatialHashGrid(cell_size=2 * PICKUP_RADIUS)
+        self.level_manager = LevelManager(levels_dir=levels_dir, rng=self.random.stream('levels'))
+
+        self.player = None
+        self.direction = (0, 0)
+        self.events = []
+        self.reset_state()
+
+        # پیش‌فرض اجرای ترتیبی است: هوش مصنوعی (~40 ms در موج‌های سنگین) یک کار واحد است و بقیه
+        # سیستم‌ها زیر 1 ms هستند، پس ThreadPool چیزی برای هم‌پوشانی ندارد و فقط p95 را بدتر می‌کند.
+        # workers > 1 برای اندازه‌گیری و سیستم‌های سنگین‌تر آینده باقی مانده است
+        self.scheduler = SystemScheduler(max_workers=workers)
+        self.register_systems()
+
+    def register_systems(self):
+        """ثبت سیستم‌ها به ترتیب منطقی همراه با منابعی که می‌خوانند و می‌نویسند
+
+        حرکت و انقضا برای هر pool سیستم جدا دارد تا سیستم‌های poolهای مستقل (سیارک‌ها، ذرات،
+        پرتابه‌ها، رهاشده‌ها، سوخت) هم‌زمان با هوش مصنوعی دشمنان اجرا شوند. شلیک دشمنان پیش از
+        حرکت آن‌ها ثبت شده و از موقعیت ابتدای تیک شلیک می‌کنند.
+        """
+        add = self.scheduler.add
+        add('player', self.update_player, reads=('input',), writes=('player',))
+        add('asteroids', self.asteroid_field.update, writes=('asteroids',))
+        add('particles', self.particle_system.update, writes=('particles',))
+        add('fuel', self.update_fuel, writes=('fuel', 'events'))
+        add('projectile_movement', self.move_projectiles,
+            reads=('projectiles.vel',), writes=('projectiles.pos', 'projectiles.prev'))
+        add('pickup_movement', self.move_pickups, writes=('powerups.pos', 'powerups.vel', 'powerups.rot'))
+        add('pickup_lifetime', self.expire_pickups, reads=('time',), writes=('powerups',))
+        add('firing', self.fire_enemies,
+            reads=('time', 'enemies.pos', 'enemies.shot_cooldown'),
+            writes=('enemies.last_shot', 'projectiles'))
+        add('projectile_lifetime', self.expire_projectiles, writes=('projectiles',))
+        add('ai', self.apply_flocking, reads=('player', 'enemies.pos'), writes=('enemies.vel',))
+        add('enemy_movement', self.move_enemies,
+            reads=('enemies.vel', 'enemies.rot_vel'), writes=('enemies.pos', 'enemies.rot'))
+        add('enemy_lifetime', self.expire_enemies, reads=('enemies.pos',), writes=('enemies',))
+        add('trails', self.emit_trails,
+            reads=('player', 'enemies.pos', 'enemies.vel'), writes=('enemies.trail', 'particles'))
+        add('spawning', self.spawn_entities, reads=('level',), writes=('enemies', 'level', 'events'))
+        add('collision', self.check_collisions,
+            reads=('enemies', 'asteroids', 'projectiles', 'powerups'),
+            writes=('enemies', 'asteroids', 'projectiles', 'powerups', 'particles',
+                    'player', 'score', 'lives', 'fuel', 'events'))
+
+    def reset_state(self):
+        """مقادیر شروع بازی"""
+        self.time = 0.0
+        self.score = 0
+        self.coins = 0
+        self.kills = np.zeros(len(KILL_SOURCES), dtype=np.int64)
+        self.shots_fired = 0
+        self.shots_hit = 0
+        self.fuel_used = 0.0
+        self.level = 1
+        self.lives = 3
+        self.fuel = 100.0
+        self.max_fuel = 100.0
+        self.over = False
+
+    def reset(self, asteroid_count=ASTEROID_COUNT):
+        """ساخت دنیای جدید: بازیکن، ستاره‌ها و سیارک‌های اولیه"""
+        self.store.clear()
+        self.particle_system.reset()
+        self.events.clear()
+        self.reset_state()
+        self.player = PlayerShip()
+        self.create_starfield(self.star_count)
+        self.asteroid_field.reset(asteroid_count)
+
+    # ---------- تولید موجودیت‌ها ----------
+
+    def create_starfield(self, count):
+        """ایجاد زمینه ستاره‌ای"""
+        self.stars.clear()
+        # ستون‌ها: موقعیت (3)، روشنایی، اندازه
+        params = self.random.stream('stars').uniform([-50, -50, -20, 0.3, 0.01], [50, 50, -1, 1.0, 0.1], (count, 5))
+        self.stars.spawn(count, pos=params[:, 0:3], size=params[:, 4],
+                         color=np.repeat(params[:, 3:4], 3, axis=1))
+
+    def spawn_asteroids(self, count=1, positions=None, sizes=None):
+        """افزودن count سیارک به میدان (موقعیت و اندازه تصادفی در صورت عدم تعیین)"""
+        return self.asteroid_field.spawn(count, positions, sizes)
+
+    def spawn_enemies(self, types, positions):
+        """تولید دشمنان با اندیس نوع (در ENEMY_TYPES) و موقعیت (n, 3)"""
+        types = np.asarray(types, dtype=np.int8).reshape(-1)
+        count = len(types)
+        return self.enemies.spawn(
+            count, pos=positions, vel=(0, 0, ENEMY_FORWARD_SPEED),
+            health=ENEMY_HEALTH, type=types, last_shot=0.0,
+            shot_cooldown=self.enemy_rng.uniform(*ENEMY_SHOT_COOLDOWN, count)
+        )
+
+    def spawn_enemy(self, enemy_type=None, pos=None):
+        """تولید یک دشمن"""
+        if enemy_type is None:
+            type_index = self.enemy_rng.integers(len(ENEMY_TYPES))
+        else:
+            type_index = ENEMY_TYPES.index(enemy_type)
+        if pos is None:
+            pos = self.enemy_rng.uniform((-7, -5, -12), (7, 5, -8))
+        return self.spawn_enemies([type_index], [as_array(pos)])
+
+    def spawn_powerup(self, position, power_type):
+        """تولید قدرت‌افزایی"""
+        return self.powerups.spawn(1, pos=as_array(position), type=POWERUP_TYPES.index(power_type),
+                                   born=self.time)
+
+    def drop_loot(self, source, positions):
+        """تاس جدول رهاشدن source (نام منبع در DROP_TABLES) برای نابودشده‌ها در positions"""
+        table = DROP_TABLES.get(source, DROP_TABLES['enemy'])
+        sources, types = table.roll(self.loot_rng, len(positions))
+        count = len(sources)
+        if count == 0:
+            return None
+        # ستون‌ها: سرعت پخش (3)، زاویه اولیه چرخش تا سکه‌ها هم‌فاز نچرخند
+        params = self.loot_rng.uniform((-PICKUP_SCATTER,) * 3 + (0,), (PICKUP_SCATTER,) * 3 + (360,), (count, 4))
+        params[:, 2] += PICKUP_DRIFT_SPEED
+        rows = self.powerups.spawn(count, pos=positions[sources], vel=params[:, :3], type=types, born=self.time)
+        self.powerups['rot'][rows, 1] = params[:, 3]
+        return rows
+
+    def fire_player(self):
+        """شلیک بازیکن به سمت دشمنان (z منفی)؛ در زمان آماده‌باش سلاح None برمی‌گرداند"""
+        if self.player is None or self.over or not self.player.shoot():
+            return None
+        pos = as_array(self.player.position)
+        self.shots_fired += 1
+        return self.projectiles.spawn(1, pos=pos, prev=pos, vel=(0, 0, PLAYER_SHOT_SPEED),
+                                      owner=OWNER_PLAYER, damage=1)
+
+    def load_level(self, level, path=None):
+        """بارگذاری موج‌های یک مرحله"""
+        schedule = self.level_manager.load_level(level, path)
+        self.level = level
+        self.events.append(('level', level))
+        return schedule
+
+    # ---------- سیستم‌ها ----------
+
+    def update(self, delta_time, direction=(0, 0)):
+        """پیشبرد شبیه‌سازی به اندازه delta_time؛ direction جهت حرکت بازیکن (x, y) است"""
+        if self.over:
+            return
+        self.time += delta_time
+        self.direction = direction
+        self.scheduler.run(delta_time)
+
+    def update_player(self, delta_time):
+        """حرکت بازیکن و محدود کردن به مرزهای صفحه"""
+        if self.player is None:
+            return
+        self.player.move(Vector3(self.direction[0], self.direction[1], 0), delta_time)
+        self.player.update(delta_time)
+        position = self.player.position
+        position.x = max(-PLAYER_BOUNDS[0], min(PLAYER_BOUNDS[0], position.x))
+        position.y = max(-PLAYER_BOUNDS[1], min(PLAYER_BOUNDS[1], position.y))
+
+    def apply_flocking(self, delta_time):
+        """سرعت افقی دشمنان با نیروهای جدایی، هم‌راستایی، انسجام و خانه‌های آرایش حول بازیکن"""
+        if self.player is None or not len(self.enemies):
+            return
+        positions = self.enemies['pos']
+        velocities = self.enemies['vel']
+
+        # خانه‌های آرایش در صفحه بازیکن؛ حرکت رو به جلو (z) دست نمی‌خورد
+        targets = self.flocking.formation_slots(len(positions), as_array(self.player.position))
+        targets[:, 2] = positions[:, 2]
+
+        acceleration = self.flocking.steer(positions, velocities, targets)
+        planar = velocities[:, :2] + acceleration[:, :2] * delta_time
+        velocities[:, :2] = self.flocking.limit(planar, ENEMY_MAX_SPEED)
+
+    def move_enemies(self, delta_time):
+        """حرکت و چرخش دشمنان"""
+        enemies = self.enemies
+        enemies['pos'] += enemies['vel'] * delta_time
+        enemies['rot'] += enemies['rot_vel'] * delta_time
+
+    def move_projectiles(self, delta_time):
+        """حرکت پرتابه‌ها؛ موقعیت قبلی برای برخورد پیوسته در طول حرکت این تیک"""
+        projectiles = self.projectiles
+        projectiles['prev'][:] = projectiles['pos']
+        projectiles['pos'] += projectiles['vel'] * delta_time
+
+    def move_pickups(self, delta_time):
+        """حرکت و چرخش رهاشده‌ها؛ پخش اولیه میرا می‌شود و حرکت رو به بازیکن می‌ماند"""
+        powerups = self.powerups
+        powerups['pos'] += powerups['vel'] * delta_time
+        powerups['vel'][:, :2] *= np.exp(-PICKUP_DAMPING * delta_time)
+        powerups['rot'][:, 1] += POWERUP_SPIN * delta_time
+
+    def emit_trails(self, delta_time):
+        """رد موتور بازیکن و تمام دشمنان؛ بازیکن در بودجه ذرات اولویت دارد"""
+        particles = self.particle_system
+        if self.player is not None:
+            velocity = as_array(self.player.velocity) + np.float32([0, 0, -PLAYER_CRUISE_SPEED])
+            particles.emit_trails(PLAYER_TRAIL, [as_array(self.player.position)], [velocity],
+                                  self.player_trail, delta_time)
+        if len(self.enemies):
+            particles.emit_trails(ENEMY_TRAIL, self.enemies['pos'], self.enemies['vel'],
+                                  self.enemies['trail'], delta_time)
+
+    def fire_enemies(self, delta_time):
+        """شلیک دشمنانی که زمان آماده‌باششان گذشته است"""
+        enemies = self.enemies
+        due = self.time - enemies['last_shot'] > enemies['shot_cooldown']
+        if due.any():
+            origins = enemies['pos'][due]
+            self.projectiles.spawn(len(origins), pos=origins, prev=origins,
+                                   vel=(0, 0, ENEMY_SHOT_SPEED), owner=OWNER_ENEMY, damage=1)
+            enemies['last_shot'][due] = self.time
+
+    def expire_enemies(self, delta_time):
+        """حذف دشمنان عبورکرده (سیارک‌های عبورکرده در میدان بازیافت می‌شوند)"""
+        self.enemies.remove(self.enemies['pos'][:, 2] > ENEMY_EXIT_Z)
+
+    def expire_projectiles(self, delta_time):
+        """حذف پرتابه‌های خارج از برد"""
+        self.projectiles.remove(np.abs(self.projectiles['pos'][:, 2]) > PROJECTILE_RANGE)
+
+    def expire_pickups(self, delta_time):
+        """حذف رهاشده‌های عبورکرده یا قدیمی"""
+        self.powerups.remove((self.powerups['pos'][:, 2] > PICKUP_EXIT_Z) |
+                             (self.time - self.powerups['born'] > PICKUP_LIFETIME))
+
+    def spawn_entities(self, delta_time):
+        """تولید دشمنان از زمان‌بندی مرحله و رفتن به مرحله بعد"""
+        start, end = self.level_manager.update(delta_time)
+        if end > start:
+            types, positions = self.level_manager.spawns(start, end)
+            self.spawn_enemies(types, positions)
+
+        # پایان مرحله: همه موج‌ها تولید و همه دشمنان نابود شده‌اند
+        if self.level_manager.schedule is not None and \
+                self.level_manager.waves_finished() and not len(self.enemies):
+            self.load_level(self.level + 1)
+
+    def check_collisions(self, delta_time=None):
+        """بررسی برخوردها"""
+        self.check_player_collisions()
+        self.check_projectile_collisions()
+        self.check_powerup_pickups()
+
+    def check_player_collisions(self):
+        """برخورد بازیکن با اولین دشمن و اولین سیارک در تماس"""
+        if self.player is None:
+            return
+        player_pos = as_array(self.player.position)
+
+        for pool, radius in ((self.enemies, None), (self.asteroids, 'size')):
+            if not len(pool):
+                continue
+            distance = np.linalg.norm(pool['pos'] - player_pos, axis=1)
+            limit = pool[radius] if radius else 1.0
+            touching = np.nonzero(distance < limit)[0]
+            if len(touching):
+                row = touching[0]
+                self.hit_player()
+                self.explode(pool['pos'][row])
+                if pool is self.asteroids:
+                    self.kills[ASTEROID_KILL] += 1
+                    self.asteroid_field.recycle([row])
+                else:
+                    self.kills[pool['type'][row]] += 1
+                    pool.remove([row])
+
+    def check_projectile_collisions(self):
+        """برخورد پیوسته پرتابه‌های بازیکن با دشمنان و سیارک‌ها و پرتابه‌های دشمن با بازیکن"""
+        projectiles = self.projectiles
+        if not len(projectiles):
+            return
+        spent = np.zeros(len(projectiles), dtype=bool)
+
+        shots = np.nonzero(projectiles['owner'] == OWNER_PLAYER)[0]
+        enemy_count = len(self.enemies)
+        if len(shots) and enemy_count + len(self.asteroids):
+            target_pos = np.concatenate([self.enemies['pos'], self.asteroids['pos']])
+            target_radii = np.concatenate([np.full(enemy_count, ENEMY_RADIUS, dtype=np.float32),
+                                           self.asteroids['size']])
+            health = np.concatenate([self.enemies['health'], self.asteroids['health']])
+            shot_ids, target_ids, _ = self.collider.sweep(
+                projectiles['prev'][shots], projectiles['pos'][shots], target_pos, target_radii
+            )
+
+            destroyed = np.zeros(len(target_pos), dtype=bool)
+            for shot_id, target_id in zip(shot_ids.tolist(), target_ids.tolist()):
+                # هدفی که پرتابه دیگری در همین تیک نابودش کرده، این پرتابه را متوقف نمی‌کند
+                if destroyed[target_id]:
+                    continue
+                spent[shots[shot_id]] = True
+                health[target_id] -= projectiles['damage'][shots[shot_id]]
+                if health[target_id] > 0:
+                    continue
+                destroyed[target_id] = True
+                self.explode(target_pos[target_id])
+                self.score += SCORES['enemy'] if target_id < enemy_count else SCORES['asteroid']
+
+            self.enemies['health'][:] = health[:enemy_count]
+            self.asteroids['health'][:] = health[enemy_count:]
+            self.shots_hit += int(np.count_nonzero(spent[shots]))
+            if destroyed.any():
+                self.count_kills(destroyed, enemy_count)
+                self.drop_kills(target_pos, destroyed, enemy_count)
+            self.enemies.remove(destroyed[:enemy_count])
+            self.asteroid_field.recycle(destroyed[enemy_count:])
+
+        # پرتابه‌های دشمن در برابر بازیکن
+        shots = np.nonzero((projectiles['owner'] == OWNER_ENEMY) & ~spent)[0]
+        if len(shots) and self.player is not None:
+            shot_ids, _, _ = self.collider.sweep(
+                projectiles['prev'][shots], projectiles['pos'][shots],
+                [as_array(self.player.position)], [PLAYER_RADIUS]
+            )
+            if len(shot_ids):
+                spent[shots[shot_ids]] = True
+                self.hit_player()
+
+        projectiles.remove(spent)
+
+    def count_kills(self, destroyed, enemy_count):
+        """شمارش نابودی‌ها بر اساس نوع دشمن و سیارک"""
+        self.kills[:len(ENEMY_TYPES)] += np.bincount(self.enemies['type'][destroyed[:enemy_count]],
+                                                     minlength=len(ENEMY_TYPES))
+        self.kills[ASTEROID_KILL] += int(np.count_nonzero(destroyed[enemy_count:]))
+
+    def drop_kills(self, target_pos, destroyed, enemy_count):
+        """رهاشده‌های دشمنان (جدول هر نوع) و سیارک‌های نابودشده"""
+        killed = destroyed[:enemy_count]
+        kill_types = self.enemies['type'][killed]
+        kill_pos = target_pos[:enemy_count][killed]
+        for type_index in np.unique(kill_types).tolist():
+            self.drop_loot(ENEMY_TYPES[type_index], kill_pos[kill_types == type_index])
+        self.drop_loot('asteroid', target_pos[enemy_count:][destroyed[enemy_count:]])
+
+    def check_powerup_pickups(self):
+        """برداشتن رهاشده‌های داخل شعاع برداشت بازیکن با جستجوی شبکه مکانی"""
+        if self.player is None or not len(self.powerups):
+            return
+        grid = self.pickup_grid.build(self.powerups['pos'])
+        _, picked, _ = grid.query_radius([as_array(self.player.position)], PICKUP_RADIUS)
+        if not len(picked):
+            return
+        types = self.powerups['type'][picked]
+        coins = int(np.count_nonzero(types == COIN))
+        if coins:
+            self.collect_coins(coins)
+        for type_index in types[types != COIN].tolist():
+            self.apply_powerup(POWERUP_TYPES[type_index])
+        mask = np.zeros(len(self.powerups), dtype=bool)
+        mask[picked] = True
+        self.powerups.remove(mask)
+
+    def collect_coins(self, count=1):
+        """افزودن سکه‌ها و امتیاز آن‌ها"""
+        self.coins += count
+        self.score += SCORES['coin'] * count
+        self.events.append(('powerup', 'coin'))
+
+    def apply_powerup(self, power_type, player=None):
+        """اعمال قدرت‌افزایی به بازیکن"""
+        player = player or self.player
+        if power_type == "health":
+            self.lives = min(MAX_LIVES, self.lives + 1)  # آسیب موتور با جان‌ها شمرده می‌شود
+        elif power_type == "fuel":
+            self.fuel = min(self.max_fuel, self.fuel + 30)
+        elif power_type == "weapon":
+            player.weapon_rate = min(MAX_WEAPON_RATE, player.weapon_rate * WEAPON_BOOST)
+        elif power_type == "shield":
+            player.invulnerable = 5.0  # 5 ثانیه آسیب‌ناپذیری
+        elif power_type == "coin":
+            self.collect_coins()
+            return
+        self.events.append(('powerup', power_type))
+
+    def hit_player(self):
+        """از دست دادن جان و سوخت؛ پس از هر برخورد مدتی آسیب‌ناپذیر"""
+        if self.player.invulnerable > 0 or self.over:
+            return
+        self.player.invulnerable = HIT_INVULNERABILITY
+        self.lives -= 1
+        self.fuel -= HIT_FUEL_COST
+        self.fuel_used += HIT_FUEL_COST
+        if self.lives <= 0:
+            self.end_game()
+        else:
+            self.events.append(('player_hit', as_array(self.player.position)))
+
+    def explode(self, position):
+        """انفجار: ذرات در شبیه‌سازی و رویداد برای صدا"""
+        position = np.array(position, dtype=np.float32)
+        self.particle_system.create_explosion(position)
+        self.events.append(('explosion', position))
+
+    def update_fuel(self, delta_time):
+        """مصرف سوخت"""
+        burned = min(max(self.fuel, 0.0), FUEL_BURN * delta_time)
+        self.fuel_used += burned
+        self.fuel = max(0.0, self.fuel - burned)
+        if self.fuel <= 0:
+            self.end_game()
+
+    def end_game(self):
+        """پایان بازی"""
+        if not self.over:
+            self.over = True
+            self.events.append(('game_over', None))
+
+    def session_stats(self):
+        """آمار جلسه فعلی برای ذخیره: امتیاز، دقت شلیک، سوخت مصرفی و نابودی هر منبع"""
+        stats = {
+            'duration': self.time,
+            'score': int(self.score),
+            'level': self.level,
+            'coins': self.coins,
+            'shots': self.shots_fired,
+            'hits': self.shots_hit,
+            'accuracy': self.shots_hit / self.shots_fired if self.shots_fired else None,
+            'fuel_used': self.fuel_used,
+        }
+        return stats, dict(zip(KILL_SOURCES, self.kills.tolist()))
+
+    def drain_events(self):
+        """رویدادهای این تیک (برای صدا و افکت‌های موتور) و خالی کردن صف"""
+        events, self.events = self.events, []
+        return events
+
+    def shutdown(self):
+        """توقف نخ‌های زمان‌بند سیستم‌ها و ساخت بلوک‌های تصادفی"""
+        self.scheduler.shutdown()
+        self.random.shutdown()
+
+
+def benchmark_simulation(waves='levels/stress.waves', seconds=10.0, fps=60, seed=0, workers=1,
+                         asteroids=ASTEROID_COUNT):
+    """بنچمارک بدون OpenGL: اجرای یک مرحله با فایل موج داده‌شده و گزارش زمان هر تیک"""
+    world = GalaxySimulation(seed=seed, workers=workers)
+    world.reset(asteroid_count=asteroids)
+    world.load_level(1, waves)
+    world.fuel = float('inf')
+    world.lives = float('inf')
+    world.player.weapon_rate = float('inf')  # الگوی شلیک ثابت بنچمارک (هر 6 تیک)
+
+    delta_time = 1 / fps
+    ticks = int(seconds * fps)
+    timings = np.zeros(ticks)
+    peak_enemies = 0
+    for tick in range(ticks):
+        start = time.perf_counter()
+        if tick % 6 == 0:
+            world.fire_player()
+        world.update(delta_time, direction=(np.sin(tick * delta_time), 0))
+        timings[tick] = (time.perf_counter() - start) * 1000
+        peak_enemies = max(peak_enemies, len(world.enemies))
+        world.drain_events()
+
+    print(f"🧪 Simulation benchmark: {waves}, {ticks} ticks, {workers} workers, {asteroids} asteroids")
+    print(f"  mean {timings.mean():.2f} ms, p95 {np.percentile(timings, 95):.2f} ms, "
+          f"max {timings.max():.2f} ms")
+    for line in world.scheduler.report_lines() + world.random.report_lines():
+        print(f"  {line}")
+    print(f"  stages: {world.scheduler.stages()}")
+    print(f"  peak enemies {peak_enemies}, particles {len(world.particle_system)}, "
+          f"score {world.score}, asteroids recycled {world.asteroid_field.recycled}, "
+          f"store {world.store.nbytes() / 1024:.0f} KB")
+    world.shutdown()
+    return timings
+
+
+if __name__ == "__main__":
+    benchmark_simulation(workers=1)
+    benchmark_simulation(workers=4)
+    benchmark_simulation(workers=1, asteroids=10000)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Sound Manager - مدیریت صداهای مکانی با محدودیت صدا
+ACTOn Game Studio
+"""
+
+import math
+import time
+import pygame.mixer as mixer
+
+
+class SoundManager:
+    """پخش افکت‌های صوتی با تخصیص کانال بر اساس اولویت و فاصله"""
+
+    def __init__(self, max_voices=8, first_channel=1, coalesce_window=0.05,
+                 rolloff=0.15, pan_width=8.0, min_gain=0.05):
+        self.max_voices = max_voices
+        self.first_channel = first_channel  # کانال‌های قبلی برای موسیقی رزرو شده‌اند
+        self.coalesce_window = coalesce_window
+        self.rolloff = rolloff
+        self.pan_width = pan_width
+        self.min_gain = min_gain
+
+        self.sounds = {}  # name -> (sound, priority)
+        self.voices = []  # برای هر کانال: {'channel', 'name', 'score'}
+        self.last_trigger = {}  # name -> (زمان، اولویت) آخرین پخش
+
+        self.stats = {'played': 0, 'coalesced': 0, 'stolen': 0, 'dropped': 0}
+
+    def setup_channels(self):
+        """ساخت کانال‌های میکسر برای صداهای مدیریت‌شده"""
+        if not mixer.get_init():
+            return False
+
+        needed = self.first_channel + self.max_voices
+        if mixer.get_num_channels() < needed:
+            mixer.set_num_channels(needed)
+
+        self.voices = [
+            {'channel': mixer.Channel(self.first_channel + i), 'name': None, 'score': 0.0}
+            for i in range(self.max_voices)
+        ]
+        return True
+
+    def register(self, name, sound, priority=1.0):
+        """ثبت یک صدا با اولویت پایه"""
+        self.sounds[name] = (sound, priority)
+
+    def play(self, name, position=None, listener=None, priority=None, now=None):
+        """پخش صدا در موقعیت داده‌شده نسبت به شنونده؛ کانال پخش یا None برمی‌گرداند"""
+        if name not in self.sounds:
+            return None
+        if not self.voices and not self.setup_channels():
+            return None
+
+        sound, base_priority = self.sounds[name]
+        if priority is None:
+            priority = base_priority
+        if now is None:
+            now = time.monotonic()
+
+        # ادغام پخش‌های تکراری در یک بازه زمانی کوتاه؛ پخش با اولویت بالاتر ادغام نمی‌شود
+        last = self.last_trigger.get(name)
+        if last is not None and now - last[0] < self.coalesce_window and priority <= last[1]:
+            self.stats['coalesced'] += 1
+            return None
+
+        left, right = self.spatialize(position, listener)
+        gain = max(left, right)
+        if gain < self.min_gain:
+            self.stats['dropped'] += 1
+            return None
+
+        voice = self.acquire_voice(priority * gain)
+        if voice is None:
+            self.stats['dropped'] += 1
+            return None
+
+        self.last_trigger[name] = (now, priority)
+        channel = voice['channel']
+        channel.play(sound)
+        channel.set_volume(left, right)
+        voice['name'] = name
+        voice['score'] = priority * gain
+        self.stats['played'] += 1
+        return channel
+
+    def acquire_voice(self, score):
+        """یافتن کانال آزاد یا گرفتن کانالی با کمترین امتیاز"""
+        weakest = None
+        for voice in self.voices:
+            if not voice['channel'].get_busy():
+                return voice
+            if weakest is None or voice['score'] < weakest['score']:
+                weakest = voice
+
+        if weakest is not None and weakest['score'] < score:
+            weakest['channel'].stop()
+            self.stats['stolen'] += 1
+            return weakest
+        return None
+
+    def spatialize(self, position, listener):
+        """محاسبه بلندی چپ و راست بر اساس فاصله و جهت افقی"""
+        if position is None or listener is None:
+            return 1.0, 1.0
+
+        dx = position[0] - listener[0]
+        dy = position[1] - listener[1]
+        dz = position[2] - listener[2]
+        distance = math.sqrt(dx*dx + dy*dy + dz*dz)
+        gain = 1.0 / (1.0 + self.rolloff * distance)
+
+        # پن با توان ثابت
+        pan = max(-1.0, min(1.0, dx / self.pan_width))
+        angle = (pan + 1.0) * math.pi / 4
+        left = min(1.0, gain * math.cos(angle) * math.sqrt(2))
+        right = min(1.0, gain * math.sin(angle) * math.sqrt(2))
+        return left, right
+
+    def active_voices(self):
+        """تعداد کانال‌های در حال پخش"""
+        return sum(1 for voice in self.voices if voice['channel'].get_busy())
+
+    def stop_all(self):
+        """توقف تمام صداهای مدیریت‌شده"""
+        for voice in self.voices:
+            voice['channel'].stop()
+            voice['name'] = None
+            voice['score'] = 0.0
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Spatial Index - شبکه درهم‌سازی مکانی برای جستجوی همسایه‌ها
+ACTOn Game Studio
+"""
+
+import math
+import numpy as np
+
+# هر محور در 21 بیت از کلید int64 قرار می‌گیرد
+AXIS_BITS = 21
+AXIS_OFFSET = 1 << (AXIS_BITS - 1)
+AXIS_MASK = (1 << AXIS_BITS) - 1
+
+
+def pack_cells(cells):
+    """تبدیل مختصات سلول (n, 3) به کلید int64 یکتا"""
+    cells = cells.astype(np.int64) + AXIS_OFFSET
+    return ((cells[:, 0] & AXIS_MASK) << (2 * AXIS_BITS)) | \
+           ((cells[:, 1] & AXIS_MASK) << AXIS_BITS) | \
+           (cells[:, 2] & AXIS_MASK)
+
+
+def expand_ranges(starts, counts):
+    """تولید برداری اندیس‌های پیوسته [start, start + count) برای هر بازه"""
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(starts, counts) + (np.arange(total) - run_starts)
+
+
+class SpatialHashGrid:
+    """شبکه یکنواخت برداری‌شده؛ ساخت O(n log n) و جستجو متناسب با تعداد همسایه‌ها"""
+
+    def __init__(self, cell_size=2.0):
+        self.cell_size = cell_size
+        self.positions = np.zeros((0, 3), dtype=np.float32)
+        self.order = np.zeros(0, dtype=np.int64)
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.starts = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def build(self, positions):
+        """ساخت شبکه برای موقعیت‌های (n, 3)"""
+        self.positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        keys = pack_cells(np.floor(self.positions / self.cell_size))
+        self.order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[self.order]
+        self.keys, self.starts, self.counts = np.unique(sorted_keys, return_index=True, return_counts=True)
+        return self
+
+    def __len__(self):
+        return len(self.positions)
+
+    def neighbor_offsets(self, radius):
+        """آفست سلول‌هایی که باید برای شعاع داده‌شده بررسی شوند"""
+        reach = max(1, int(math.ceil(radius / self.cell_size)))
+        span = np.arange(-reach, reach + 1)
+        return np.stack(np.meshgrid(span, span, span, indexing='ij'), axis=-1).reshape(-1, 3)
+
+    def candidates(self, points, radius):
+        """جفت‌های کاندید (اندیس نقطه جستجو، اندیس عضو شبکه) در سلول‌های مجاور"""
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+        if len(points) == 0 or len(self.keys) == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+
+        # کلید تمام سلول‌های مجاور تمام نقاط یکجا: یک searchsorted به جای یکی برای هر آفست
+        offsets = self.neighbor_offsets(radius)
+        point_cells = np.floor(points / self.cell_size).astype(np.int64)
+        keys = pack_cells((point_cells[:, None, :] + offsets).reshape(-1, 3))
+        slots = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        hit = np.nonzero(self.keys[slots] == keys)[0]
+        counts = self.counts[slots[hit]]
+        query_ids = np.repeat(hit // len(offsets), counts)
+        member_ids = self.order[expand_ranges(self.starts[slots[hit]], counts)]
+        return query_ids, member_ids
+
+    def query_radius(self, points, radius):
+        """تمام جفت‌های (نقطه، عضو) با فاصله کمتر از radius و فاصله آن‌ها"""
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+        query_ids, member_ids = self.candidates(points, radius)
+        delta = points[query_ids] - self.positions[member_ids]
+        distance = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+        inside = distance < radius
+        return query_ids[inside], member_ids[inside], distance[inside]
+
+    def query_pairs(self, radius):
+        """جفت‌های همسایه درون خود شبکه (i != j) با فاصله کمتر از radius"""
+        i, j, distance = self.query_radius(self.positions, radius)
+        distinct = i != j
+        return i[distinct], j[distinct], distance[distinct]
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Startup Profiler - زمان‌سنجی مراحل راه‌اندازی و اجرای کارهای معوق
+ACTOn Game Studio
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StartupProfiler:
+    """ثبت زمان هر مرحله راه‌اندازی و اجرای کارهای غیرضروری پس از اولین فریم"""
+
+    def __init__(self, origin=None, max_workers=2):
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.max_workers = max_workers
+        self.phases = []  # (name, start, duration, background)
+        self.deferred = []  # (name, fn)
+        self.futures = {}
+        self.executor = None
+        self.first_frame_time = None
+        self.deferred_reported = False
+        self.lock = threading.Lock()
+
+    def record(self, name, start, duration, background=False):
+        """ثبت یک مرحله با زمان شروع نسبت به مبدأ"""
+        with self.lock:
+            self.phases.append((name, start - self.origin, duration, background))
+
+    @contextmanager
+    def phase(self, name, background=False):
+        """زمان‌سنجی یک مرحله راه‌اندازی"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter() - start, background)
+
+    def defer(self, name, fn):
+        """ثبت کاری که پس از اولین فریم روی نخ پس‌زمینه اجرا می‌شود"""
+        if self.first_frame_time is None:
+            self.deferred.append((name, fn))
+        else:
+            self._submit(name, fn)
+
+    def first_frame(self):
+        """اعلام رسیدن اولین فریم؛ گزارش داده و کارهای معوق شروع می‌شوند"""
+        if self.first_frame_time is not None:
+            return
+        self.first_frame_time = time.perf_counter() - self.origin
+        self.report()
+
+        for name, fn in self.deferred:
+            self._submit(name, fn)
+        self.deferred.clear()
+
+    def _submit(self, name, fn):
+        """اجرای یک کار معوق روی ThreadPool"""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                               thread_name_prefix="startup")
+        self.deferred_reported = False
+
+        def run():
+            with self.phase(name, background=True):
+                fn()
+
+        self.futures[name] = self.executor.submit(run)
+
+    def poll(self):
+        """بررسی پایان کارهای معوق؛ در پایان گزارش آن‌ها چاپ می‌شود"""
+        if self.deferred_reported or not self.futures:
+            return self.deferred_reported
+        if not all(future.done() for future in self.futures.values()):
+            return False
+
+        for name, future in self.futures.items():
+            error = future.exception()
+            if error is not None:
+                print(f"⚠️ Deferred startup task '{name}' failed: {error}")
+
+        self.deferred_reported = True
+        self.report(background=True)
+        return True
+
+    def report(self, background=False):
+        """چاپ جدول مراحل راه‌اندازی"""
+        with self.lock:
+            phases = [p for p in self.phases if p[3] == background]
+
+        if background:
+            print("⏱️ Deferred startup work:")
+        else:
+            print("⏱️ Startup phases:")
+        for name, start, duration, _ in phases:
+            print(f"  {name:<12} {duration * 1000:8.1f} ms  (at {start * 1000:.0f} ms)")
+        if not background and self.first_frame_time is not None:
+            print(f"  {'first frame':<12} {self.first_frame_time * 1000:8.1f} ms")
+
+    def shutdown(self):
+        """منتظر ماندن برای کارهای معوق و بستن ThreadPool"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Stats Store - ذخیره محلی بهترین امتیازها و آمار هر جلسه بازی در SQLite
+ACTOn Game Studio
+
+حلقه بازی هیچ‌وقت منتظر دیسک نمی‌ماند: ردیف‌ها در حافظه بافر می‌شوند و flush فقط دسته را به
+نخ نویسنده (ThreadPoolExecutor با یک کارگر) می‌سپارد. اتصال SQLite فقط روی همان نخ باز و
+استفاده می‌شود و هر دسته در یک تراکنش نوشته می‌شود. پرس‌وجوها هم در همان صف اجرا می‌شوند
+(پس تمام نوشته‌های قبلی را می‌بینند) و Future برمی‌گردانند.
+
+sqlite3 کتابخانه استاندارد برای این چند جدول کافی است؛ sqlalchemy لازم نیست.
+
+گزارش از خط فرمان:
+    python stats_store.py [--db PATH] [--top N] [--trend N]
+"""
+
+import argparse
+import sqlite3
+import time
+import uuid
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_DB = Path.home() / ".galaxy-game" / "stats.db"
+
+SESSION_COLUMNS = (
+    'id', 'started', 'duration', 'outcome', 'score', 'level', 'coins', 'shots', 'hits', 'accuracy',
+    'fuel_used', 'frames', 'frame_mean_ms', 'frame_p50_ms', 'frame_p95_ms', 'frame_p99_ms', 'frame_max_ms',
+    'renderer', 'quality', 'seed',
+)
+KILL_COLUMNS = ('session_id', 'source', 'count')
+FRAME_COLUMNS = ('session_id', 'game_time', 'frames', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    started REAL,
+    duration REAL,
+    outcome TEXT,
+    score INTEGER,
+    level INTEGER,
+    coins INTEGER,
+    shots INTEGER,
+    hits INTEGER,
+    accuracy REAL,
+    fuel_used REAL,
+    frames INTEGER,
+    frame_mean_ms REAL,
+    frame_p50_ms REAL,
+    frame_p95_ms REAL,
+    frame_p99_ms REAL,
+    frame_max_ms REAL,
+    renderer TEXT,
+    quality TEXT,
+    seed TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_by_score ON sessions (score DESC);
+CREATE INDEX IF NOT EXISTS sessions_by_start ON sessions (started);
+CREATE TABLE IF NOT EXISTS kills (
+    session_id TEXT,
+    source TEXT,
+    count INTEGER,
+    PRIMARY KEY (session_id, source)
+);
+CREATE TABLE IF NOT EXISTS frame_windows (
+    session_id TEXT,
+    game_time REAL,
+    frames INTEGER,
+    mean_ms REAL,
+    p50_ms REAL,
+    p95_ms REAL,
+    p99_ms REAL,
+    max_ms REAL
+);
+CREATE INDEX IF NOT EXISTS frame_windows_by_session ON frame_windows (session_id, game_time);
+"""
+
+
+def insert_sql(table, columns, replace=False):
+    verb = "INSERT OR REPLACE" if replace else "INSERT"
+    return f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+
+INSERTS = {
+    'sessions': insert_sql('sessions', SESSION_COLUMNS, replace=True),
+    'kills': insert_sql('kills', KILL_COLUMNS, replace=True),
+    'frame_windows': insert_sql('frame_windows', FRAME_COLUMNS),
+}
+
+
+class FrameTimeRecorder:
+    """زمان فریم‌ها در پنجره‌های ثابت (آرایه از پیش ساخته) و هیستوگرام کل جلسه برای صدک‌ها"""
+
+    BIN_MS = 0.1
+    MAX_MS = 250.0
+
+    def __init__(self, window=600):
+        self.samples = np.zeros(window)
+        self.histogram = np.zeros(int(self.MAX_MS / self.BIN_MS) + 1, dtype=np.int64)
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.histogram.fill(0)
+        self.frames = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, frame_ms):
+        """ثبت یک فریم؛ True وقتی پنجره پر شده و باید با take_window برداشته شود"""
+        self.samples[self.count] = frame_ms
+        self.count += 1
+        return self.count == len(self.samples)
+
+    def take_window(self):
+        """خلاصه پنجره فعلی (یا None اگر خالی است) و افزودن آن به آمار جلسه"""
+        if self.count == 0:
+            return None
+        samples = self.samples[:self.count]
+        bins = np.minimum(samples / self.BIN_MS, len(self.histogram) - 1).astype(np.int64)
+        self.histogram += np.bincount(bins, minlength=len(self.histogram))
+        self.frames += self.count
+        self.total_ms += float(samples.sum())
+        self.max_ms = max(self.max_ms, float(samples.max()))
+
+        p50, p95, p99 = np.percentile(samples, (50, 95, 99)).tolist()
+        summary = {'frames': self.count, 'mean_ms': float(samples.mean()), 'p50_ms': p50,
+                   'p95_ms': p95, 'p99_ms': p99, 'max_ms': float(samples.max())}
+        self.count = 0
+        return summary
+
+    def session_summary(self):
+        """خلاصه کل جلسه؛ صدک‌ها از هیستوگرام با دقت BIN_MS"""
+        if self.frames == 0:
+            return {'frames': 0, 'mean_ms': None, 'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'max_ms': None}
+        cumulative = np.cumsum(self.histogram)
+        p50, p95, p99 = ((np.searchsorted(cumulative, self.frames * np.array([0.5, 0.95, 0.99])) + 0.5)
+                         * self.BIN_MS).tolist()
+        return {'frames': self.frames, 'mean_ms': self.total_ms / self.frames, 'p50_ms': p50,
+                'p95_ms': p95, 'p99_ms': p99, 'max_ms': self.max_ms}
+
+
+class StatsStore:
+    """پایگاه داده محلی امتیازها و آمار جلسه‌ها با نوشتن بافرشده روی نخ جدا"""
+
+    FLUSH_ROWS = 32
+
+    def __init__(self, path=DEFAULT_DB, flush_rows=FLUSH_ROWS):
+        self.path = Path(path)
+        self.flush_rows = flush_rows
+        self.buffer = {table: [] for table in INSERTS}
+        self.buffered = 0
+        self.connection = None
+        self.written = 0
+        self.last_error = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stats")
+        self.executor.submit(self.open)
+
+    @staticmethod
+    def new_session_id():
+        return uuid.uuid4().hex
+
+    # ---------- نخ بازی: فقط بافر، بدون I/O ----------
+
+    def append(self, table, row):
+        self.buffer[table].append(row)
+        self.buffered += 1
+
+    def record_frame_window(self, session_id, game_time, summary):
+        """خلاصه یک پنجره زمان فریم (FrameTimeRecorder.take_window)"""
+        self.append('frame_windows', (session_id, game_time) + tuple(summary[column] for column in FRAME_COLUMNS[2:]))
+        if self.buffered >= self.flush_rows:
+            self.flush()
+
+    def record_session(self, session_id, stats, frames, kills, **info):
+        """ثبت نتیجه یک جلسه و flush
+
+        stats: آمار شبیه‌سازی (GalaxySimulation.session_stats)، frames: خلاصه زمان فریم جلسه،
+        kills: نام منبع -> تعداد، info: ستون‌های دیگر (started، outcome، renderer...)
+        """
+        values = dict(info, id=session_id, **stats)
+        values.update({f"frame_{key}" if key != 'frames' else key: value for key, value in frames.items()})
+        self.append('sessions', tuple(values.get(column) for column in SESSION_COLUMNS))
+        for source, count in kills.items():
+            if count:
+                self.append('kills', (session_id, source, int(count)))
+        return self.flush()
+
+    def flush(self):
+        """سپردن ردیف‌های بافرشده به نخ نویسنده؛ Future نوشتن را برمی‌گرداند"""
+        if not self.buffered or self.executor is None:
+            return None
+        batch, self.buffer = self.buffer, {table: [] for table in INSERTS}
+        self.buffered = 0
+        return self.executor.submit(self.write, batch)
+
+    # ---------- پرس‌وجوها (Future) ----------
+
+    def leaderboard(self, limit=10):
+        """بهترین امتیازها"""
+        return self.submit_query(
+            "SELECT score, level, coins, accuracy, duration, started FROM sessions "
+            "WHERE score IS NOT NULL ORDER BY score DESC, started LIMIT ?", (limit,))
+
+    def kill_totals(self, session_id=None):
+        """تعداد نابودی هر منبع در یک جلسه یا همه جلسه‌ها"""
+        if session_id is None:
+            return self.submit_query("SELECT source, SUM(count) AS count FROM kills GROUP BY source ORDER BY count DESC")
+        return self.submit_query("SELECT source, count FROM kills WHERE session_id = ? ORDER BY count DESC",
+                                 (session_id,))
+
+    def performance_trend(self, limit=20, renderer=None, quality=None):
+        """خلاصه زمان فریم آخرین جلسه‌ها (قدیمی به جدید) برای دیدن روند کارایی"""
+        where, params = ["frames > 0"], []
+        for column, value in (('renderer', renderer), ('quality', quality)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        return self.submit_query(
+            "SELECT * FROM (SELECT started, renderer, quality, frames, frame_mean_ms, frame_p95_ms, "
+            f"frame_p99_ms, frame_max_ms FROM sessions WHERE {' AND '.join(where)} "
+            "ORDER BY started DESC LIMIT ?) ORDER BY started", (*params, limit))
+
+    def frame_windows(self, session_id):
+        """پنجره‌های زمان فریم یک جلسه به ترتیب زمان بازی"""
+        return self.submit_query(
+            "SELECT game_time, frames, mean_ms, p50_ms, p95_ms, p99_ms, max_ms FROM frame_windows "
+            "WHERE session_id = ? ORDER BY game_time", (session_id,))
+
+    def submit_query(self, sql, params=()):
+        return self.executor.submit(self.query, sql, params)
+
+    # ---------- نخ نویسنده ----------
+
+    def open(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.connection.row_factory = sqlite3.Row
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.executescript(SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            self.fail(e)
+
+    def write(self, batch):
+        if self.connection is None:
+            return 0
+        try:
+            with self.connection:
+                for table, rows in batch.items():
+                    if rows:
+                        self.connection.executemany(INSERTS[table], rows)
+        except sqlite3.Error as e:
+            self.fail(e)
+            return 0
+        count = sum(len(rows) for rows in batch.values())
+        self.written += count
+        return count
+
+    def query(self, sql, params):
+        if self.connection is None:
+            return []
+        try:
+            return [dict(row) for row in self.connection.execute(sql, params)]
+        except sqlite3.Error as e:
+            self.fail(e)
+            return []
+
+    def fail(self, error):
+        self.last_error = error
+        print(f"⚠️ Stats store ({self.path}): {error}")
+
+    def close(self):
+        """نوشتن بافر باقی‌مانده، انتظار برای نخ نویسنده و بستن اتصال"""
+        if self.executor is None:
+            return
+        self.flush()
+        self.executor.submit(self.close_connection)
+        self.executor.shutdown(wait=True)
+        self.executor = None
+
+    def close_connection(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def format_time(timestamp):
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp)) if timestamp else "-"
+
+
+def print_report(store, top=10, trend=20):
+    """چاپ جدول امتیازها، نابودی‌ها و روند زمان فریم"""
+    print(f"🏆 Top {top} scores ({store.path}):")
+    for rank, row in enumerate(store.leaderboard(top).result(), 1):
+        accuracy = f"{row['accuracy'] * 100:.0f}%" if row['accuracy'] is not None else "-"
+        print(f"  {rank:2d}. {row['score']:7d}  level {row['level']}, {row['coins']} coins, "
+              f"accuracy {accuracy}, {row['duration']:.0f}s  ({format_time(row['started'])})")
+
+    kills = store.kill_totals().result()
+    if kills:
+        print("💥 Kills: " + ", ".join(f"{row['source']} {row['count']}" for row in kills))
+
+    print(f"📈 Frame times, last {trend} sessions:")
+    for row in store.performance_trend(trend).result():
+        print(f"  {format_time(row['started'])}  {row['renderer'] or '-'}/{row['quality'] or '-'}  "
+              f"{row['frames']:6d} frames, mean {row['frame_mean_ms']:.2f} ms, p95 {row['frame_p95_ms']:.2f}, "
+              f"p99 {row['frame_p99_ms']:.2f}, max {row['frame_max_ms']:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Galaxy 3D high scores and session statistics")
+    parser.add_argument("--db", default=DEFAULT_DB, help="statistics database")
+    parser.add_argument("--top", type=int, default=10, help="leaderboard size")
+    parser.add_argument("--trend", type=int, default=20, help="sessions in the frame time trend")
+    args = parser.parse_args()
+    store = StatsStore(args.db)
+    try:
+        print_report(store, args.top, args.trend)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
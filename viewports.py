@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Viewports - چند دید دوربین در یک فریم (صفحه دونفره، نقشه کوچک و آینه عقب)
+ACTOn Game Studio
+
+هر دید مستطیلی از صفحه (نسبی)، دوربین و پرسپکتیو خود را دارد. ماتریس‌ها با numpy ساخته
+می‌شوند تا همان ماتریسی که در OpenGL بارگذاری می‌شود برای حذف خارج از دید (frustum culling)
+هم استفاده شود. مدل‌ها، کره‌ها و بافر ذرات بین دیدها مشترک‌اند؛ هر دید فقط حذف و فهرست رسم
+خودش را می‌سازد.
+"""
+
+import math
+import numpy as np
+from OpenGL.GL import *
+
+
+def look_at(eye, target, up):
+    """ماتریس دید (4x4، سطری) مانند gluLookAt"""
+    eye = np.asarray(eye, dtype=np.float32)
+    forward = np.asarray(target, dtype=np.float32) - eye
+    forward /= np.linalg.norm(forward)
+    side = np.cross(forward, np.asarray(up, dtype=np.float32))
+    side /= np.linalg.norm(side)
+    up = np.cross(side, forward)
+
+    view = np.identity(4, dtype=np.float32)
+    view[0, :3] = side
+    view[1, :3] = up
+    view[2, :3] = -forward
+    view[:3, 3] = -view[:3, :3] @ eye
+    return view
+
+
+def perspective(fov, aspect, near, far):
+    """ماتریس پرسپکتیو (4x4، سطری) مانند gluPerspective"""
+    f = 1.0 / math.tan(math.radians(fov) / 2)
+    projection = np.zeros((4, 4), dtype=np.float32)
+    projection[0, 0] = f / aspect
+    projection[1, 1] = f
+    projection[2, 2] = (far + near) / (near - far)
+    projection[2, 3] = 2 * far * near / (near - far)
+    projection[3, 2] = -1
+    return projection
+
+
+def frustum_planes(matrix):
+    """شش صفحه هرم دید از ماتریس projection * view (نرمال‌ها به سمت داخل و واحد)"""
+    planes = np.array([matrix[3] + matrix[0], matrix[3] - matrix[0],
+                       matrix[3] + matrix[1], matrix[3] - matrix[1],
+                       matrix[3] + matrix[2], matrix[3] - matrix[2]], dtype=np.float32)
+    return planes / np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+
+
+def spheres_in_frustum(planes, positions, radii):
+    """ماسک کره‌هایی که دست‌کم بخشی از آن‌ها داخل هرم دید است"""
+    distance = positions @ planes[:, :3].T + planes[:, 3]
+    return (distance > -np.reshape(radii, (-1, 1))).all(axis=1)
+
+
+class View:
+    """یک دید: مستطیل نسبی روی صفحه، تابع دوربین و تنظیمات رسم
+
+    camera(camera_pos, player_pos) سه‌تایی (eye, target, up) را برمی‌گرداند.
+    range_scale فاصله حذف و LOD سطح کیفیت را برای این دید مقیاس می‌کند.
+    effects: آیا جابه‌جایی اثرهای دوربین (لرزش، پس‌زنی، دنبال‌کردن) به این دید اعمال شود.
+    """
+
+    def __init__(self, name, rect, camera, fov=45.0, near=0.1, far=100.0, stars=True, particles=True,
+                 range_scale=1.0, border=False, effects=True):
+        self.name = name
+        self.rect = rect  # (x, y, عرض, ارتفاع) نسبی؛ مبدأ پایین چپ
+        self.camera = camera
+        self.fov = fov
+        self.near = near
+        self.far = far
+        self.stars = stars
+        self.particles = particles
+        self.range_scale = range_scale
+        self.border = border
+        self.effects = effects
+        # مقادیر آخرین setup
+        self.eye = np.zeros(3, dtype=np.float32)
+        self.planes = None
+        self.viewport = (0, 0, 1, 1)
+
+    def pixel_rect(self, width, height):
+        """مستطیل دید بر حسب پیکسل در صفحه‌ای با اندازه داده‌شده"""
+        x, y, w, h = self.rect
+        left, bottom = round(x * width), round(y * height)
+        return left, bottom, max(1, round((x + w) * width) - left), max(1, round((y + h) * height) - bottom)
+
+    def setup(self, camera_pos, player_pos, width, height, offset=None):
+        """تنظیم viewport، پاک کردن ناحیه دید و بارگذاری ماتریس‌ها؛ صفحات هرم را نگه می‌دارد
+
+        offset (جابه‌جایی موقت اثرهای دوربین) به چشم و هدف اضافه می‌شود.
+        """
+        self.viewport = self.pixel_rect(width, height)
+        eye, target, up = self.camera(np.asarray(camera_pos, dtype=np.float32), player_pos)
+        if offset is not None and self.effects:
+            eye = np.add(eye, offset)
+            target = np.add(target, offset)
+        self.eye = np.asarray(eye, dtype=np.float32)
+        view = look_at(eye, target, up)
+        projection = perspective(self.fov, self.viewport[2] / self.viewport[3], self.near, self.far)
+        self.planes = frustum_planes(projection @ view)
+
+        glViewport(*self.viewport)
+        glEnable(GL_SCISSOR_TEST)
+        glScissor(*self.viewport)
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glDisable(GL_SCISSOR_TEST)
+
+        # OpenGL ستونی است: ترانهاده ماتریس‌های سطری
+        glMatrixMode(GL_PROJECTION)
+        glLoadMatrixf(projection.T)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadMatrixf(view.T)
+        return self.eye
+
+
+def main_camera(camera_pos, player_pos):
+    """دوربین اصلی ثابت پشت صحنه"""
+    return camera_pos, (0, 0, -5), (0, 1, 0)
+
+
+def chase_camera(camera_pos, player_pos):
+    """دوربین تعقیب پشت و بالای سفینه"""
+    return player_pos + (0, 1.5, 3.0), player_pos + (0, 0, -6.0), (0, 1, 0)
+
+
+def rear_camera(camera_pos, player_pos):
+    """آینه عقب: از روی سفینه رو به +z"""
+    return player_pos + (0, 0.6, 0.6), player_pos + (0, 0, 10.0), (0, 1, 0)
+
+
+def minimap_camera(camera_pos, player_pos):
+    """نقشه کوچک: نمای بالا با جلو (-z) رو به بالای صفحه"""
+    return (player_pos[0], 40.0, -10.0), (player_pos[0], 0.0, -10.0), (0, 0, -1)
+
+
+def build_layout(name):
+    """دیدهای یک چیدمان؛ اولین دید دید اصلی است"""
+    main = View('main', (0, 0, 1, 1), main_camera)
+    if name == 'single':
+        return [main]
+    if name == 'split':
+        # صفحه دونفره: نیمه دوم دوربین تعقیب (جای دوربین بازیکن دوم)
+        main.rect = (0, 0, 0.5, 1)
+        return [main, View('chase', (0.5, 0, 0.5, 1), chase_camera)]
+    if name == 'minimap':
+        return [main, View('minimap', (0.75, 0.7, 0.23, 0.28), minimap_camera, stars=False, particles=False,
+                           range_scale=2.0, border=True, effects=False)]
+    if name == 'rear':
+        return [main, View('rear', (0.35, 0.78, 0.3, 0.2), rear_camera, stars=False, border=True)]
+    raise ValueError(f"Unknown view layout: {name}")
+
+
+VIEW_LAYOUTS = ('single', 'split', 'minimap', 'rear')